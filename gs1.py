@@ -4,9 +4,13 @@ This module deals with GS1 barcode.
 """
 
 
+import os
 import sys
-import argparse
-from re import match, search
+from collections import deque, namedtuple
+from itertools import islice
+
+import gs1_checksum
+import gs1_code128
 
 __author__ = "Laszlo Tamas"
 __copyright__ = "Copyright (c) 2048 Laszlo Tamas"
@@ -18,330 +22,94 @@ GTIN_ID = "01"
 LOT_ID = "10"
 EXPIRATION_DATE_ID = "17"
 CATALOG_NUMBER_ID = "21"
+ELEMENT_NAMES = ("EAN number", "LOT number", "Expiration date",
+                 "Catalog number")
+# Element string of the fixed layout, FNC1 after the variable LOT.
+ELEMENT_TEMPLATE = GTIN_ID + "%s" + LOT_ID + "%s" + gs1_code128.FNC1 + \
+    EXPIRATION_DATE_ID + "%s" + CATALOG_NUMBER_ID + "%s"
 
-GS1_CHART_DICT = {
-    0: "Â",
-    1: "!",
-    2: "",
-    3: "#",
-    4: "$",
-    5: "%",
-    6: "&",
-    7: "'",
-    8: "(",
-    9: ")",
-    10: "*",
-    11: "+",
-    12: ",",
-    13: "-",
-    14: ".",
-    15: "/",
-    16: "0",
-    17: "1",
-    18: "2",
-    19: "3",
-    20: "4",
-    21: "5",
-    22: "6",
-    23: "7",
-    24: "8",
-    25: "9",
-    26: ":",
-    27: ";",
-    28: "<",
-    29: "=",
-    30: ">",
-    31: "?",
-    32: "@",
-    33: "A",
-    34: "B",
-    35: "C",
-    36: "D",
-    37: "E",
-    38: "F",
-    39: "G",
-    40: "H",
-    41: "I",
-    42: "J",
-    43: "K",
-    44: "L",
-    45: "M",
-    46: "N",
-    47: "O",
-    48: "P",
-    49: "Q",
-    50: "R",
-    51: "S",
-    52: "T",
-    53: "U",
-    54: "V",
-    55: "W",
-    56: "X",
-    57: "Y",
-    58: "Z",
-    59: "[",
-    60: "\\",
-    61: "]",
-    62: "^",
-    63: "_",
-    64: "`",
-    65: "a",
-    66: "b",
-    67: "c",
-    68: "d",
-    69: "e",
-    70: "f",
-    71: "g",
-    72: "h",
-    73: "i",
-    74: "j",
-    75: "k",
-    76: "l",
-    77: "m",
-    78: "n",
-    79: "o",
-    80: "p",
-    81: "q",
-    82: "r",
-    83: "s",
-    84: "t",
-    85: "u",
-    86: "v",
-    87: "w",
-    88: "x",
-    89: "y",
-    90: "z",
-    91: "{",
-    92: "|",
-    93: "}",
-    94: "~",
-    95: "Ã",
-    96: "Ä",
-    97: "Å",
-    98: "Æ",
-    99: "Ç",
-    100: "È",
-    101: "É",
-    102: "Ê",
-    103: "Ë",
-    104: "Ì",
-    105: "Í",
-    106: "Î"
+# Characters of the Code 128 symbol values in the "Character" barcode
+# fonts: value 0 is "Â", 1-94 are ASCII "!" to "~" and 95-106 are "Ã" to
+# "Î".
+GS1_FONT_CHARS = "Â" + "".join(map(chr, range(33, 127))) + \
+    "".join(map(chr, range(195, 207)))
 
-}
-GS1_CHART_DICT_C = {
-    "00": "Â",
-    "01": "!",
-    "02": "",
-    "03": "#",
-    "04": "$",
-    "05": "%",
-    "06": "&",
-    "07": "'",
-    "08": "(",
-    "09": ")",
-    "10": "*",
-    "11": "+",
-    "12": ",",
-    "13": "-",
-    "14": ".",
-    "15": "/",
-    "16": "0",
-    "17": "1",
-    "18": "2",
-    "19": "3",
-    "20": "4",
-    "21": "5",
-    "22": "6",
-    "23": "7",
-    "24": "8",
-    "25": "9",
-    "26": ":",
-    "27": ";",
-    "28": "<",
-    "29": "=",
-    "30": ">",
-    "31": "?",
-    "32": "@",
-    "33": "A",
-    "34": "B",
-    "35": "C",
-    "36": "D",
-    "37": "E",
-    "38": "F",
-    "39": "G",
-    "40": "H",
-    "41": "I",
-    "42": "J",
-    "43": "K",
-    "44": "L",
-    "45": "M",
-    "46": "N",
-    "47": "O",
-    "48": "P",
-    "49": "Q",
-    "50": "R",
-    "51": "S",
-    "52": "T",
-    "53": "U",
-    "54": "V",
-    "55": "W",
-    "56": "X",
-    "57": "Y",
-    "58": "Z",
-    "59": "[",
-    "60": "\\",
-    "61": "]",
-    "62": "^",
-    "63": "_",
-    "64": "`",
-    "65": "a",
-    "66": "b",
-    "67": "c",
-    "68": "d",
-    "69": "e",
-    "70": "f",
-    "71": "g",
-    "72": "h",
-    "73": "i",
-    "74": "j",
-    "75": "k",
-    "76": "l",
-    "77": "m",
-    "78": "n",
-    "79": "o",
-    "80": "p",
-    "81": "q",
-    "82": "r",
-    "83": "s",
-    "84": "t",
-    "85": "u",
-    "86": "v",
-    "87": "w",
-    "88": "x",
-    "89": "y",
-    "90": "z",
-    "91": "{",
-    "92": "|",
-    "93": "}",
-    "94": "~",
-    "95": "Ã",
-    "96": "Ä",
-    "97": "Å",
-    "98": "Æ",
-    "99": "Ç"
+GS1_CHART_DICT = dict(enumerate(GS1_FONT_CHARS))
+GS1_CHART_DICT_C = {"%02d" % value: char
+                    for value, char in enumerate(GS1_FONT_CHARS[:100])}
+GS1_CHART_DIC_REV = {char: value for value, char in enumerate(GS1_FONT_CHARS)}
 
-}
-GS1_CHART_DIC_REV = {
-    "Â": 0,
-    "!": 1,
-    '"': 2,
-    "#": 3,
-    "$": 4,
-    "%": 5,
-    "&": 6,
-    "'": 7,
-    "(": 8,
-    ")": 9,
-    "*": 10,
-    "+": 11,
-    ",": 12,
-    "-": 13,
-    ".": 14,
-    "/": 15,
-    "0": 16,
-    "1": 17,
-    "2": 18,
-    "3": 19,
-    "4": 20,
-    "5": 21,
-    "6": 22,
-    "7": 23,
-    "8": 24,
-    "9": 25,
-    ":": 26,
-    ";": 27,
-    "<": 28,
-    "=": 29,
-    ">": 30,
-    "?": 31,
-    "@": 32,
-    "A": 33,
-    "B": 34,
-    "C": 35,
-    "D": 36,
-    "E": 37,
-    "F": 38,
-    "G": 39,
-    "H": 40,
-    "I": 41,
-    "J": 42,
-    "K": 43,
-    "L": 44,
-    "M": 45,
-    "N": 46,
-    "O": 47,
-    "P": 48,
-    "Q": 49,
-    "R": 50,
-    "S": 51,
-    "T": 52,
-    "U": 53,
-    "V": 54,
-    "W": 55,
-    "X": 56,
-    "Y": 57,
-    "Z": 58,
-    "[": 59,
-    "\\": 60,
-    "]": 61,
-    "^": 62,
-    "_": 63,
-    "`": 64,
-    "a": 65,
-    "b": 66,
-    "c": 67,
-    "d": 68,
-    "e": 69,
-    "f": 70,
-    "g": 71,
-    "h": 72,
-    "i": 73,
-    "j": 74,
-    "k": 75,
-    "l": 76,
-    "m": 77,
-    "n": 78,
-    "o": 79,
-    "p": 80,
-    "q": 81,
-    "r": 82,
-    "s": 83,
-    "t": 84,
-    "u": 85,
-    "v": 86,
-    "w": 87,
-    "x": 88,
-    "y": 89,
-    "z": 90,
-    "{": 91,
-    "|": 92,
-    "}": 93,
-    "~": 94,
-    "Ã": 95,
-    "Ä": 96,
-    "Å": 97,
-    "Æ": 98,
-    "Ç": 99,
-    "È": 100,
-    "É": 101,
-    "Ê": 102,
-    "Ë": 103,
-    "Ì": 104,
-    "Í": 105,
-    "Î": 106,
 
-}
+# Offsets of the fixed layout 01 + EAN(14) + 10 + LOT + 17 + YYMMDD + 21 + 9
+# digits. Only the LOT is variable, so everything after it is addressed from
+# the end of the barcode.
+EAN_START = 2
+LOT_START = 18
+TAIL_LENGTH = 19
+
+# Compiled validator of the fixed layout, gs1_validate is imported on
+# first use.
+VALIDATORS = []
+
+GS1Elements = namedtuple(
+    "GS1Elements",
+    ["ean_number", "lot_number", "expiration_date", "catalog_number"])
+
+
+def split_gs1(barcode):
+    """Split a GS1 barcode into its elements in a single pass.
+
+    The barcode must have the 01 + 14 digits, 10 + LOT (digits), 17 + 6 digits,
+    21 + 9 digits layout.
+
+    Arguments:
+        barcode {str} -- barcode without brackets
+
+    Returns:
+        GS1Elements -- barcode elements or None if the layout does not match
+    """
+
+    length = len(barcode)
+    if length < LOT_START + TAIL_LENGTH:
+        return None
+    tail = length - TAIL_LENGTH
+    if barcode[:2] != GTIN_ID or barcode[16:LOT_START] != LOT_ID or \
+            barcode[tail:tail + 2] != EXPIRATION_DATE_ID or \
+            barcode[tail + 8:tail + 10] != CATALOG_NUMBER_ID:
+        return None
+    if not (barcode.isascii() and barcode.isdigit()):
+        return None
+    return GS1Elements(barcode[EAN_START:16],
+                       barcode[LOT_START:tail],
+                       barcode[tail + 2:tail + 8],
+                       barcode[tail + 10:])
+
+
+def decode_character(barcode):
+    """Decode a "Character" font barcode to its element string.
+
+    The mod 103 check character is verified and the code sets are followed
+    from the start character to the stop.
+
+    Arguments:
+        barcode {str} -- font characters from the start to the stop
+
+    Raises:
+        ValueError -- invalid character, check character or code sets
+
+    Returns:
+        str -- element string, FNC1 as GS
+    """
+
+    try:
+        values = [GS1_CHART_DIC_REV[char] for char in barcode]
+    except KeyError as err:
+        raise ValueError("invalid character %s" % err)
+    if len(values) < 3 or values[-1] != gs1_code128.STOP_VALUE:
+        raise ValueError("missing stop character")
+    if gs1_checksum.mod103_check_value(values[:-2]) != values[-2]:
+        raise ValueError("wrong check character")
+    return gs1_code128.decode(values[:-2])
 
 
 class GS1Check(object):
@@ -376,6 +144,16 @@ class GS1Check(object):
             ret = True
         return ret
 
+    def check_gtin_check_digit(self):
+        """Check the mod 10 check digit of the GTIN (01).
+
+        Returns:
+            bool -- barcode has a GTIN with a valid check digit
+        """
+
+        return self.barcode[:2] == GTIN_ID and \
+            gs1_checksum.is_valid_gtin(self.barcode[2:16])
+
     def verify(self):
         """Verify barcode.
 
@@ -386,10 +164,23 @@ class GS1Check(object):
             bool -- barcode is verified
         """
 
-        ret = False
-        if match(r'^(01)(\d{14})10(\d*)17(\d{6})21(\d{9})$', self.barcode):
-            ret = True
-        return ret
+        return split_gs1(self.barcode) is not None
+
+    def validate(self):
+        """Validate barcode.
+
+        Besides the layout checked by verify(), the GTIN check digit and
+        the expiration date are validated (see gs1_validate.py).
+
+        Returns:
+            bool -- barcode is valid
+        """
+
+        if not VALIDATORS:
+            import gs1_validate
+            VALIDATORS.append(gs1_validate.compile_layout(
+                gs1_validate.FIXED_LAYOUT))
+        return VALIDATORS[0](self.barcode) is None
 
     def format_barcode(self):
         """Format barcode.
@@ -434,9 +225,10 @@ class GS1GetElement(object):
             {str} -- EAN number (01)
         """
 
+        elements = split_gs1(self.barcode)
         ret = None
-        if match(r'^01(\d{14})10(\d*)17(\d{6})21(\d{9})$', self.barcode):
-            ret = search(r'^01(\d{14})', self.barcode).group(1)
+        if elements is not None:
+            ret = elements.ean_number
         self.ean_number = ret
         return ret
 
@@ -447,9 +239,10 @@ class GS1GetElement(object):
             str -- LOT number (10)
         """
 
+        elements = split_gs1(self.barcode)
         ret = ""
-        if match(r'^(01)(\d{14})10(\d*)17(\d{6})21(\d{9})$', self.barcode):
-            ret = search(r'^01(\d{14})10(\d*)17', self.barcode).group(2)
+        if elements is not None:
+            ret = elements.lot_number
         self.lot_number = ret
         return ret
 
@@ -457,13 +250,13 @@ class GS1GetElement(object):
         """Get expiration date.
 
         Returns:
-            str -- expiration date YYDDMM (17)
+            str -- expiration date YYMMDD (17)
         """
 
+        elements = split_gs1(self.barcode)
         ret = ""
-        if match(r'^(01)(\d{14})10(\d*)17(\d{6})21(\d{9})$', self.barcode):
-            ret = search(r'^01(\d{14})10(\d*)17(\d{6})21',
-                         self.barcode).group(3)
+        if elements is not None:
+            ret = elements.expiration_date
         self.expiration_date = ret
         return ret
 
@@ -474,36 +267,376 @@ class GS1GetElement(object):
             str -- catalog number (21)
         """
 
+        elements = split_gs1(self.barcode)
         ret = ""
-        if match(r'^(01)(\d{14})10(\d*)17(\d{6})21(\d{9})$', self.barcode):
-            ret = search(
-                r'^01(\d{14})10(\d*)17(\d{6})21(\d{9})$',
-                self.barcode).group(4)
+        if elements is not None:
+            ret = elements.catalog_number
         self.catalog_number = ret
         return ret
 
     def parse_gs1(self):
         """Parse GS1 code.
 
+        All four elements are extracted by a single pass over the barcode
+        and stored on the object as well.
+
         Returns:
-            str[] -- barcode elements, (01) EAN, (10) LOT,
-            (17) expiration date, (21) catalog number
+            GS1Elements -- barcode elements, (01) EAN, (10) LOT,
+            (17) expiration date, (21) catalog number, None if the
+            barcode does not match
         """
 
-        if match(r'^(01)(\d{14})10(\d*)17(\d{6})21(\d{9})$', self.barcode):
-            m_ean = search(r'^01(\d{14})', self.barcode).group(1)
-            m_lot = search(r'^01(\d{14})10(\d*)17', self.barcode).group(2)
-            m_expiration = search(
-                r'^01(\d{14})10(\d*)17(\d{6})21', self.barcode).group(3)
-            m_catalog = search(
-                r'^01(\d{14})10(\d*)17(\d{6})21(\d{9})$',
-                self.barcode).group(4)
-            return m_ean, m_lot, m_expiration, m_catalog
-        self.ean_number = m_ean
-        self.lot_number = m_lot
-        self.expiration_date = m_expiration
-        self.catalog_number = m_catalog
-        return None
+        elements = split_gs1(self.barcode)
+        if elements is not None:
+            self.ean_number = elements.ean_number
+            self.lot_number = elements.lot_number
+            self.expiration_date = elements.expiration_date
+            self.catalog_number = elements.catalog_number
+        return elements
+
+
+def check_elements(ean_number, lot_number, expiration_date,
+                   catalog_number):
+    """Check that the four elements of the fixed layout are strings.
+
+    Arguments:
+        ean_number {str} -- EAN number (01)
+        lot_number {str} -- LOT number (10)
+        expiration_date {str} -- expiration date YYMMDD (17)
+        catalog_number {str} -- catalog number (21)
+
+    Raises:
+        TypeError -- an element is unset or not a string
+
+    Returns:
+        tuple -- the elements
+    """
+
+    elements = (ean_number, lot_number, expiration_date, catalog_number)
+    if str is type(ean_number) is type(lot_number) is \
+            type(expiration_date) is type(catalog_number):
+        return elements
+    for name, value in zip(ELEMENT_NAMES, elements):
+        if not isinstance(value, str):
+            raise TypeError("%s is %s, not a string" %
+                            (name, type(value).__name__))
+    return elements
+
+
+def element_string(ean_number, lot_number, expiration_date, catalog_number):
+    """Build the element string of the fixed layout.
+
+    Arguments:
+        ean_number {str} -- EAN number (01)
+        lot_number {str} -- LOT number (10)
+        expiration_date {str} -- expiration date YYMMDD (17)
+        catalog_number {str} -- catalog number (21)
+
+    Raises:
+        TypeError -- an element is unset or not a string
+
+    Returns:
+        str -- element string, FNC1 after the variable LOT as GS
+    """
+
+    return ELEMENT_TEMPLATE % check_elements(ean_number, lot_number,
+                                             expiration_date, catalog_number)
+
+
+class OutputStyle(object):
+    """Base class of the GS1Create output styles
+
+    A style renders the four elements of the fixed layout to one output
+    string. Subclasses implement render(); the bulk methods call it per row
+    unless a style has a faster way.
+    """
+
+    name = None
+
+    def render(self, ean_number, lot_number, expiration_date,
+               catalog_number):
+        """Render one code.
+
+        Arguments:
+            ean_number {str} -- EAN number (01)
+            lot_number {str} -- LOT number (10)
+            expiration_date {str} -- expiration date YYMMDD (17)
+            catalog_number {str} -- catalog number (21)
+
+        Returns:
+            str -- GS1 code
+        """
+
+        raise NotImplementedError
+
+    def create(self, gs1_create):
+        """Render the code of a GS1Create.
+
+        Arguments:
+            gs1_create {GS1Create} -- elements
+
+        Returns:
+            str -- GS1 code
+        """
+
+        return self.render(gs1_create.ean_number, gs1_create.lot_number,
+                           gs1_create.expiration_date,
+                           gs1_create.catalog_number)
+
+    def render_rows(self, rows):
+        """Render many codes.
+
+        Arguments:
+            rows {iterable} -- EAN number, LOT, expiration date, catalog
+            number rows
+
+        Returns:
+            list -- GS1 codes
+        """
+
+        render = self.render
+        return [render(ean_number, lot_number, expiration_date,
+                       catalog_number)
+                for ean_number, lot_number, expiration_date, catalog_number
+                in rows]
+
+    def render_many(self, rows, separator="\n", buffer=None):
+        """Render many codes into one string.
+
+        Arguments:
+            rows {iterable} -- EAN number, LOT, expiration date, catalog
+            number rows
+
+        Keyword Arguments:
+            separator {str} -- written after every code (default: {"\\n"})
+            buffer {list} -- list to build the output in, cleared first, so
+            a caller rendering chunks reuses one (default: {new list})
+
+        Returns:
+            str -- codes
+        """
+
+        if buffer is None:
+            buffer = []
+        else:
+            buffer.clear()
+        for code in self.render_rows(rows):
+            buffer.append(code)
+            buffer.append(separator)
+        return "".join(buffer)
+
+    def create_range(self, gs1_create, serials, width):
+        """Render the codes of a GS1Create for many catalog numbers.
+
+        Arguments:
+            gs1_create {GS1Create} -- EAN number, LOT and expiration date
+            serials {iterable} -- catalog numbers
+            width {int} -- digits of every catalog number
+
+        Yields:
+            str -- GS1 code
+        """
+
+        render = self.render
+        for serial in serials:
+            yield render(gs1_create.ean_number, gs1_create.lot_number,
+                         gs1_create.expiration_date, serial)
+
+
+class TemplateStyle(OutputStyle):
+    """Class of the output styles filling a % template with the elements
+    """
+
+    def __init__(self, name, template):
+        """Create a template style.
+
+        Arguments:
+            name {str} -- style name
+            template {str} -- template with one %s per element, in layout
+            order
+        """
+
+        self.name = name
+        self.template = template
+        # Templates with the separator, compiled per separator on first use.
+        self.line_templates = {}
+
+    def render(self, ean_number, lot_number, expiration_date,
+               catalog_number):
+        return self.template % check_elements(
+            ean_number, lot_number, expiration_date, catalog_number)
+
+    def create(self, gs1_create):
+        return self.template % check_elements(
+            gs1_create.ean_number, gs1_create.lot_number,
+            gs1_create.expiration_date, gs1_create.catalog_number)
+
+    def render_rows(self, rows):
+        template = self.template
+        return [template % check_elements(ean_number, lot_number,
+                                          expiration_date, catalog_number)
+                for ean_number, lot_number, expiration_date, catalog_number
+                in rows]
+
+    def render_many(self, rows, separator="\n", buffer=None):
+        template = self.line_templates.get(separator)
+        if template is None:
+            template = self.line_templates[separator] = \
+                self.template + separator.replace("%", "%%")
+        if buffer is None:
+            buffer = []
+        else:
+            buffer.clear()
+        buffer.extend([template % check_elements(
+            ean_number, lot_number, expiration_date, catalog_number)
+                       for ean_number, lot_number, expiration_date,
+                       catalog_number in rows])
+        return "".join(buffer)
+
+    def create_range(self, gs1_create, serials, width):
+        # Everything but the catalog number is filled in once.
+        elements = check_elements(
+            gs1_create.ean_number, gs1_create.lot_number,
+            gs1_create.expiration_date, "")
+        template = self.template % (tuple(
+            value.replace("%", "%%") for value in elements[:3]) + ("%s",))
+        for serial in serials:
+            yield template % serial
+
+
+class EncoderStyle(OutputStyle):
+    """Class of the output styles encoding the element string
+    """
+
+    def __init__(self, name, template, encode):
+        """Create an encoder style.
+
+        Arguments:
+            name {str} -- style name
+            template {str} -- template with one %s for the encoded data
+            encode {function} -- encodes an element string
+        """
+
+        self.name = name
+        self.template = template
+        self.encode = encode
+
+    def render(self, ean_number, lot_number, expiration_date,
+               catalog_number):
+        return self.template % self.encode(element_string(
+            ean_number, lot_number, expiration_date, catalog_number))
+
+
+class ZPLStyle(EncoderStyle):
+    """Class of the ZPL ^BC output style
+    """
+
+    def __init__(self):
+        super(ZPLStyle, self).__init__("ZPL", "^BCN,,N,N^FD%s^FS",
+                                       gs1_code128.encode_zpl)
+
+    def create_range(self, gs1_create, serials, width):
+        encoder = gs1_create.get_suffix_encoder(width)
+        template = self.template
+        for serial in serials:
+            yield template % encoder.encode_zpl(serial)
+
+
+class CharacterStyle(OutputStyle):
+    """Class of the "Character" barcode font output style
+    """
+
+    name = "Character"
+
+    def render(self, ean_number, lot_number, expiration_date,
+               catalog_number):
+        values = gs1_code128.encode(element_string(
+            ean_number, lot_number, expiration_date, catalog_number))
+        values.append(gs1_checksum.mod103_check_value(values))
+        return "".join([GS1_CHART_DICT[value] for value in values]) + "Î"
+
+    def create(self, gs1_create):
+        ret = super(CharacterStyle, self).create(gs1_create)
+        # Without the check character and the stop, for get_check_digit().
+        gs1_create.code_without_end = ret[:-2]
+        return ret
+
+    def create_range(self, gs1_create, serials, width):
+        encoder = gs1_create.get_suffix_encoder(width)
+        chars = GS1_CHART_DICT
+        prefix = "".join([chars[value] for value in encoder.prefix_values])
+        for serial in serials:
+            values, check = encoder.encode(serial)
+            yield prefix + "".join([chars[value] for value in values]) + \
+                chars[check] + "Î"
+
+
+def epl_escape(data):
+    """Quote an element string for an EPL2 B command.
+
+    Arguments:
+        data {str} -- element string, FNC1 as GS
+
+    Returns:
+        str -- data with backslash and double quote escaped
+    """
+
+    return data.replace("\\", "\\\\").replace('"', '\\"')
+
+
+OUTPUT_STYLES = {}
+
+
+def register_style(style):
+    """Register an output style for GS1Create.output_style.
+
+    GS1Create objects look their style up when output_style is set, so a
+    style is registered before it is selected.
+
+    Arguments:
+        style {OutputStyle} -- style, replacing a style of the same name
+
+    Returns:
+        OutputStyle -- the style
+    """
+
+    OUTPUT_STYLES[style.name] = style
+    return style
+
+
+def get_style(name):
+    """Get a registered output style.
+
+    Arguments:
+        name {str} -- style name
+
+    Raises:
+        ValueError -- no style of that name
+
+    Returns:
+        OutputStyle -- style
+    """
+
+    try:
+        return OUTPUT_STYLES[name]
+    except KeyError:
+        raise ValueError("unknown output style %r" % name)
+
+
+register_style(TemplateStyle("Normal", GTIN_ID + "%s" + LOT_ID + "%s" +
+                             EXPIRATION_DATE_ID + "%s" + CATALOG_NUMBER_ID +
+                             "%s"))
+register_style(TemplateStyle("Brackets", "(" + GTIN_ID + ")%s(" + LOT_ID +
+                             ")%s(" + EXPIRATION_DATE_ID + ")%s(" +
+                             CATALOG_NUMBER_ID + ")%s"))
+# Human readable interpretation printed under a symbol.
+register_style(TemplateStyle("HRI", "(" + GTIN_ID + ") %s (" + LOT_ID +
+                             ") %s (" + EXPIRATION_DATE_ID + ") %s (" +
+                             CATALOG_NUMBER_ID + ") %s"))
+register_style(ZPLStyle())
+register_style(CharacterStyle())
+# EPL2 UCC/EAN-128 barcode at the origin, GS in the data is FNC1.
+register_style(EncoderStyle("EPL", 'B0,0,0,1E,2,4,100,N,"%s"', epl_escape))
 
 
 class GS1Create(object):
@@ -519,6 +652,18 @@ class GS1Create(object):
         self.output_style = "Normal"
         self.code_without_end = ""
 
+    @property
+    def output_style(self):
+        """Name of the output style of create_gs1()."""
+
+        return self._output_style
+
+    @output_style.setter
+    def output_style(self, name):
+        # The style object is looked up once here, not per code.
+        self._output_style = name
+        self.style = OUTPUT_STYLES.get(name)
+
     def set_barcode(self, barcode):
         """Set and preformat barcode.
 
@@ -540,57 +685,104 @@ class GS1Create(object):
         """Create GS1 code.
 
         Returns:
+            str -- GS1 barcode, empty for an unknown output style
+        """
+
+        style = self.style
+        if style is None:
+            return ""
+        return style.create(self)
+
+    def render_many(self, rows, separator="\n", buffer=None):
+        """Create GS1 codes for many rows in the output style.
+
+        Arguments:
+            rows {iterable} -- EAN number, LOT, expiration date, catalog
+            number rows
+
+        Keyword Arguments:
+            separator {str} -- written after every code (default: {"\\n"})
+            buffer {list} -- list to build the output in, reused between
+            calls (default: {new list})
+
+        Raises:
+            ValueError -- unknown output style
+
+        Returns:
+            str -- codes
+        """
+
+        return get_style(self.output_style).render_many(rows, separator,
+                                                        buffer)
+
+    def create_gs1_range(self, start, count, step=1, width=None):
+        """Create GS1 codes for a range of catalog numbers.
+
+        The EAN number, LOT and expiration date are encoded once, only the
+        catalog number is encoded per code.
+
+        Arguments:
+            start {int} -- first catalog number
+            count {int} -- number of codes
+
+        Keyword Arguments:
+            step {int} -- catalog number increment (default: {1})
+            width {int} -- catalog number digits, zero padded
+            (default: {length of catalog_number, or 9})
+
+        Raises:
+            ValueError -- catalog number does not fit the width
+
+        Yields:
             str -- GS1 barcode
         """
 
-        ret = ""
-        bracket_before = ""
-        bracket_after = ""
-        if self.output_style == "Normal" or self.output_style == "Brackets":
-            if self.output_style == "Brackets":
-                bracket_before = "("
-                bracket_after = ")"
-            ret = bracket_before + GTIN_ID+bracket_after + self.ean_number + \
-                bracket_before + LOT_ID + bracket_after + self.lot_number + \
-                bracket_before + EXPIRATION_DATE_ID + bracket_after + \
-                self.expiration_date + \
-                bracket_before + CATALOG_NUMBER_ID + bracket_after + \
-                self.catalog_number
-        if self.output_style == "ZPL":
-            # >;>80105996527176340102014>6AA>5>8171907312128012280>64
-            ret = "^BCN,,N,N^FD>;>8" + GTIN_ID + self.ean_number + LOT_ID
-            if len(self.lot_number) > 4:
-                ret = ret + self.lot_number[:4] + \
-                    ">6" + self.lot_number[4:] + ">5"
-            else:
-                ret = ret + self.lot_number
-            ret = ret+">8"+EXPIRATION_DATE_ID + self.expiration_date
-            ret = ret+CATALOG_NUMBER_ID + \
-                self.catalog_number[:8]+">6" + self.catalog_number[8:] + "^FS"
-        if self.output_style == "Character":
-            # ÍÊ!%Ça;1_H*4.Ê13'?5<!6pÈ4pÎ
-            ret = "ÍÊ!" + GS1_CHART_DICT_C[self.ean_number[0:2]] + \
-                GS1_CHART_DICT_C[self.ean_number[2:4]] + \
-                GS1_CHART_DICT_C[self.ean_number[4:6]] + \
-                GS1_CHART_DICT_C[self.ean_number[6:8]] + \
-                GS1_CHART_DICT_C[self.ean_number[8:10]] + \
-                GS1_CHART_DICT_C[self.ean_number[10:12]] + \
-                GS1_CHART_DICT_C[self.ean_number[12:]]
-            ret = ret + "*" + GS1_CHART_DICT_C[self.lot_number[0:2]] + \
-                GS1_CHART_DICT_C[self.lot_number[2:4]]
-            if len(self.lot_number) > 4:
-                ret = ret + "È" + self.lot_number[4:] + "Ç"
-            ret = ret + "Ê1" + GS1_CHART_DICT_C[self.expiration_date[0:2]] + \
-                GS1_CHART_DICT_C[self.expiration_date[2:4]] + \
-                GS1_CHART_DICT_C[self.expiration_date[4:6]]
-            ret = ret + "5" + GS1_CHART_DICT_C[self.catalog_number[0:2]] + \
-                GS1_CHART_DICT_C[self.catalog_number[2:4]] + \
-                GS1_CHART_DICT_C[self.catalog_number[4:6]] + \
-                GS1_CHART_DICT_C[self.catalog_number[6:8]]
-            ret = ret + "È" + self.catalog_number[8:]
-            self.code_without_end = ret
-            ret = ret + self.get_check_digit() + "Î"
-        return ret
+        width = width or len(self.catalog_number or "") or 9
+        last = start + (count - 1) * step
+        if count > 0 and (min(start, last) < 0 or
+                          len(str(max(start, last))) > width):
+            raise ValueError("catalog numbers %d..%d do not fit %d digits" %
+                             (start, last, width))
+        if self.style is None:
+            return
+        yield from self.style.create_range(
+            self, (str(start + index * step).zfill(width)
+                   for index in range(count)), width)
+
+    def get_suffix_encoder(self, width):
+        """Get a Code 128 encoder of the element string with a variable
+        catalog number.
+
+        Arguments:
+            width {int} -- digits of every catalog number
+
+        Returns:
+            SuffixEncoder -- encoder of the element string up to the catalog
+            number
+        """
+
+        prefix = self.get_element_string()[:-len(self.catalog_number or "")
+                                           or None]
+        return gs1_code128.SuffixEncoder(prefix, "0" * width)
+
+    def get_element_string(self):
+        """Get the element string with FNC1 after the variable LOT.
+
+        Returns:
+            str -- element string, FNC1 as GS
+        """
+
+        return element_string(self.ean_number, self.lot_number,
+                              self.expiration_date, self.catalog_number)
+
+    def get_zpl_data(self):
+        """Get the ZPL ^FD data of the barcode.
+
+        Returns:
+            str -- Code 128 data with code set invocations
+        """
+
+        return gs1_code128.encode_zpl(self.get_element_string())
 
     def get_check_digit(self):
         """Generate CheckDigit.
@@ -599,22 +791,115 @@ class GS1Create(object):
             str -- CheckDigit
         """
 
-        ret = ""
-        ret_val = GS1_CHART_DIC_REV[self.code_without_end[0]]
-        for i in range(2, len(self.code_without_end)+1):
-            ret_val = ret_val + \
-                (i-1) * GS1_CHART_DIC_REV[self.code_without_end[i-1:i]]
-        ret = GS1_CHART_DICT[ret_val % 103]
-        return ret
+        values = [GS1_CHART_DIC_REV[char] for char in self.code_without_end]
+        return GS1_CHART_DICT[gs1_checksum.mod103_check_value(values)]
+
+
+CHUNK_SIZE = 1000
+
+
+def map_chunks(function, items, processes=None, chunk_size=CHUNK_SIZE):
+    """Apply a function to chunks of items in a process pool.
+
+    At most two chunks per process are in flight, so memory stays bounded
+    for any input length, and results are yielded in input order.
 
+    Arguments:
+        function {callable} -- picklable function from a list to a list
+        items {iterable} -- input items
 
-def parse_arguments():
+    Keyword Arguments:
+        processes {int} -- worker processes (default: {CPU count})
+        chunk_size {int} -- items per task (default: {1000})
+
+    Yields:
+        object -- results of every chunk, in input order
     """
-    Parse program arguments.
 
-    @return arguments
+    from concurrent.futures import ProcessPoolExecutor
+
+    processes = processes or os.cpu_count() or 1
+    window = 2 * processes
+    items = iter(items)
+    with ProcessPoolExecutor(processes) as executor:
+        pending = deque()
+        while True:
+            while len(pending) < window:
+                chunk = list(islice(items, chunk_size))
+                if not chunk:
+                    break
+                pending.append(executor.submit(function, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+def create_chunk(output_style, rows):
+    """Create GS1 codes for a chunk of rows.
+
+    Arguments:
+        output_style {str} -- registered output style name
+        rows {list} -- EAN number, LOT, expiration date, catalog number rows
+
+    Raises:
+        ValueError -- unknown output style
+
+    Returns:
+        list -- GS1 barcodes
+    """
+
+    return get_style(output_style).render_rows(rows)
+
+
+def create_many(rows, output_style="Normal", processes=None,
+                chunk_size=CHUNK_SIZE):
+    """Create GS1 codes for many rows across a process pool.
+
+    Arguments:
+        rows {iterable} -- EAN number, LOT, expiration date, catalog number
+        rows
+
+    Keyword Arguments:
+        output_style {str} -- registered output style name
+        (default: {"Normal"})
+        processes {int} -- worker processes, 1 creates in this process
+        (default: {CPU count})
+        chunk_size {int} -- rows per task (default: {1000})
+
+    Yields:
+        str -- GS1 barcode, in row order
     """
-    parser = argparse.ArgumentParser()
+
+    if processes == 1:
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            yield from create_chunk(output_style, chunk)
+    from functools import partial
+
+    yield from map_chunks(partial(create_chunk, output_style), rows,
+                          processes, chunk_size)
+
+
+PARSERS = []
+
+
+def build_parser():
+    """
+    Build the program argument parser once.
+
+    argparse is imported here, so importing gs1 as a library does not
+    pay for it.
+
+    @return parser
+    """
+    if PARSERS:
+        return PARSERS[0]
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="gs1.py")
     parser.add_argument('-c', '--barcode', help='full barcode')
     parser.add_argument('-cn', '--catalognumber', help='catalog number')
     parser.add_argument('-ea', '--eannumber', help='EAN number')
@@ -623,20 +908,86 @@ def parse_arguments():
     parser.add_argument('-ex', '--expiration', help='expiration date YYMMDD')
     parser.add_argument('-f', '--function', help='function to execute',
                         type=str, choices=['check_gtin_id',
+                                           'check_gtin_check_digit',
                                            'format_barcode',
                                            'verify',
+                                           'validate',
                                            'get_ean_number',
                                            'get_lot_number',
                                            'get_expiration_date',
                                            'get_catalog_number',
                                            'parse_gs1',
+                                           'parse_ai',
+                                           'decode_character',
                                            'create_gs1',
                                            'create_gs1_with_brackets',
                                            'create_gs1_zpl',
-                                           'create_gs1_character'])
+                                           'create_gs1_character',
+                                           'create_gs1_hri',
+                                           'create_gs1_epl'])
+    parser.add_argument('-b', '--batch', action='store_true',
+                        help='run the function for every input line')
+    parser.add_argument('-i', '--input', default='-',
+                        help='batch input file, - for stdin')
+    parser.add_argument('-o', '--output-format', default='jsonl',
+                        choices=['jsonl', 'csv', 'zpl'],
+                        help='batch output format, zpl writes a label job '
+                        'with a stored format from creation rows')
+    parser.add_argument('-p', '--processes', type=int, default=1,
+                        help='batch worker processes, 0 for one per CPU')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help='batch lines per worker task')
+    parser.add_argument('--metrics', metavar='FILE',
+                        help='write call, failure and latency metrics of '
+                        'this process and its batch workers as a '
+                        'Prometheus text file')
+    parser.add_argument('--profile', metavar='FILE',
+                        help='dump a per-function profile of the run')
     parser.add_argument('-v', '--verbose', action='store_true',
                         help='increase output verbosity')
-    return parser.parse_args()
+    return parser
+
+
+def parse_arguments(argv=None):
+    """
+    Parse program arguments.
+
+    @param argv argument list, sys.argv when None
+    @return arguments
+    """
+    return build_parser().parse_args(argv)
+
+
+RESULT_LABELS = {
+    'check_gtin_id': "GTIN ID",
+    'check_gtin_check_digit': "GTIN check digit",
+    'verify': "GS1 verification",
+    'validate': "GS1 validation",
+    'format_barcode': "GS1 formatted barcode",
+    'get_ean_number': "EAN number",
+    'get_lot_number': "LOT number",
+    'get_expiration_date': "Expiration date",
+    'get_catalog_number': "Catalog number",
+    'parse_ai': "GS1 elements",
+    'decode_character': "GS1 element string",
+    'create_gs1': "GS1 barcode",
+    'create_gs1_with_brackets': "GS1 barcode",
+    'create_gs1_zpl': "GS1 barcode",
+    'create_gs1_character': "GS1 barcode",
+    'create_gs1_hri': "GS1 barcode",
+    'create_gs1_epl': "GS1 barcode"
+}
+PARSE_LABELS = ["EAN number", "LOT number", "Expiration date",
+                "Catalog number"]
+CREATION_FIELDS = ["eannumber", "lotnumber", "expiration", "catalognumber"]
+CREATION_STYLES = {
+    'create_gs1': "Normal",
+    'create_gs1_with_brackets': "Brackets",
+    'create_gs1_zpl': "ZPL",
+    'create_gs1_character': "Character",
+    'create_gs1_hri': "HRI",
+    'create_gs1_epl': "EPL"
+}
 
 
 def execute_program():
@@ -644,131 +995,392 @@ def execute_program():
     """
 
     args = parse_arguments()
-    if args.function == 'check_gtin_id' or args.function == 'verify':
-        execute_check()
+    if args.metrics:
+        import gs1_metrics
+        gs1_metrics.enable(sys.modules[__name__])
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.runcall(run_program, args)
+        write_profile(profiler, args.profile)
+    else:
+        run_program(args)
+    if args.metrics:
+        gs1_metrics.METRICS.write_prometheus(args.metrics)
+
+
+def run_program(args):
+    """Run a single function or a batch.
+
+    Arguments:
+        args {Namespace} -- program arguments
+    """
+
+    if args.batch:
+        execute_batch(args)
+        return
+    print(format_result(args, get_result(args)))
+
+
+def write_profile(profiler, path, limit=25):
+    """Dump a profile and summarize it on stderr.
+
+    Arguments:
+        profiler {Profile} -- finished profiler
+        path {str} -- stats file, readable by pstats
+
+    Keyword Arguments:
+        limit {int} -- functions in the summary (default: {25})
+    """
+
+    import pstats
+
+    profiler.dump_stats(path)
+    stats = pstats.Stats(profiler, stream=sys.stderr)
+    stats.sort_stats("cumulative").print_stats(limit)
+
+
+def format_result(args, res):
+    """Format a result as printed by the program.
+
+    Arguments:
+        args {Namespace} -- program arguments
+        res {object} -- result of the function
+
+    Returns:
+        str -- output lines
+    """
+
+    if args.function == 'parse_gs1':
+        if args.verbose:
+            return "\n".join([label + ": " + element
+                              for label, element in zip(PARSE_LABELS, res)])
+        return str(tuple(res) if res is not None else res)
+    if args.verbose:
+        return RESULT_LABELS[args.function] + ": " + str(res)
+    return str(res)
+
+
+def get_result(args):
+    """Run the selected function.
+
+    Arguments:
+        args {Namespace} -- program arguments
+
+    Returns:
+        object -- result of the function
+    """
+
+    ret = None
+    if args.function in ('check_gtin_id', 'check_gtin_check_digit',
+                         'verify', 'validate'):
+        ret = execute_check(args)
     else:
         if args.function[0:4] == "get_":
-            execute_get_element()
+            ret = execute_get_element(args)
         else:
             if args.function[0:7] == "create_":
-                execute_creation()
+                ret = execute_creation(args)
 
     if args.function == 'parse_gs1':
         GS1_ELEMENT.barcode = args.barcode
-        res = GS1_ELEMENT.parse_gs1()
-        if args.verbose:
-            print("EAN number: " + res[0])
-            print("LOT number: " + res[1])
-            print("Expiration date: " + res[2])
-            print("Catalog number: " + res[3])
-        else:
-            print(res)
+        ret = GS1_ELEMENT.parse_gs1()
+
+    if args.function == 'parse_ai':
+        import gs1_ai
+        ret = gs1_ai.parse(args.barcode)
+
+    if args.function == 'decode_character':
+        ret = decode_character(args.barcode)
 
     if args.function == 'format_barcode':
         GS1_ELEMENT.barcode = args.barcode
         GS1_ELEMENT.format_barcode()
-        res = str(GS1_ELEMENT.barcode)
-        if args.verbose:
-            print("GS1 formatted barcode: " + res)
-        else:
-            print(res)
+        ret = GS1_ELEMENT.barcode
+    return ret
 
 
-def execute_check():
+def execute_check(args):
     """Check functions.
+
+    Arguments:
+        args {Namespace} -- program arguments
+
+    Returns:
+        bool -- check result
     """
 
-    args = parse_arguments()
+    ret = None
     GS1_CHECK.set_barcode(args.barcode)
     if args.function == 'check_gtin_id':
-        res = str(GS1_CHECK.check_gtin_id())
-        if args.verbose:
-            print("GTIN ID: " + res)
-        else:
-            print(res)
+        ret = GS1_CHECK.check_gtin_id()
+    if args.function == 'check_gtin_check_digit':
+        ret = GS1_CHECK.check_gtin_check_digit()
     if args.function == 'verify':
-        res = str(GS1_CHECK.verify())
-        if args.verbose:
-            print("GS1 verification: " + res)
-        else:
-            print(res)
+        ret = GS1_CHECK.verify()
+    if args.function == 'validate':
+        ret = GS1_CHECK.validate()
+    return ret
 
 
-def execute_get_element():
+def execute_get_element(args):
     """Get elements functions.
+
+    Arguments:
+        args {Namespace} -- program arguments
+
+    Returns:
+        str -- barcode element
     """
 
-    args = parse_arguments()
+    ret = None
     GS1_ELEMENT.barcode = args.barcode
     if args.function == 'get_ean_number':
-        res = str(GS1_ELEMENT.get_ean_number())
-        if args.verbose:
-            print("EAN number: " + res)
-        else:
-            print(res)
+        ret = GS1_ELEMENT.get_ean_number()
     if args.function == 'get_lot_number':
-        res = str(GS1_ELEMENT.get_lot_number())
-        if args.verbose:
-            print("LOT number: " + res)
-        else:
-            print(res)
+        ret = GS1_ELEMENT.get_lot_number()
     if args.function == 'get_expiration_date':
-        res = str(GS1_ELEMENT.get_expiration_date())
-        if args.verbose:
-            print("Expiration date: " + res)
-        else:
-            print(res)
+        ret = GS1_ELEMENT.get_expiration_date()
     if args.function == 'get_catalog_number':
-        res = str(GS1_ELEMENT.get_catalog_number())
-        if args.verbose:
-            print("Catalog number: " + res)
-        else:
-            print(res)
+        ret = GS1_ELEMENT.get_catalog_number()
+    return ret
 
 
-def execute_creation():
+def execute_creation(args):
     """Barcode craetion functions.
+
+    Arguments:
+        args {Namespace} -- program arguments
+
+    Returns:
+        str -- GS1 barcode
     """
 
-    args = parse_arguments()
     GS1_CREATE.ean_number = args.eannumber
     GS1_CREATE.lot_number = args.lotnumber
     GS1_CREATE.expiration_date = args.expiration
     GS1_CREATE.catalog_number = args.catalognumber
-    if args.function == 'create_gs1':
-        GS1_CREATE.output_style = "Normal"
-        res = str(GS1_CREATE.create_gs1())
-        if args.verbose:
-            print("GS1 barcode: " + res)
-        else:
-            print(res)
-    if args.function == 'create_gs1_with_brackets':
-        GS1_CREATE.output_style = "Brackets"
-        res = str(GS1_CREATE.create_gs1())
-        if args.verbose:
-            print("GS1 barcode: " + res)
+    GS1_CREATE.output_style = CREATION_STYLES.get(args.function)
+    return GS1_CREATE.create_gs1()
+
+
+def iter_batch(args, lines):
+    """Run the selected function for every input line.
+
+    Barcode functions read one barcode per line, creation functions read
+    EAN,LOT,expiration date,catalog number rows. Empty lines are skipped.
+
+    Arguments:
+        args {Namespace} -- program arguments
+        lines {iterable} -- input lines
+
+    Yields:
+        dict -- input, result and error of one line
+    """
+
+    from argparse import Namespace
+
+    row_args = Namespace(**vars(args))
+    creation = args.function[0:7] == "create_"
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        record = {"input": line, "result": None, "error": None}
+        try:
+            if creation:
+                fields = line.split(",")
+                if len(fields) != len(CREATION_FIELDS):
+                    raise ValueError("expected %d fields, got %d" %
+                                     (len(CREATION_FIELDS), len(fields)))
+                for name, value in zip(CREATION_FIELDS, fields):
+                    setattr(row_args, name, value.strip())
+            else:
+                row_args.barcode = line
+            res = get_result(row_args)
+            if args.function == 'parse_gs1' and res is not None:
+                res = res._asdict()
+            record["result"] = res
+        except (ValueError, KeyError, TypeError, IndexError) as err:
+            record["error"] = str(err)
+        yield record
+
+
+def run_batch_chunk(args, lines):
+    """Run the selected function for a chunk of input lines.
+
+    Arguments:
+        args {Namespace} -- program arguments
+        lines {list} -- input lines
+
+    Returns:
+        list -- batch records
+    """
+
+    return list(iter_batch(args, lines))
+
+
+def run_batch_chunk_metrics(args, lines):
+    """Run the selected function for a chunk of input lines with metrics.
+
+    Arguments:
+        args {Namespace} -- program arguments
+        lines {list} -- input lines
+
+    Returns:
+        list -- one pair of the batch records and the metrics of the chunk
+    """
+
+    import gs1_metrics
+
+    # The metrics of a worker are its own, the parent merges every chunk.
+    metrics = gs1_metrics.enable(sys.modules[__name__])
+    metrics.reset()
+    return [(list(iter_batch(args, lines)), metrics)]
+
+
+def merge_chunk_metrics(chunks):
+    """Merge the metrics of batch chunks into the metrics of this process.
+
+    Arguments:
+        chunks {iterable} -- batch records and metrics pairs
+
+    Yields:
+        dict -- batch record
+    """
+
+    import gs1_metrics
+
+    for records, metrics in chunks:
+        gs1_metrics.METRICS.merge(metrics)
+        yield from records
+
+
+def iter_batch_parallel(args, lines):
+    """Run the selected function for every input line in a process pool.
+
+    With --metrics, the metrics of the workers are merged into the
+    metrics of this process.
+
+    Arguments:
+        args {Namespace} -- program arguments
+        lines {iterable} -- input lines
+
+    Returns:
+        iterator -- batch records, in input order
+    """
+
+    from functools import partial
+
+    if args.metrics:
+        return merge_chunk_metrics(map_chunks(
+            partial(run_batch_chunk_metrics, args), lines,
+            args.processes or None, args.chunk_size))
+    return map_chunks(partial(run_batch_chunk, args), lines,
+                      args.processes or None, args.chunk_size)
+
+
+def write_jsonl(records, target):
+    """Write batch records as JSON lines.
+
+    Arguments:
+        records {iterable} -- batch records
+        target {file} -- output stream
+    """
+
+    import json
+
+    for record in records:
+        target.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def write_csv(records, target, function):
+    """Write batch records as CSV.
+
+    Arguments:
+        records {iterable} -- batch records
+        target {file} -- output stream
+        function {str} -- executed function, selects the result columns
+    """
+
+    import csv
+
+    writer = csv.writer(target, lineterminator="\n")
+    if function == 'parse_gs1':
+        writer.writerow(["input"] + list(GS1Elements._fields) + ["error"])
+        for record in records:
+            res = record["result"] or {}
+            writer.writerow([record["input"]] +
+                            [res.get(field, "")
+                             for field in GS1Elements._fields] +
+                            [record["error"] or ""])
+    else:
+        writer.writerow(["input", "result", "error"])
+        for record in records:
+            res = record["result"]
+            writer.writerow([record["input"],
+                             "" if res is None else res,
+                             record["error"] or ""])
+
+
+def write_zpl_job(lines, target):
+    """Write creation rows as a ZPL job with a stored label format.
+
+    Arguments:
+        lines {iterable} -- EAN,LOT,expiration date,catalog number rows
+        target {file} -- output stream
+    """
+
+    import gs1_zpl
+
+    job = gs1_zpl.ZPLJob(target)
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        fields = [field.strip() for field in line.split(",")]
+        if len(fields) != len(CREATION_FIELDS):
+            sys.stderr.write("skipped %s: expected %d fields, got %d\n" %
+                             (line, len(CREATION_FIELDS), len(fields)))
+            continue
+        try:
+            job.add_label(*fields)
+        except ValueError as err:
+            sys.stderr.write("skipped %s: %s\n" % (line, err))
+
+
+def execute_batch(args):
+    """Run the selected function over the batch input.
+
+    Arguments:
+        args {Namespace} -- program arguments
+    """
+
+    if args.input == '-':
+        source = sys.stdin
+    else:
+        source = open(args.input, encoding="utf-8")
+    try:
+        if args.output_format == 'zpl':
+            write_zpl_job(source, sys.stdout)
+            return
+        if args.processes == 1:
+            records = iter_batch(args, source)
         else:
-            print(res)
-    if args.function == 'create_gs1_zpl':
-        GS1_CREATE.output_style = "ZPL"
-        res = str(GS1_CREATE.create_gs1())
-        if args.verbose:
-            print("GS1 barcode: " + res)
+            records = iter_batch_parallel(args, source)
+        if args.output_format == 'csv':
+            write_csv(records, sys.stdout, args.function)
         else:
-            print(res)
+            write_jsonl(records, sys.stdout)
+    finally:
+        if source is not sys.stdin:
+            source.close()
 
-    if args.function == 'create_gs1_character':
-        GS1_CREATE.output_style = "Character"
-        res = str(GS1_CREATE.create_gs1())
-        if args.verbose:
-            print("GS1 barcode: " + res)
-        else:
-            print(res)
 
+GS1_ELEMENT = GS1GetElement()
+GS1_CHECK = GS1Check()
+GS1_CREATE = GS1Create()
 
 if __name__ == '__main__':
-    GS1_ELEMENT = GS1GetElement()
-    GS1_CHECK = GS1Check()
-    GS1_CREATE = GS1Create()
     execute_program()
     sys.exit()
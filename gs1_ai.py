@@ -0,0 +1,462 @@
+# -*- coding: utf-8 -*-
+"""
+This module deals with GS1 Application Identifiers (AI).
+
+Element strings are parsed with a table of every AI. The table is compiled
+into a prefix trie once, so an element string is read in a single linear
+pass whatever AIs it contains and in whatever order.
+"""
+
+
+from collections import namedtuple
+
+GS = "\x1d"
+SYMBOLOGY_IDS = ("]C1", "]e0", "]d2", "]Q3", "]J1")
+
+# Character sets of the GS1 General Specifications.
+CHARSETS = {
+    "N": frozenset("0123456789"),
+    "X": frozenset("!\"%&'()*+,-./0123456789:;<=>?"
+                   "ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz"),
+    "Y": frozenset("#-/0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"),
+    "Z": frozenset("-0123456789=ABCDEFGHIJKLMNOPQRSTUVWXYZ_"
+                   "abcdefghijklmnopqrstuvwxyz")
+}
+
+# Element strings starting with these digits have a predefined length and
+# are never terminated by FNC1.
+PREDEFINED_LENGTH = {
+    "00": 20, "01": 16, "02": 16, "03": 16, "04": 18, "11": 8, "12": 8,
+    "13": 8, "14": 8, "15": 8, "16": 8, "17": 8, "18": 8, "19": 8, "20": 4,
+    "31": 10, "32": 10, "33": 10, "34": 10, "35": 10, "36": 10, "41": 16
+}
+
+# AI, format, data title. Formats are parts joined by "+": N14 is fixed,
+# X..20 is up to 20 and N6..12 is 6 to 12 characters. A variable part after
+# the first one is optional.
+AI_TABLE = [
+    ("00", "N18", "SSCC"),
+    ("01", "N14", "GTIN"),
+    ("02", "N14", "CONTENT"),
+    ("03", "N14", "MTO GTIN"),
+    ("10", "X..20", "BATCH/LOT"),
+    ("11", "N6", "PROD DATE"),
+    ("12", "N6", "DUE DATE"),
+    ("13", "N6", "PACK DATE"),
+    ("15", "N6", "BEST BEFORE or BEST BY"),
+    ("16", "N6", "SELL BY"),
+    ("17", "N6", "USE BY OR EXPIRY"),
+    ("20", "N2", "VARIANT"),
+    ("21", "X..20", "SERIAL"),
+    ("22", "X..20", "CPV"),
+    ("235", "X..28", "TPX"),
+    ("240", "X..30", "ADDITIONAL ID"),
+    ("241", "X..30", "CUST. PART No."),
+    ("242", "N..6", "MTO VARIANT"),
+    ("243", "X..20", "PCN"),
+    ("250", "X..30", "SECONDARY SERIAL"),
+    ("251", "X..30", "REF. TO SOURCE"),
+    ("253", "N13+X..17", "GDTI"),
+    ("254", "X..20", "GLN EXTENSION COMPONENT"),
+    ("255", "N13+N..12", "GCN"),
+    ("30", "N..8", "VAR. COUNT"),
+    ("37", "N..8", "COUNT"),
+    ("400", "X..30", "ORDER NUMBER"),
+    ("401", "X..30", "GINC"),
+    ("402", "N17", "GSIN"),
+    ("403", "X..30", "ROUTE"),
+    ("410", "N13", "SHIP TO LOC"),
+    ("411", "N13", "BILL TO"),
+    ("412", "N13", "PURCHASE FROM"),
+    ("413", "N13", "SHIP FOR LOC"),
+    ("414", "N13", "LOC No."),
+    ("415", "N13", "PAY TO"),
+    ("416", "N13", "PROD/SERV LOC"),
+    ("417", "N13", "PARTY"),
+    ("420", "X..20", "SHIP TO POST"),
+    ("421", "N3+X..9", "SHIP TO POST"),
+    ("422", "N3", "ORIGIN"),
+    ("423", "N3+N..12", "COUNTRY - INITIAL PROCESS."),
+    ("424", "N3", "COUNTRY - PROCESS."),
+    ("425", "N3+N..12", "COUNTRY - DISASSEMBLY"),
+    ("426", "N3", "COUNTRY - FULL PROCESS"),
+    ("427", "X..3", "ORIGIN SUBDIVISION"),
+    ("4300", "X..35", "SHIP TO COMP"),
+    ("4301", "X..35", "SHIP TO NAME"),
+    ("4302", "X..70", "SHIP TO ADD1"),
+    ("4303", "X..70", "SHIP TO ADD2"),
+    ("4304", "X..70", "SHIP TO SUB"),
+    ("4305", "X..70", "SHIP TO LOC"),
+    ("4306", "X..70", "SHIP TO REG"),
+    ("4307", "X2", "SHIP TO COUNTRY"),
+    ("4308", "X..30", "SHIP TO PHONE"),
+    ("4309", "N20", "SHIP TO GEO"),
+    ("4310", "X..35", "RTN TO COMP"),
+    ("4311", "X..35", "RTN TO NAME"),
+    ("4312", "X..70", "RTN TO ADD1"),
+    ("4313", "X..70", "RTN TO ADD2"),
+    ("4314", "X..70", "RTN TO SUB"),
+    ("4315", "X..70", "RTN TO LOC"),
+    ("4316", "X..70", "RTN TO REG"),
+    ("4317", "X2", "RTN TO COUNTRY"),
+    ("4318", "X..20", "RTN TO POST"),
+    ("4319", "X..30", "RTN TO PHONE"),
+    ("4320", "X..35", "SRV DESCRIPTION"),
+    ("4321", "N1", "DANGEROUS GOODS"),
+    ("4322", "N1", "AUTH LEAVE"),
+    ("4323", "N1", "SIG REQUIRED"),
+    ("4324", "N10", "NBEF DEL DT"),
+    ("4325", "N10", "NAFT DEL DT"),
+    ("4326", "N6", "REL DATE"),
+    ("4330", "N6+X..1", "MAX TEMP F"),
+    ("4331", "N6+X..1", "MAX TEMP C"),
+    ("4332", "N6+X..1", "MIN TEMP F"),
+    ("4333", "N6+X..1", "MIN TEMP C"),
+    ("7001", "N13", "NSN"),
+    ("7002", "X..30", "MEAT CUT"),
+    ("7003", "N10", "EXPIRY TIME"),
+    ("7004", "N..4", "ACTIVE POTENCY"),
+    ("7005", "X..12", "CATCH AREA"),
+    ("7006", "N6", "FIRST FREEZE DATE"),
+    ("7007", "N6..12", "HARVEST DATE"),
+    ("7008", "X..3", "AQUATIC SPECIES"),
+    ("7009", "X..10", "FISHING GEAR TYPE"),
+    ("7010", "X..2", "PROD METHOD"),
+    ("7011", "N6..10", "TEST BY DATE"),
+    ("7020", "X..20", "REFURB LOT"),
+    ("7021", "X..20", "FUNC STAT"),
+    ("7022", "X..20", "REV STAT"),
+    ("7023", "X..30", "GIAI - ASSEMBLY"),
+    ("7040", "N1+X3", "UIC+EXT"),
+    ("710", "X..20", "NHRN PZN"),
+    ("711", "X..20", "NHRN CIP"),
+    ("712", "X..20", "NHRN CN"),
+    ("713", "X..20", "NHRN DRN"),
+    ("714", "X..20", "NHRN AIM"),
+    ("715", "X..20", "NHRN NDC"),
+    ("716", "X..20", "NHRN AIC"),
+    ("7240", "X..20", "PROTOCOL"),
+    ("7241", "N2", "AIDC MEDIA TYPE"),
+    ("7242", "X..25", "VCN"),
+    ("7250", "N8", "DOB"),
+    ("7251", "N12", "DOB TIME"),
+    ("7252", "N1", "BIO SEX"),
+    ("7253", "X..40", "FAMILY NAME"),
+    ("7254", "X..40", "GIVEN NAME"),
+    ("7255", "X..10", "SUFFIX"),
+    ("7256", "X..90", "FULL NAME"),
+    ("7257", "X..70", "PERSON ADDR"),
+    ("7258", "N1+X1+N1", "BIRTH SEQUENCE"),
+    ("7259", "X..40", "BABY"),
+    ("8001", "N14", "DIMENSIONS"),
+    ("8002", "X..20", "CMT No."),
+    ("8003", "N14+X..16", "GRAI"),
+    ("8004", "X..30", "GIAI"),
+    ("8005", "N6", "PRICE PER UNIT"),
+    ("8006", "N14+N2+N2", "ITIP"),
+    ("8007", "X..34", "IBAN"),
+    ("8008", "N8+N..4", "PROD TIME"),
+    ("8009", "X..50", "OPTSEN"),
+    ("8010", "Y..30", "CPID"),
+    ("8011", "N..12", "CPID SERIAL"),
+    ("8012", "X..20", "VERSION"),
+    ("8013", "X..25", "GMN"),
+    ("8017", "N18", "GSRN - PROVIDER"),
+    ("8018", "N18", "GSRN - RECIPIENT"),
+    ("8019", "N..10", "SRIN"),
+    ("8020", "X..25", "REF No."),
+    ("8026", "N14+N2+N2", "ITIP CONTENT"),
+    ("8030", "Z..90", "DIGSIG"),
+    ("8110", "X..70", "COUPON"),
+    ("8111", "N4", "POINTS"),
+    ("8112", "X..70", "PAPERLESS COUPON"),
+    ("8200", "X..70", "PRODUCT URL"),
+    ("90", "X..30", "INTERNAL")
+]
+
+# Families of AIs whose last digit is the decimal point position or a
+# sequence number.
+MEASURE_TITLES = {
+    "310": "NET WEIGHT (kg)", "311": "LENGTH (m)", "312": "WIDTH (m)",
+    "313": "HEIGHT (m)", "314": "AREA (m2)", "315": "NET VOLUME (l)",
+    "316": "NET VOLUME (m3)", "320": "NET WEIGHT (lb)", "321": "LENGTH (in)",
+    "322": "LENGTH (ft)", "323": "LENGTH (yd)", "324": "WIDTH (in)",
+    "325": "WIDTH (ft)", "326": "WIDTH (yd)", "327": "HEIGHT (in)",
+    "328": "HEIGHT (ft)", "329": "HEIGHT (yd)", "330": "GROSS WEIGHT (kg)",
+    "331": "LENGTH (m), log", "332": "WIDTH (m), log",
+    "333": "HEIGHT (m), log", "334": "AREA (m2), log",
+    "335": "VOLUME (l), log", "336": "VOLUME (m3), log",
+    "337": "KG PER m2", "340": "GROSS WEIGHT (lb)",
+    "341": "LENGTH (in), log", "342": "LENGTH (ft), log",
+    "343": "LENGTH (yd), log", "344": "WIDTH (in), log",
+    "345": "WIDTH (ft), log", "346": "WIDTH (yd), log",
+    "347": "HEIGHT (in), log", "348": "HEIGHT (ft), log",
+    "349": "HEIGHT (yd), log", "350": "AREA (in2)", "351": "AREA (ft2)",
+    "352": "AREA (yd2)", "353": "AREA (in2), log", "354": "AREA (ft2), log",
+    "355": "AREA (yd2), log", "356": "NET WEIGHT (t oz)",
+    "357": "NET VOLUME (oz)", "360": "NET VOLUME (qt)",
+    "361": "NET VOLUME (gal.)", "362": "VOLUME (qt), log",
+    "363": "VOLUME (gal.), log", "364": "VOLUME (in3)",
+    "365": "VOLUME (ft3)", "366": "VOLUME (yd3)",
+    "367": "VOLUME (in3), log", "368": "VOLUME (ft3), log",
+    "369": "VOLUME (yd3), log"
+}
+AI_TABLE.extend((prefix + str(digit), "N6", title)
+                for prefix, title in sorted(MEASURE_TITLES.items())
+                for digit in range(6))
+AI_TABLE.extend(("390" + str(digit), "N..15", "AMOUNT") for digit in range(10))
+AI_TABLE.extend(("391" + str(digit), "N3+N..15", "AMOUNT")
+                for digit in range(10))
+AI_TABLE.extend(("392" + str(digit), "N..15", "PRICE") for digit in range(10))
+AI_TABLE.extend(("393" + str(digit), "N3+N..15", "PRICE")
+                for digit in range(10))
+AI_TABLE.extend(("394" + str(digit), "N4", "PRCNT OFF") for digit in range(4))
+AI_TABLE.extend(("395" + str(digit), "N6", "PRICE/UoM") for digit in range(6))
+AI_TABLE.extend(("703" + str(digit), "N3+X..27", "PROCESSOR # " + str(digit))
+                for digit in range(10))
+AI_TABLE.extend(("723" + str(digit), "X..30", "CERT # " + str(digit + 1))
+                for digit in range(10))
+AI_TABLE.extend((str(ai), "X..90", "INTERNAL") for ai in range(91, 100))
+
+AIDefinition = namedtuple(
+    "AIDefinition",
+    ["ai", "title", "parts", "min_length", "max_length", "fnc1"])
+
+
+def parse_format(fmt):
+    """Split an AI format into its parts.
+
+    Arguments:
+        fmt {str} -- format, e.g. N13+X..17
+
+    Returns:
+        tuple -- (charset, min length, max length) per part
+    """
+
+    parts = []
+    for part in fmt.split("+"):
+        charset = part[0]
+        if ".." in part:
+            low, high = part[1:].split("..")
+            if not low:
+                low = 0 if parts else 1
+            parts.append((charset, int(low), int(high)))
+        else:
+            parts.append((charset, int(part[1:]), int(part[1:])))
+    return tuple(parts)
+
+
+def build_trie(table):
+    """Build the AI prefix trie.
+
+    Arguments:
+        table {list} -- (AI, format, title) rows
+
+    Returns:
+        dict -- nested dicts keyed by digit, AIDefinition leaves
+    """
+
+    trie = {}
+    for ai, fmt, title in table:
+        parts = parse_format(fmt)
+        definition = AIDefinition(
+            ai, title, parts,
+            sum(part[1] for part in parts),
+            sum(part[2] for part in parts),
+            ai[:2] not in PREDEFINED_LENGTH)
+        node = trie
+        for digit in ai[:-1]:
+            node = node.setdefault(digit, {})
+            if not isinstance(node, dict):
+                raise ValueError("AI %s is not prefix-free" % ai)
+        if ai[-1] in node:
+            raise ValueError("AI %s is not prefix-free" % ai)
+        node[ai[-1]] = definition
+    return trie
+
+
+AI_TRIE = build_trie(AI_TABLE)
+
+
+def lookup_ai(data, pos=0):
+    """Find the AI at a position of an element string.
+
+    Arguments:
+        data {str} -- element string
+        pos {int} -- position of the AI
+
+    Returns:
+        AIDefinition -- AI definition or None if no AI starts there
+    """
+
+    node = AI_TRIE
+    while isinstance(node, dict):
+        if pos >= len(data):
+            return None
+        node = node.get(data[pos])
+        pos += 1
+    return node
+
+
+def check_value(definition, value):
+    """Check the value of an element against its AI format.
+
+    Arguments:
+        definition {AIDefinition} -- AI definition
+        value {str} -- element value
+
+    Returns:
+        str -- error message, None if the value is valid
+    """
+
+    length = len(value)
+    if length < definition.min_length or length > definition.max_length:
+        return "AI %s: invalid length %d" % (definition.ai, length)
+    pos = 0
+    for charset, low, high in definition.parts:
+        end = min(pos + high, length)
+        if end - pos < low:
+            return "AI %s: invalid length %d" % (definition.ai, length)
+        allowed = CHARSETS[charset]
+        for char in value[pos:end]:
+            if char not in allowed:
+                return "AI %s: invalid character %r" % (definition.ai, char)
+        pos = end
+    return None
+
+
+def parse_element_string(data):
+    """Parse a GS1 element string.
+
+    Variable length elements are terminated by GS (FNC1) unless they are
+    the last one. A leading symbology identifier or FNC1 is skipped.
+
+    Arguments:
+        data {str} -- element string, e.g. 0105996527176340102014<GS>17...
+
+    Raises:
+        ValueError -- unknown AI, invalid length or character
+
+    Returns:
+        list -- (AI, value) pairs in order
+    """
+
+    for prefix in SYMBOLOGY_IDS:
+        if data.startswith(prefix):
+            data = data[len(prefix):]
+            break
+    pos = 0
+    length = len(data)
+    if length and data[0] == GS:
+        pos = 1
+    ret = []
+    while pos < length:
+        definition = lookup_ai(data, pos)
+        if definition is None:
+            raise ValueError("unknown AI at position %d" % pos)
+        start = pos + len(definition.ai)
+        if definition.fnc1:
+            end = data.find(GS, start, start + definition.max_length + 1)
+            if end < 0:
+                end = start + definition.max_length
+                # Only the last element may end without GS.
+                if end < length:
+                    raise ValueError("AI %s: missing FNC1 at position %d" %
+                                     (definition.ai, end))
+                end = length
+        else:
+            end = start + definition.max_length
+            if end > length:
+                raise ValueError("AI %s: invalid length %d" %
+                                 (definition.ai, length - start))
+        value = data[start:end]
+        error = check_value(definition, value)
+        if error is not None:
+            raise ValueError(error)
+        ret.append((definition.ai, value))
+        pos = end
+        if pos < length and data[pos] == GS:
+            pos += 1
+    return ret
+
+
+def parse_hri(text):
+    """Parse a human readable GS1 string with bracketed AIs.
+
+    Arguments:
+        text {str} -- e.g. (01)05996527176340(10)2014(17)190731
+
+    Raises:
+        ValueError -- unknown AI, invalid length or character
+
+    Returns:
+        list -- (AI, value) pairs in order
+    """
+
+    ret = []
+    pos = 0
+    length = len(text)
+    while pos < length:
+        if text[pos] != "(":
+            raise ValueError("expected ( at position %d" % pos)
+        close = text.find(")", pos)
+        if close < 0:
+            raise ValueError("unterminated AI at position %d" % pos)
+        ai = text[pos + 1:close]
+        definition = lookup_ai(ai)
+        if definition is None or definition.ai != ai:
+            raise ValueError("unknown AI %s" % ai)
+        pos = text.find("(", close)
+        if pos < 0:
+            pos = length
+        value = text[close + 1:pos]
+        error = check_value(definition, value)
+        if error is not None:
+            raise ValueError(error)
+        ret.append((ai, value))
+    return ret
+
+
+def parse(data):
+    """Parse a GS1 string in bracketed or element string form.
+
+    Arguments:
+        data {str} -- GS1 string
+
+    Raises:
+        ValueError -- unknown AI, invalid length or character
+
+    Returns:
+        list -- (AI, value) pairs in order
+    """
+
+    if data.startswith("("):
+        return parse_hri(data)
+    return parse_element_string(data)
+
+
+def to_element_string(elements):
+    """Build an element string, with GS after variable length elements.
+
+    Arguments:
+        elements {iterable} -- (AI, value) pairs
+
+    Raises:
+        ValueError -- unknown AI
+
+    Returns:
+        str -- element string
+    """
+
+    ret = []
+    last = None
+    for ai, value in elements:
+        definition = lookup_ai(ai)
+        if definition is None or definition.ai != ai:
+            raise ValueError("unknown AI %s" % ai)
+        if last is not None and last.fnc1:
+            ret.append(GS)
+        ret.append(ai)
+        ret.append(value)
+        last = definition
+    return "".join(ret)
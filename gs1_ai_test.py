@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+This module tests for GS1 Application Identifier module.
+"""
+
+import unittest
+
+from gs1_ai import GS, lookup_ai, parse, to_element_string
+
+
+class TestFunctions(unittest.TestCase):
+    """Test functions.
+
+    Arguments:
+        unittest {unittest} -- Calling attribut
+    """
+
+    def setUp(self):
+        self.elements = [("01", "05996527176340"), ("10", "1717"),
+                         ("17", "190731"), ("21", "280122804")]
+        self.element_string = \
+            "0105996527176340101717" + GS + "1719073121280122804"
+
+    def test_lookup_ai(self):
+        """Test.
+        """
+        self.assertEqual(lookup_ai("3103000123").ai, "3103")
+        self.assertEqual(lookup_ai("3103000123").fnc1, False)
+        self.assertEqual(lookup_ai("10ABC").max_length, 20)
+        self.assertEqual(lookup_ai("3"), None)
+
+    def test_parse_element_string(self):
+        """Test.
+        """
+        self.assertEqual(parse(self.element_string), self.elements)
+        self.assertEqual(parse("]C1" + GS + self.element_string),
+                         self.elements)
+
+    def test_parse_any_order(self):
+        """Test.
+        """
+        self.assertEqual(parse("21ABC" + GS + "3103000123" +
+                               "0105996527176340"),
+                         [("21", "ABC"), ("3103", "000123"),
+                          ("01", "05996527176340")])
+
+    def test_parse_hri(self):
+        """Test.
+        """
+        self.assertEqual(
+            parse("(01)05996527176340(10)1717(17)190731(21)280122804"),
+            self.elements)
+
+    def test_parse_invalid(self):
+        """Test.
+        """
+        self.assertRaises(ValueError, parse, "0105996527")
+        self.assertRaises(ValueError, parse, "17ABCDEF")
+        self.assertRaises(ValueError, parse, "(01)0599652717634X")
+        self.assertRaises(ValueError, parse, "0105996527176340XX")
+
+    def test_parse_missing_fnc1(self):
+        """Test.
+        """
+        # A full length LOT must still be followed by GS unless it is last.
+        lot = "1" * 20
+        self.assertEqual(parse("10" + lot + GS + "17190731"),
+                         [("10", lot), ("17", "190731")])
+        self.assertEqual(parse("17190731" + "10" + lot),
+                         [("17", "190731"), ("10", lot)])
+        with self.assertRaises(ValueError) as context:
+            parse("10" + lot + "17190731")
+        self.assertEqual(str(context.exception),
+                         "AI 10: missing FNC1 at position 22")
+
+    def test_to_element_string(self):
+        """Test.
+        """
+        self.assertEqual(to_element_string(self.elements),
+                         self.element_string)
+
+
+if __name__ == '__main__':
+    unittest.main()
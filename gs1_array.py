@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+This module deals with GS1 barcodes in bulk, using NumPy arrays.
+
+The barcodes must have the fixed layout accepted by GS1Check.verify():
+01 + 14 digits, 10 + LOT, 17 + 6 digits, 21 + 9 digits.
+"""
+
+
+from collections import namedtuple
+
+import numpy as np
+
+from gs1 import EAN_START, LOT_START, TAIL_LENGTH
+
+GS1Columns = namedtuple(
+    "GS1Columns",
+    ["ean_number", "lot_number", "expiration_date", "catalog_number",
+     "valid"])
+
+ZERO = np.uint8(ord("0"))
+
+
+def to_fixed_array(barcodes):
+    """Convert barcodes to a fixed-width byte array.
+
+    Brackets are removed as by format_barcode().
+
+    Arguments:
+        barcodes {iterable} -- str or bytes barcodes
+
+    Returns:
+        ndarray -- array of dtype S<longest barcode>
+    """
+
+    encoded = []
+    for barcode in barcodes:
+        if isinstance(barcode, bytes):
+            barcode = barcode.decode("latin-1")
+        encoded.append(barcode.replace("(", "").replace(")", "")
+                       .encode("ascii", "replace"))
+    return np.array(encoded, dtype=np.bytes_)
+
+
+def parse_fixed(barcodes):
+    """Parse GS1 barcodes with vectorized operations.
+
+    Arguments:
+        barcodes {ndarray} -- barcodes as a fixed-width byte array
+        (dtype S<n>, NUL padded) or any sequence of str/bytes
+
+    Returns:
+        GS1Columns -- EAN, LOT, expiration date and catalog number
+        columns (empty for invalid rows) and the validity mask
+    """
+
+    barcodes = np.asarray(barcodes)
+    if barcodes.dtype.kind != "S":
+        barcodes = to_fixed_array(barcodes.ravel().tolist())
+    barcodes = np.ascontiguousarray(barcodes.ravel())
+    count = barcodes.shape[0]
+    width = max(barcodes.dtype.itemsize, LOT_START + TAIL_LENGTH)
+    if width != barcodes.dtype.itemsize:
+        barcodes = barcodes.astype("S%d" % width)
+    raw = barcodes.view(np.uint8).reshape(count, width)
+
+    # NUL padding wraps around to 208 and is not counted as a digit, so a
+    # row is all digits exactly when the digit count equals its length.
+    length = np.char.str_len(barcodes)
+    digits = np.count_nonzero((raw - ZERO) < 10, axis=1)
+    valid = (length >= LOT_START + TAIL_LENGTH) & (digits == length)
+
+    # The expiration date and catalog number are addressed from the end of
+    # every row; gather those TAIL_LENGTH bytes with a single flat take.
+    tail = np.maximum(length - TAIL_LENGTH, 0)
+    starts = np.arange(count) * width + tail
+    block = raw.ravel().take(starts[:, None] + np.arange(TAIL_LENGTH))
+    valid &= (raw[:, 0] == ord("0")) & (raw[:, 1] == ord("1"))
+    valid &= (raw[:, 16] == ord("1")) & (raw[:, 17] == ord("0"))
+    valid &= (block[:, 0] == ord("1")) & (block[:, 1] == ord("7"))
+    valid &= (block[:, 8] == ord("2")) & (block[:, 9] == ord("1"))
+    block[~valid] = 0
+
+    lot_width = max(width - LOT_START - TAIL_LENGTH, 1)
+    lot = raw[:, LOT_START:LOT_START + lot_width].copy()
+    lot[np.arange(lot_width) >= (tail - LOT_START)[:, None]] = 0
+    lot[~valid] = 0
+
+    ean = raw[:, EAN_START:LOT_START - 2].copy()
+    ean[~valid] = 0
+
+    return GS1Columns(ean.view("S14").ravel(),
+                      lot.view("S%d" % lot_width).ravel(),
+                      block[:, 2:8].copy().view("S6").ravel(),
+                      block[:, 10:].copy().view("S9").ravel(),
+                      valid)
+
+
+# Mod 10 weights of an 18 digit key, the last one is the check digit. Shorter
+# keys are left padded with zeros, which keeps the weights aligned.
+MOD10_WEIGHTS = np.array([3, 1] * 9, dtype=np.int32)
+
+
+def _key_digits(codes, width):
+    """Left pad keys with zeros and return their digit matrix.
+
+    Arguments:
+        codes {ndarray} -- keys, dtype S or U
+        width {int} -- padded width
+
+    Returns:
+        tuple -- digit matrix and mask of rows that are all digits
+    """
+
+    codes = np.asarray(codes)
+    if codes.dtype.kind != "S":
+        codes = codes.astype(np.bytes_)
+    codes = np.ascontiguousarray(np.char.zfill(codes.ravel(), width)
+                                 .astype("S%d" % width))
+    digits = codes.view(np.uint8).reshape(-1, width) - ZERO
+    return digits, np.all(digits < 10, axis=1)
+
+
+def mod10_check_digits(bodies):
+    """Compute GS1 mod 10 check digits of many keys.
+
+    Arguments:
+        bodies {ndarray} -- key bodies without check digit, up to 17 digits
+
+    Returns:
+        ndarray -- check digits, -1 for bodies with non-digits or more
+        than 17 digits
+    """
+
+    bodies = np.asarray(bodies)
+    digits, valid = _key_digits(bodies, 17)
+    total = digits.astype(np.int32) @ MOD10_WEIGHTS[:17]
+    ret = (-total % 10).astype(np.int8)
+    # _key_digits() cuts longer bodies to 17 digits.
+    ret[~valid | (np.char.str_len(bodies).ravel() > 17)] = -1
+    return ret
+
+
+def validate_keys(codes, lengths=(8, 12, 13, 14, 18)):
+    """Check the length and mod 10 check digit of many GTINs or SSCCs.
+
+    Arguments:
+        codes {ndarray} -- keys with check digit
+
+    Keyword Arguments:
+        lengths {tuple} -- accepted lengths (default: {GTIN and SSCC})
+
+    Returns:
+        ndarray -- validity mask
+    """
+
+    length = np.char.str_len(np.asarray(codes))
+    digits, valid = _key_digits(codes, 18)
+    total = digits.astype(np.int32) @ MOD10_WEIGHTS
+    return valid & np.isin(length, lengths) & (total % 10 == 0)
+
+
+def mod103_check_values(values):
+    """Compute Code 128 mod 103 check character values of many symbols.
+
+    Arguments:
+        values {ndarray} -- symbol values from the start character, one
+        symbol per row, padded with zeros
+
+    Returns:
+        ndarray -- check character values
+    """
+
+    values = np.asarray(values, dtype=np.int64)
+    weights = np.arange(values.shape[1], dtype=np.int64)
+    weights[0] = 1
+    return (values @ weights) % 103
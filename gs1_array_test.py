@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+This module tests for GS1 bulk array module.
+"""
+
+import unittest
+
+try:
+    import numpy as np
+    from gs1_array import (mod10_check_digits, mod103_check_values,
+                           parse_fixed, to_fixed_array, validate_keys)
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestFunctions(unittest.TestCase):
+    """Test functions.
+
+    Arguments:
+        unittest {unittest} -- Calling attribut
+    """
+
+    def setUp(self):
+        self.barcodes = to_fixed_array([
+            "01059965271763401020141719073121280122804",
+            "(01)05996527176340(10)1717(17)190731(21)280122804",
+            "01059965271763401020A41719073121280122804",
+            "0105996527176340"])
+
+    def test_parse_fixed(self):
+        """Test.
+        """
+        columns = parse_fixed(self.barcodes)
+        self.assertEqual(columns.valid.tolist(), [True, True, False, False])
+        self.assertEqual(columns.ean_number.tolist(),
+                         [b"05996527176340", b"05996527176340", b"", b""])
+        self.assertEqual(columns.lot_number.tolist(),
+                         [b"2014", b"1717", b"", b""])
+        self.assertEqual(columns.expiration_date.tolist(),
+                         [b"190731", b"190731", b"", b""])
+        self.assertEqual(columns.catalog_number.tolist(),
+                         [b"280122804", b"280122804", b"", b""])
+
+    def test_parse_fixed_str_input(self):
+        """Test.
+        """
+        columns = parse_fixed(["01059965271763401020141719073121280122804"])
+        self.assertEqual(columns.lot_number.tolist(), [b"2014"])
+
+    def test_mod10_check_digits(self):
+        """Test.
+        """
+        self.assertEqual(
+            mod10_check_digits([b"0599652717634", b"12345678901",
+                                b"1234567", b"12A"]).tolist(),
+            [0, 2, 0, -1])
+        self.assertEqual(
+            mod10_check_digits([b"12345678901234567",
+                                b"123456789012345678"]).tolist(),
+            [5, -1])
+        self.assertEqual(
+            mod10_check_digits(["12345678901234567",
+                                "123456789012345678"]).tolist(),
+            [5, -1])
+
+    def test_validate_keys(self):
+        """Test.
+        """
+        self.assertEqual(
+            validate_keys([b"05996527176340", b"12345670",
+                           b"106141411234567897", b"05996527176341",
+                           b"0599652717634"]).tolist(),
+            [True, True, True, False, False])
+
+    def test_mod103_check_values(self):
+        """Test.
+        """
+        self.assertEqual(
+            mod103_check_values([[104, 33, 34, 0], [105, 1, 2, 3]]).tolist(),
+            [102, 16])
+
+
+if __name__ == '__main__':
+    unittest.main()
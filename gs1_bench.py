@@ -0,0 +1,402 @@
+# -*- coding: utf-8 -*-
+"""
+This module benchmarks the gs1.py parse, verify and create functions.
+
+Inputs come from a seeded generator, so two runs with the same count and
+seed time the same data. Every benchmark reports ops/sec over a plain loop
+and per-call latency percentiles over a timed loop, and a run can be saved
+as a JSON baseline and compared with a later one. Import and CLI startup
+times are measured in fresh interpreters.
+"""
+
+
+import argparse
+import json
+import os
+import random
+import string
+import subprocess
+import sys
+from time import perf_counter
+
+import gs1_checksum
+from gs1 import GS1Check, GS1Create, GS1GetElement
+
+DEFAULT_COUNT = 2000
+DEFAULT_SEED = 128
+# A benchmark regresses when its ops/sec drops by more than this fraction.
+DEFAULT_TOLERANCE = 0.1
+PERCENTILES = (50, 90, 99)
+CREATE_STYLES = ("Normal", "Brackets", "ZPL", "Character", "HRI", "EPL")
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Prints the seconds spent importing gs1 in a fresh interpreter.
+IMPORT_SCRIPT = "from time import perf_counter; start = perf_counter(); " \
+    "import gs1; print(perf_counter() - start)"
+CLI_ARGUMENTS = ["gs1.py", "-f", "verify", "-c",
+                 "01059965271763401020141719073121280122804"]
+
+
+def generate_rows(count, seed=DEFAULT_SEED):
+    """Generate creation rows.
+
+    Lots vary from 1 to 20 characters and one row in four has an
+    alphanumeric lot.
+
+    Arguments:
+        count {int} -- number of rows
+
+    Keyword Arguments:
+        seed {int} -- random seed (default: {128})
+
+    Returns:
+        list -- EAN number, LOT, expiration date, catalog number rows
+    """
+
+    rand = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        body = "".join(rand.choice(string.digits) for _ in range(13))
+        ean_number = body + str(gs1_checksum.mod10_check_digit(body))
+        alphabet = string.digits
+        if rand.random() < 0.25:
+            alphabet = string.digits + string.ascii_uppercase
+        lot_number = "".join(rand.choice(alphabet)
+                             for _ in range(rand.randint(1, 20)))
+        expiration_date = "%02d%02d%02d" % (rand.randint(18, 40),
+                                            rand.randint(1, 12),
+                                            rand.randint(0, 28))
+        catalog_number = "%09d" % rand.randrange(10 ** 9)
+        rows.append((ean_number, lot_number, expiration_date,
+                     catalog_number))
+    return rows
+
+
+def generate_barcodes(count, seed=DEFAULT_SEED, invalid=0.2):
+    """Generate barcodes, a share of them invalid.
+
+    Invalid barcodes have a wrong check digit, a wrong AI, a missing
+    character or a stray character.
+
+    Arguments:
+        count {int} -- number of barcodes
+
+    Keyword Arguments:
+        seed {int} -- random seed (default: {128})
+        invalid {float} -- share of invalid barcodes (default: {0.2})
+
+    Returns:
+        list -- barcodes without brackets
+    """
+
+    rand = random.Random(seed + 1)
+    gs1_create = GS1Create()
+    barcodes = []
+    for row in generate_rows(count, seed):
+        (gs1_create.ean_number, gs1_create.lot_number,
+         gs1_create.expiration_date, gs1_create.catalog_number) = row
+        barcode = gs1_create.create_gs1()
+        if rand.random() < invalid:
+            damage = rand.randrange(4)
+            if damage == 0:
+                barcode = barcode[:15] + str((int(barcode[15]) + 1) % 10) + \
+                    barcode[16:]
+            elif damage == 1:
+                barcode = "02" + barcode[2:]
+            elif damage == 2:
+                barcode = barcode[:-1]
+            else:
+                position = rand.randrange(len(barcode))
+                barcode = barcode[:position] + "X" + barcode[position:]
+        barcodes.append(barcode)
+    return barcodes
+
+
+def bench_verify(rows, barcodes):
+    """Set up the GS1Check.verify benchmark."""
+
+    gs1_check = GS1Check()
+
+    def call(barcode):
+        gs1_check.barcode = barcode
+        return gs1_check.verify()
+    return call, barcodes
+
+
+def bench_validate(rows, barcodes):
+    """Set up the GS1Check.validate benchmark."""
+
+    gs1_check = GS1Check()
+
+    def call(barcode):
+        gs1_check.barcode = barcode
+        return gs1_check.validate()
+    return call, barcodes
+
+
+def bench_parse_gs1(rows, barcodes):
+    """Set up the GS1GetElement.parse_gs1 benchmark."""
+
+    gs1_element = GS1GetElement()
+
+    def call(barcode):
+        gs1_element.barcode = barcode
+        return gs1_element.parse_gs1()
+    return call, barcodes
+
+
+def bench_create(output_style):
+    """Set up a GS1Create.create_gs1 benchmark for one output style.
+
+    Arguments:
+        output_style {str} -- registered output style name
+
+    Returns:
+        function -- benchmark setup
+    """
+
+    def setup(rows, barcodes):
+        gs1_create = GS1Create()
+        gs1_create.output_style = output_style
+
+        def call(row):
+            (gs1_create.ean_number, gs1_create.lot_number,
+             gs1_create.expiration_date, gs1_create.catalog_number) = row
+            return gs1_create.create_gs1()
+        return call, rows
+    return setup
+
+
+BENCHMARKS = {
+    "verify": bench_verify,
+    "validate": bench_validate,
+    "parse_gs1": bench_parse_gs1,
+}
+for _style in CREATE_STYLES:
+    BENCHMARKS["create_gs1_" + _style.lower()] = bench_create(_style)
+
+
+def percentile(sorted_values, rank):
+    """Get a nearest-rank percentile.
+
+    Arguments:
+        sorted_values {list} -- values in ascending order
+        rank {float} -- percentile from 0 to 100
+
+    Returns:
+        float -- percentile value
+    """
+
+    index = max(0, -(-len(sorted_values) * rank // 100) - 1)
+    return sorted_values[int(index)]
+
+
+def time_function(call, inputs, rounds=3):
+    """Time a function over every input.
+
+    The best of several plain loops gives ops/sec, a loop that times every
+    call gives the latency percentiles.
+
+    Arguments:
+        call {function} -- function of one input
+        inputs {list} -- inputs
+
+    Keyword Arguments:
+        rounds {int} -- plain loops (default: {3})
+
+    Returns:
+        dict -- ops/sec and latency percentiles in microseconds
+    """
+
+    best = None
+    for _ in range(rounds):
+        start = perf_counter()
+        for value in inputs:
+            call(value)
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    latencies = []
+    for value in inputs:
+        start = perf_counter()
+        call(value)
+        latencies.append(perf_counter() - start)
+    latencies.sort()
+    result = {"ops_per_sec": round(len(inputs) / best, 1)}
+    for rank in PERCENTILES:
+        result["p%d_us" % rank] = round(percentile(latencies, rank) * 1e6, 3)
+    return result
+
+
+def run(count=DEFAULT_COUNT, seed=DEFAULT_SEED, names=None):
+    """Run benchmarks.
+
+    Keyword Arguments:
+        count {int} -- inputs per benchmark (default: {2000})
+        seed {int} -- random seed (default: {128})
+        names {list} -- benchmarks to run, substrings of their names
+        (default: {all})
+
+    Returns:
+        dict -- results by benchmark name
+    """
+
+    rows = generate_rows(count, seed)
+    barcodes = generate_barcodes(count, seed)
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if names and not any(part in name for part in names):
+            continue
+        results[name] = time_function(*setup(rows, barcodes))
+    return results
+
+
+def time_startup(rounds=20):
+    """Time importing gs1 and running the CLI in fresh interpreters.
+
+    import_gs1 is the import alone, measured inside the interpreter.
+    cli_verify is the wall time of a whole gs1.py -f verify run.
+
+    Keyword Arguments:
+        rounds {int} -- interpreters started per benchmark (default: {20})
+
+    Returns:
+        dict -- results by benchmark name
+    """
+
+    imports = []
+    runs = []
+    for _ in range(rounds):
+        output = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT],
+                                cwd=PACKAGE_DIR, check=True,
+                                stdout=subprocess.PIPE).stdout
+        imports.append(float(output))
+        start = perf_counter()
+        subprocess.run([sys.executable] + CLI_ARGUMENTS, cwd=PACKAGE_DIR,
+                       check=True, stdout=subprocess.DEVNULL)
+        runs.append(perf_counter() - start)
+    results = {}
+    for name, latencies in (("import_gs1", imports), ("cli_verify", runs)):
+        latencies.sort()
+        result = {"ops_per_sec": round(len(latencies) / sum(latencies), 1)}
+        for rank in PERCENTILES:
+            result["p%d_us" % rank] = round(
+                percentile(latencies, rank) * 1e6, 3)
+        results[name] = result
+    return results
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Compare results with a baseline.
+
+    Arguments:
+        results {dict} -- results by benchmark name
+        baseline {dict} -- baseline results by benchmark name
+
+    Keyword Arguments:
+        tolerance {float} -- allowed ops/sec drop (default: {0.1})
+
+    Returns:
+        list -- (name, baseline ops/sec, ops/sec) of every regression
+    """
+
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        expected = baseline[name]["ops_per_sec"]
+        if result["ops_per_sec"] < expected * (1 - tolerance):
+            regressions.append((name, expected, result["ops_per_sec"]))
+    return regressions
+
+
+def format_results(results, baseline=None):
+    """Format results as a table.
+
+    Arguments:
+        results {dict} -- results by benchmark name
+
+    Keyword Arguments:
+        baseline {dict} -- baseline results to show the change against
+        (default: {None})
+
+    Returns:
+        str -- table
+    """
+
+    header = "%-24s %12s" % ("benchmark", "ops/sec") + \
+        "".join(" %10s" % ("p%d us" % rank) for rank in PERCENTILES)
+    if baseline:
+        header += " %8s" % "change"
+    lines = [header]
+    for name, result in results.items():
+        line = "%-24s %12.1f" % (name, result["ops_per_sec"]) + \
+            "".join(" %10.3f" % result["p%d_us" % rank]
+                    for rank in PERCENTILES)
+        if baseline and name in baseline:
+            change = result["ops_per_sec"] / \
+                baseline[name]["ops_per_sec"] - 1
+            line += " %+7.1f%%" % (change * 100)
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def parse_arguments(argv=None):
+    """
+    Parse program arguments.
+
+    @param argv argument list, sys.argv when None
+    @return arguments
+    """
+    parser = argparse.ArgumentParser(prog="gs1_bench.py")
+    parser.add_argument('-n', '--count', type=int, default=DEFAULT_COUNT,
+                        help='inputs per benchmark')
+    parser.add_argument('-s', '--seed', type=int, default=DEFAULT_SEED,
+                        help='random seed of the generated inputs')
+    parser.add_argument('-k', '--select', action='append',
+                        help='run the benchmarks whose name contains this')
+    parser.add_argument('--save', help='write the results as a baseline')
+    parser.add_argument('--baseline', help='compare with a baseline file')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='allowed ops/sec drop against the baseline')
+    parser.add_argument('--startup', type=int, default=0, metavar='ROUNDS',
+                        help='also time importing gs1 and a CLI run in '
+                        'ROUNDS fresh interpreters')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the benchmarks from the command line.
+
+    Keyword Arguments:
+        argv {list} -- arguments, sys.argv when None (default: {None})
+
+    Returns:
+        int -- exit status, 1 when a benchmark regressed
+    """
+
+    args = parse_arguments(argv)
+    results = run(args.count, args.seed, args.select)
+    if args.startup:
+        results.update(time_startup(args.startup))
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as source:
+            baseline = json.load(source)["results"]
+    print(format_results(results, baseline))
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as target:
+            json.dump({"count": args.count, "seed": args.seed,
+                       "python": sys.version.split()[0],
+                       "results": results}, target, indent=2, sort_keys=True)
+            target.write("\n")
+    if baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        for name, expected, actual in regressions:
+            print("REGRESSION %s: %.1f -> %.1f ops/sec" %
+                  (name, expected, actual))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
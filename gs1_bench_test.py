@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+This module tests for GS1 benchmark module.
+"""
+
+import unittest
+
+import gs1_checksum
+from gs1 import GS1Check
+from gs1_bench import compare, generate_barcodes, generate_rows, percentile
+from gs1_bench import run, time_startup
+
+
+class TestFunctions(unittest.TestCase):
+    """Test functions.
+
+    Arguments:
+        unittest {unittest} -- Calling attribut
+    """
+
+    def test_generate_rows(self):
+        """Test.
+        """
+        rows = generate_rows(50, seed=7)
+        self.assertEqual(rows, generate_rows(50, seed=7))
+        self.assertNotEqual(rows, generate_rows(50, seed=8))
+        for ean_number, lot_number, expiration_date, catalog_number in rows:
+            self.assertTrue(gs1_checksum.is_valid_gtin(ean_number))
+            self.assertTrue(1 <= len(lot_number) <= 20)
+            self.assertEqual(len(expiration_date), 6)
+            self.assertEqual(len(catalog_number), 9)
+
+    def test_generate_barcodes(self):
+        """Test.
+        """
+        gs1_check = GS1Check()
+        verified = []
+        for barcode in generate_barcodes(200, seed=7, invalid=0.5):
+            gs1_check.barcode = barcode
+            verified.append(gs1_check.verify())
+        self.assertIn(True, verified)
+        self.assertIn(False, verified)
+
+    def test_percentile(self):
+        """Test.
+        """
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([5], 90), 5)
+
+    def test_run(self):
+        """Test.
+        """
+        results = run(count=20, names=["verify", "character"])
+        self.assertEqual(sorted(results),
+                         ["create_gs1_character", "verify"])
+        self.assertGreater(results["verify"]["ops_per_sec"], 0)
+        self.assertLessEqual(results["verify"]["p50_us"],
+                             results["verify"]["p99_us"])
+
+    def test_time_startup(self):
+        """Test.
+        """
+        results = time_startup(rounds=1)
+        self.assertEqual(sorted(results), ["cli_verify", "import_gs1"])
+        self.assertLess(results["import_gs1"]["p50_us"],
+                        results["cli_verify"]["p50_us"])
+
+    def test_compare(self):
+        """Test.
+        """
+        baseline = {"verify": {"ops_per_sec": 1000.0},
+                    "parse_gs1": {"ops_per_sec": 1000.0}}
+        results = {"verify": {"ops_per_sec": 950.0},
+                   "parse_gs1": {"ops_per_sec": 800.0},
+                   "create_gs1_zpl": {"ops_per_sec": 10.0}}
+        self.assertEqual(compare(results, baseline),
+                         [("parse_gs1", 1000.0, 800.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+This module deals with GS1 mod 10 and Code 128 mod 103 check digits.
+
+Digit values and weights are looked up in tables built once at import.
+"""
+
+
+from operator import mul
+
+GS1_KEY_LENGTHS = {
+    "GTIN-8": 8,
+    "GTIN-12": 12,
+    "GTIN-13": 13,
+    "GTIN-14": 14,
+    "SSCC": 18
+}
+
+DIGIT_VALUES = {str(digit): digit for digit in range(10)}
+TRIPLE_VALUES = {str(digit): 3 * digit for digit in range(10)}
+
+# Weight of every Code 128 symbol from the start character: 1, 1, 2, 3...
+MOD103_WEIGHTS = [1] + list(range(1, 256))
+
+
+def mod10_check_digit(body):
+    """Compute the GS1 mod 10 check digit.
+
+    Weights are 3 and 1 alternating from the rightmost digit of the body.
+
+    Arguments:
+        body {str} -- digits without the check digit
+
+    Raises:
+        ValueError -- body contains a non-digit
+
+    Returns:
+        int -- check digit
+    """
+
+    try:
+        total = sum(map(TRIPLE_VALUES.__getitem__, body[-1::-2])) + \
+            sum(map(DIGIT_VALUES.__getitem__, body[-2::-2]))
+    except KeyError as err:
+        raise ValueError("invalid digit %s" % err)
+    return -total % 10
+
+
+def is_valid_key(code, lengths=(8, 12, 13, 14, 18)):
+    """Check the length and mod 10 check digit of a GS1 key.
+
+    Arguments:
+        code {str} -- GTIN or SSCC with check digit
+
+    Keyword Arguments:
+        lengths {tuple} -- accepted lengths (default: {GTIN and SSCC})
+
+    Returns:
+        bool -- code is valid
+    """
+
+    if len(code) not in lengths or not code.isascii() or \
+            not code.isdigit():
+        return False
+    return mod10_check_digit(code[:-1]) == DIGIT_VALUES[code[-1]]
+
+
+def is_valid_gtin(code):
+    """Check a GTIN-8, GTIN-12, GTIN-13 or GTIN-14.
+
+    Arguments:
+        code {str} -- GTIN with check digit
+
+    Returns:
+        bool -- GTIN is valid
+    """
+
+    return is_valid_key(code, (8, 12, 13, 14))
+
+
+def is_valid_sscc(code):
+    """Check an SSCC.
+
+    Arguments:
+        code {str} -- 18 digit SSCC with check digit
+
+    Returns:
+        bool -- SSCC is valid
+    """
+
+    return is_valid_key(code, (18,))
+
+
+def mod103_check_value(values):
+    """Compute the Code 128 mod 103 check character value.
+
+    Arguments:
+        values {list} -- symbol values from the start character
+
+    Returns:
+        int -- check character value
+    """
+
+    if len(values) > len(MOD103_WEIGHTS):
+        MOD103_WEIGHTS.extend(range(len(MOD103_WEIGHTS), len(values)))
+    return sum(map(mul, values, MOD103_WEIGHTS)) % 103
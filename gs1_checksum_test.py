@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+This module tests for GS1 check digit module.
+"""
+
+import unittest
+
+from gs1_checksum import (is_valid_gtin, is_valid_sscc, mod10_check_digit,
+                          mod103_check_value)
+
+
+class TestFunctions(unittest.TestCase):
+    """Test functions.
+
+    Arguments:
+        unittest {unittest} -- Calling attribut
+    """
+
+    def test_mod10_check_digit(self):
+        """Test.
+        """
+        self.assertEqual(mod10_check_digit("0599652717634"), 0)
+        self.assertEqual(mod10_check_digit("12345678901"), 2)
+        self.assertEqual(mod10_check_digit("1234567"), 0)
+        self.assertRaises(ValueError, mod10_check_digit, "12A")
+
+    def test_is_valid_gtin(self):
+        """Test.
+        """
+        self.assertEqual(is_valid_gtin("05996527176340"), True)
+        self.assertEqual(is_valid_gtin("5996527176340"), True)
+        self.assertEqual(is_valid_gtin("123456789012"), True)
+        self.assertEqual(is_valid_gtin("12345670"), True)
+        self.assertEqual(is_valid_gtin("05996527176341"), False)
+        self.assertEqual(is_valid_gtin("0599652717634X"), False)
+        self.assertEqual(is_valid_gtin("059965271763"), False)
+
+    def test_is_valid_sscc(self):
+        """Test.
+        """
+        self.assertEqual(is_valid_sscc("106141411234567897"), True)
+        self.assertEqual(is_valid_sscc("106141411234567898"), False)
+
+    def test_mod103_check_value(self):
+        """Test.
+        """
+        self.assertEqual(mod103_check_value([104, 33, 34]), 102)
+        self.assertEqual(mod103_check_value([105] + [1] * 300),
+                         (105 + sum(range(1, 301))) % 103)
+
+
+if __name__ == '__main__':
+    unittest.main()
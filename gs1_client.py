@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+This module forwards gs1.py arguments to a running gs1_daemon.py.
+
+Usage is the same as gs1.py, e.g. gs1_client.py -f verify -c 0105...
+The socket path is taken from the GS1_SOCKET environment variable.
+"""
+
+
+import json
+import os
+import socket
+import sys
+
+DEFAULT_SOCKET = "/tmp/gs1.sock"
+
+
+def request(argv, path=None):
+    """Send one request to the daemon.
+
+    Arguments:
+        argv {list} -- gs1.py arguments
+
+    Keyword Arguments:
+        path {str} -- socket path (default: {GS1_SOCKET or /tmp/gs1.sock})
+
+    Raises:
+        ConnectionError -- the daemon closed the connection without a
+        complete response
+
+    Returns:
+        dict -- output and error of the run
+    """
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(path or os.environ.get("GS1_SOCKET",
+                                                  DEFAULT_SOCKET))
+        connection.sendall(json.dumps(argv).encode("utf-8") + b"\n")
+        response = b""
+        while not response.endswith(b"\n"):
+            chunk = connection.recv(65536)
+            if not chunk:
+                break
+            response += chunk
+    finally:
+        connection.close()
+    if not response.endswith(b"\n"):
+        raise ConnectionError("gs1 daemon closed the connection without "
+                              "a response")
+    return json.loads(response.decode("utf-8"))
+
+
+if __name__ == '__main__':
+    try:
+        RESPONSE = request(sys.argv[1:])
+    except OSError as ERR:
+        sys.exit("gs1_client.py: %s" % ERR)
+    if RESPONSE["error"] is not None:
+        sys.stderr.write(RESPONSE["error"] + "\n")
+        sys.exit(1)
+    print(RESPONSE["output"])
+    sys.exit()
@@ -0,0 +1,621 @@
+# -*- coding: utf-8 -*-
+"""
+This module deals with Code 128 code set selection for GS1-128.
+
+The shortest sequence of code sets A, B and C for the data is found with
+dynamic programming over the data, so digit runs use code set C wherever
+that saves symbols and switches are only inserted when they pay off.
+"""
+
+
+from gs1_checksum import mod103_check_value
+
+FNC1 = "\x1d"
+
+CODE_A = "A"
+CODE_B = "B"
+CODE_C = "C"
+CODE_SETS = (CODE_C, CODE_B, CODE_A)
+
+START = {CODE_A: 103, CODE_B: 104, CODE_C: 105}
+SWITCH = {
+    CODE_A: {CODE_B: 100, CODE_C: 99},
+    CODE_B: {CODE_A: 101, CODE_C: 99},
+    CODE_C: {CODE_A: 101, CODE_B: 100}
+}
+START_SETS = {103: CODE_A, 104: CODE_B, 105: CODE_C}
+# Code set of every switch value, by current code set.
+SWITCH_SETS = {
+    CODE_A: {100: CODE_B, 99: CODE_C},
+    CODE_B: {101: CODE_A, 99: CODE_C},
+    CODE_C: {101: CODE_A, 100: CODE_B}
+}
+SHIFT_VALUE = 98
+FNC1_VALUE = 102
+STOP_VALUE = 106
+
+ZPL_START = {CODE_A: ">9", CODE_B: ">:", CODE_C: ">;"}
+ZPL_SWITCH = {CODE_A: ">7", CODE_B: ">6", CODE_C: ">5"}
+ZPL_SHIFT = ">4"
+ZPL_FNC1 = ">8"
+ZPL_ESCAPE = {">": ">0", "~": ">="}
+ZPL_START_SETS = {zpl: code_set for code_set, zpl in ZPL_START.items()}
+ZPL_SWITCH_SETS = {zpl: code_set for code_set, zpl in ZPL_SWITCH.items()}
+ZPL_UNESCAPE = {zpl: char for char, zpl in ZPL_ESCAPE.items()}
+
+INFINITY = 1 << 30
+
+DIGIT_PAIRS = ["%02d" % value for value in range(100)]
+
+# Actions of an encoding plan.
+DATA = 0
+SWITCH_TO = 1
+SHIFT_TO = 2
+
+# Character classes of plan(), as bit flags.
+IN_A = 1
+IN_B = 2
+DIGIT = 4
+PAIR = 8
+IS_FNC1 = 16
+
+
+def char_value(code_set, char):
+    """Get the symbol value of a character in code set A or B.
+
+    Arguments:
+        code_set {str} -- A or B
+        char {str} -- character
+
+    Returns:
+        int -- symbol value, None if the code set has no such character
+    """
+
+    if char == FNC1:
+        return FNC1_VALUE
+    code = ord(char)
+    if code_set == CODE_A:
+        if 32 <= code <= 95:
+            return code - 32
+        if code < 32:
+            return code + 64
+        return None
+    if 32 <= code <= 127:
+        return code - 32
+    return None
+
+
+def _char_classes():
+    """Build the class flags of every Code 128 character.
+
+    Returns:
+        dict -- IN_A, IN_B, DIGIT and IS_FNC1 flags by character
+    """
+
+    ret = {FNC1: IN_A | IN_B | IS_FNC1}
+    for code in range(128):
+        char = chr(code)
+        if char == FNC1:
+            continue
+        flags = 0
+        if char_value(CODE_A, char) is not None:
+            flags |= IN_A
+        if char_value(CODE_B, char) is not None:
+            flags |= IN_B
+        if "0" <= char <= "9":
+            flags |= DIGIT
+        ret[char] = flags
+    return ret
+
+
+CHAR_CLASSES = _char_classes()
+# Symbols to encode a character in code set B or A by its IN_A | IN_B
+# flags: 1 if the set has it, 2 with SHIFT, INFINITY if neither has it.
+STAY_B = (INFINITY, 2, 1, 1)
+STAY_A = (INFINITY, 1, 2, 1)
+
+
+def _class_signature():
+    """Build the translation of characters to one character per class.
+
+    Returns:
+        dict -- translation table for str.translate()
+    """
+
+    ret = {}
+    for char, flags in CHAR_CLASSES.items():
+        if flags & IS_FNC1:
+            continue
+        if flags & DIGIT:
+            ret[ord(char)] = "0"
+        elif flags & IN_A and flags & IN_B:
+            ret[ord(char)] = "A"
+        elif flags & IN_A:
+            ret[ord(char)] = "\x00"
+        else:
+            ret[ord(char)] = "a"
+    return ret
+
+
+CLASS_SIGNATURE = _class_signature()
+PLAN_CACHE = {}
+PLAN_CACHE_SIZE = 4096
+
+
+def plan(data):
+    """Choose the code sets for the data.
+
+    The choice only depends on the character classes, so it is cached by
+    the class signature of the data: labels with the same layout are
+    planned once.
+
+    Arguments:
+        data {str} -- data, FNC1 as GS
+
+    Raises:
+        ValueError -- character not in Code 128
+
+    Returns:
+        list -- (action, code set, data) steps, the first step is the start
+    """
+
+    signature = data.translate(CLASS_SIGNATURE)
+    layout = PLAN_CACHE.get(signature)
+    if layout is None:
+        layout = [(action, code_set, None if chars is None else len(chars))
+                  for action, code_set, chars in _plan(data)]
+        if len(PLAN_CACHE) >= PLAN_CACHE_SIZE:
+            PLAN_CACHE.clear()
+        PLAN_CACHE[signature] = layout
+    ret = []
+    pos = 0
+    for action, code_set, length in layout:
+        if length is None:
+            ret.append((action, code_set, None))
+        else:
+            ret.append((action, code_set, data[pos:pos + length]))
+            pos += length
+    return ret
+
+
+def _plan(data):
+    """Choose the code sets for the data with dynamic programming.
+
+    Arguments:
+        data {str} -- data, FNC1 as GS
+
+    Raises:
+        ValueError -- character not in Code 128
+
+    Returns:
+        list -- (action, code set, data) steps, the first step is the start
+    """
+
+    length = len(data)
+    classes = [CHAR_CLASSES.get(char, 0) for char in data]
+    for pos in range(length - 1):
+        if classes[pos] & DIGIT and classes[pos + 1] & DIGIT:
+            classes[pos] |= PAIR
+    # cost_s[i] is the number of symbols for data[i:] when in code set s.
+    cost_c = [0] * (length + 1)
+    cost_b = [0] * (length + 1)
+    cost_a = [0] * (length + 1)
+    for pos in range(length - 1, -1, -1):
+        char_class = classes[pos]
+        if char_class & PAIR:
+            stay_c = 1 + cost_c[pos + 2]
+        elif char_class & IS_FNC1:
+            stay_c = 1 + cost_c[pos + 1]
+        else:
+            stay_c = INFINITY
+        stay_b = STAY_B[char_class & 3] + cost_b[pos + 1]
+        stay_a = STAY_A[char_class & 3] + cost_a[pos + 1]
+        # Staying never costs more than switching to the cheapest code set.
+        switch = stay_c if stay_c < stay_b else stay_b
+        if stay_a < switch:
+            switch = stay_a
+        switch += 1
+        cost_c[pos] = stay_c if stay_c < switch else switch
+        cost_b[pos] = stay_b if stay_b < switch else switch
+        cost_a[pos] = stay_a if stay_a < switch else switch
+        if switch > INFINITY:
+            raise ValueError("character %r is not in Code 128" % data[pos])
+
+    # Code sets are handled by their index in CODE_SETS: C, B, A.
+    costs = (cost_c, cost_b, cost_a)
+    current = min(range(3), key=lambda index: costs[index][0])
+    ret = [(SWITCH_TO, CODE_SETS[current], None)]
+    pos = 0
+    while pos < length:
+        stay = _stay_costs(cost_c, cost_b, cost_a, classes[pos], pos)
+        target = costs[current][pos]
+        # Prefer code set C, then staying, when switching costs the same.
+        if current and 1 + stay[0] == target:
+            current = 0
+            ret.append((SWITCH_TO, CODE_C, None))
+            continue
+        if stay[current] != target:
+            current = min((index for index in range(3) if index != current),
+                          key=stay.__getitem__)
+            ret.append((SWITCH_TO, CODE_SETS[current], None))
+            continue
+        char = data[pos]
+        code_set = CODE_SETS[current]
+        if code_set == CODE_C:
+            step = 1 if char == FNC1 else 2
+            ret.append((DATA, code_set, data[pos:pos + step]))
+            pos += step
+        else:
+            if char_value(code_set, char) is None:
+                other = CODE_B if code_set == CODE_A else CODE_A
+                ret.append((SHIFT_TO, other, char))
+            else:
+                ret.append((DATA, code_set, char))
+            pos += 1
+    return ret
+
+
+def _stay_costs(cost_c, cost_b, cost_a, char_class, pos):
+    """Cost of data[pos:] when data[pos] is encoded in each code set.
+
+    Arguments:
+        cost_c {list} -- costs in code set C from pos + 1
+        cost_b {list} -- costs in code set B from pos + 1
+        cost_a {list} -- costs in code set A from pos + 1
+        char_class {int} -- class flags of data[pos]
+        pos {int} -- position
+
+    Returns:
+        tuple -- costs for code sets C, B and A, at least INFINITY if not
+        encodable
+    """
+
+    if char_class & PAIR:
+        stay_c = 1 + cost_c[pos + 2]
+    elif char_class & IS_FNC1:
+        stay_c = 1 + cost_c[pos + 1]
+    else:
+        stay_c = INFINITY
+    return (stay_c, STAY_B[char_class & 3] + cost_b[pos + 1],
+            STAY_A[char_class & 3] + cost_a[pos + 1])
+
+
+def encode(data, gs1=True):
+    """Encode data to Code 128 symbol values.
+
+    Arguments:
+        data {str} -- data, FNC1 as GS
+
+    Keyword Arguments:
+        gs1 {bool} -- start with FNC1 (GS1-128) (default: {True})
+
+    Raises:
+        ValueError -- character not in Code 128
+
+    Returns:
+        list -- symbol values from the start character, without check
+        character and stop
+    """
+
+    if gs1:
+        data = FNC1 + data
+    ret = []
+    current = None
+    for action, code_set, chars in plan(data):
+        if action == SWITCH_TO:
+            if current is None:
+                ret.append(START[code_set])
+            else:
+                ret.append(SWITCH[current][code_set])
+            current = code_set
+        elif chars == FNC1:
+            ret.append(FNC1_VALUE)
+        else:
+            if action == SHIFT_TO:
+                ret.append(SHIFT_VALUE)
+            ret.append(_data_value(code_set, chars))
+    return ret
+
+
+def check_value(values):
+    """Compute the mod 103 check character value.
+
+    Arguments:
+        values {list} -- symbol values from the start character
+
+    Returns:
+        int -- check character value
+    """
+
+    return mod103_check_value(values)
+
+
+def encode_zpl(data, gs1=True):
+    """Encode data to a ZPL ^BC field with explicit code set invocations.
+
+    Arguments:
+        data {str} -- data, FNC1 as GS
+
+    Keyword Arguments:
+        gs1 {bool} -- start with FNC1 (GS1-128) (default: {True})
+
+    Raises:
+        ValueError -- character not in Code 128
+
+    Returns:
+        str -- ^FD data
+    """
+
+    if gs1:
+        data = FNC1 + data
+    ret = []
+    started = False
+    for action, code_set, chars in plan(data):
+        if action == SWITCH_TO:
+            if started:
+                ret.append(ZPL_SWITCH[code_set])
+            else:
+                ret.append(ZPL_START[code_set])
+                started = True
+        elif chars == FNC1:
+            ret.append(ZPL_FNC1)
+        else:
+            if action == SHIFT_TO:
+                ret.append(ZPL_SHIFT)
+            ret.append(_data_zpl(code_set, chars))
+    return "".join(ret)
+
+
+def decode(values, gs1=True):
+    """Decode Code 128 symbol values to data.
+
+    Arguments:
+        values {list} -- symbol values from the start character, without
+        check character and stop
+
+    Keyword Arguments:
+        gs1 {bool} -- require and drop the FNC1 after the start character
+        (GS1-128) (default: {True})
+
+    Raises:
+        ValueError -- values are not valid Code 128
+
+    Returns:
+        str -- data, FNC1 as GS
+    """
+
+    if not values or values[0] not in START_SETS:
+        raise ValueError("missing start character")
+    if gs1 and (len(values) < 2 or values[1] != FNC1_VALUE):
+        raise ValueError("missing FNC1 after the start character")
+    code_set = START_SETS[values[0]]
+    ret = []
+    shifted = None
+    for pos in range(2 if gs1 else 1, len(values)):
+        value = values[pos]
+        data_set = shifted or code_set
+        shifted = None
+        if value == FNC1_VALUE:
+            ret.append(FNC1)
+        elif data_set == CODE_C and value < 100:
+            ret.append(DIGIT_PAIRS[value])
+        elif data_set == CODE_B and value < 96:
+            ret.append(chr(value + 32))
+        elif data_set == CODE_A and value < 96:
+            ret.append(chr(value + 32) if value < 64 else chr(value - 64))
+        elif value in SWITCH_SETS[data_set] and data_set is code_set:
+            code_set = SWITCH_SETS[code_set][value]
+        elif value == SHIFT_VALUE and data_set is code_set and \
+                code_set != CODE_C:
+            shifted = CODE_A if code_set == CODE_B else CODE_B
+        else:
+            raise ValueError("unsupported symbol value %d in code set %s "
+                             "at %d" % (value, data_set, pos))
+    if shifted:
+        raise ValueError("missing character after shift")
+    return "".join(ret)
+
+
+def decode_zpl(data, gs1=True):
+    """Decode a ZPL ^BC field with explicit code set invocations.
+
+    Arguments:
+        data {str} -- ^FD data, as written by encode_zpl()
+
+    Keyword Arguments:
+        gs1 {bool} -- require and drop the FNC1 after the start invocation
+        (GS1-128) (default: {True})
+
+    Raises:
+        ValueError -- data does not start with a code set or has an
+        unsupported invocation
+
+    Returns:
+        str -- data, FNC1 as GS
+    """
+
+    if data[:2] not in ZPL_START_SETS:
+        raise ValueError("missing start code set")
+    if gs1 and data[2:4] != ZPL_FNC1:
+        raise ValueError("missing FNC1 after the start code set")
+    # Every part after the first starts with the character of one
+    # invocation and continues with plain data up to the next one.
+    parts = data.split(">")
+    code_set = ZPL_START_SETS[">" + parts[1][:1]]
+    ret = []
+    shifted = False
+    pos = 1 + len(parts[1])
+    for part in parts[2:]:
+        code = ">" + part[:1]
+        text = part[1:]
+        if code in ZPL_UNESCAPE:
+            ret.append(ZPL_UNESCAPE[code])
+            shifted = False
+        elif shifted:
+            raise ValueError("unexpected %s after shift at %d" % (code, pos))
+        elif code == ZPL_FNC1:
+            ret.append(FNC1)
+        elif code in ZPL_SWITCH_SETS:
+            code_set = ZPL_SWITCH_SETS[code]
+        elif code == ZPL_SHIFT and code_set != CODE_C:
+            if text:
+                ret.append(text[0])
+                text = text[1:]
+            else:
+                shifted = True
+        else:
+            raise ValueError("unsupported invocation %s at %d" % (code, pos))
+        if text:
+            if code_set == CODE_C and (len(text) % 2 or not (
+                    text.isascii() and text.isdigit())):
+                raise ValueError("no digit pairs at %d" % (pos + 2))
+            ret.append(text)
+        pos += 1 + len(part)
+    if shifted:
+        raise ValueError("missing character after shift")
+    if gs1:
+        return "".join(ret)[1:]
+    return "".join(ret)
+
+
+class SuffixEncoder(object):
+    """Class to encode many data strings that only differ in the suffix
+
+    The code set plan only depends on the character classes of the data, so
+    for suffixes of the same length and classes (e.g. fixed width serial
+    numbers) the symbols up to the suffix and their mod 103 sum are computed
+    once and only the remaining symbols are encoded per suffix.
+    """
+
+    def __init__(self, prefix, sample_suffix, gs1=True):
+        data = (FNC1 if gs1 else "") + prefix + sample_suffix
+        self.suffix_length = len(sample_suffix)
+        self.prefix_values = []
+        self.prefix_zpl = []
+        # (fixed value, fixed ZPL, code set, offset, length) per symbol,
+        # offsets relative to tail_start.
+        self.tail = []
+        self.tail_start = None
+        suffix_start = len(data) - self.suffix_length
+        current = None
+        pos = 0
+        for action, code_set, chars in plan(data):
+            length = 0 if chars is None else len(chars)
+            if self.tail_start is None and pos + length > suffix_start:
+                self.tail_start = pos
+            if action == SWITCH_TO:
+                if current is None:
+                    symbols = [(START[code_set], ZPL_START[code_set], None)]
+                else:
+                    symbols = [(SWITCH[current][code_set],
+                                ZPL_SWITCH[code_set], None)]
+                current = code_set
+            elif chars == FNC1:
+                symbols = [(FNC1_VALUE, ZPL_FNC1, None)]
+            elif action == SHIFT_TO:
+                symbols = [(SHIFT_VALUE, ZPL_SHIFT, None),
+                           (None, None, code_set)]
+            else:
+                symbols = [(None, None, code_set)]
+            for value, zpl, data_set in symbols:
+                if self.tail_start is None:
+                    if value is None:
+                        value = _data_value(data_set, chars)
+                        zpl = _data_zpl(data_set, chars)
+                    self.prefix_values.append(value)
+                    self.prefix_zpl.append(zpl)
+                else:
+                    self.tail.append((value, zpl, data_set,
+                                      pos - self.tail_start, length))
+            pos += length
+        if self.tail_start is None:
+            self.tail_start = len(data)
+        self.tail_prefix = data[self.tail_start:suffix_start]
+        self.prefix_sum = mod103_check_value(self.prefix_values)
+        self.prefix_zpl = "".join(self.prefix_zpl)
+
+    def encode(self, suffix):
+        """Encode the symbols after the fixed prefix.
+
+        Arguments:
+            suffix {str} -- suffix of the same length and character classes
+            as the sample suffix
+
+        Raises:
+            ValueError -- suffix length differs from the sample
+
+        Returns:
+            tuple -- symbol values after the prefix and the check value
+        """
+
+        if len(suffix) != self.suffix_length:
+            raise ValueError("suffix %r must have %d characters" %
+                             (suffix, self.suffix_length))
+        data = self.tail_prefix + suffix
+        total = self.prefix_sum
+        weight = len(self.prefix_values)
+        ret = []
+        for value, _, data_set, offset, length in self.tail:
+            if value is None:
+                value = _data_value(data_set, data[offset:offset + length])
+            ret.append(value)
+            total += weight * value
+            weight += 1
+        return ret, total % 103
+
+    def encode_zpl(self, suffix):
+        """Encode the whole ZPL ^FD data.
+
+        Arguments:
+            suffix {str} -- suffix of the same length and character classes
+            as the sample suffix
+
+        Raises:
+            ValueError -- suffix length differs from the sample
+
+        Returns:
+            str -- ^FD data
+        """
+
+        if len(suffix) != self.suffix_length:
+            raise ValueError("suffix %r must have %d characters" %
+                             (suffix, self.suffix_length))
+        data = self.tail_prefix + suffix
+        ret = [self.prefix_zpl]
+        for _, zpl, data_set, offset, length in self.tail:
+            if zpl is None:
+                zpl = _data_zpl(data_set, data[offset:offset + length])
+            ret.append(zpl)
+        return "".join(ret)
+
+
+def _data_value(code_set, chars):
+    """Get the symbol value of data in a code set.
+
+    Arguments:
+        code_set {str} -- code set
+        chars {str} -- one character, or a digit pair in code set C
+
+    Returns:
+        int -- symbol value
+    """
+
+    if code_set == CODE_C:
+        return int(chars)
+    return char_value(code_set, chars)
+
+
+def _data_zpl(code_set, chars):
+    """Get the ZPL text of data in a code set.
+
+    Arguments:
+        code_set {str} -- code set
+        chars {str} -- one character, or a digit pair in code set C
+
+    Returns:
+        str -- ZPL text
+    """
+
+    if code_set == CODE_C:
+        return chars
+    return ZPL_ESCAPE.get(chars, chars)
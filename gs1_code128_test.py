@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+This module tests for Code 128 code set selection module.
+"""
+
+import random
+import unittest
+
+from gs1_code128 import FNC1, check_value, decode, decode_zpl, encode
+from gs1_code128 import encode_zpl
+
+
+class TestFunctions(unittest.TestCase):
+    """Test functions.
+
+    Arguments:
+        unittest {unittest} -- Calling attribut
+    """
+
+    def setUp(self):
+        self.data = "0105996527176340102014" + FNC1 + \
+            "1719073121280122804"
+
+    def test_encode(self):
+        """Test.
+        """
+        self.assertEqual(encode(self.data),
+                         [105, 102, 1, 5, 99, 65, 27, 17, 63, 40, 10, 20, 14,
+                          102, 17, 19, 7, 31, 21, 28, 1, 22, 80, 100, 20])
+        self.assertEqual(check_value(encode(self.data)), 80)
+
+    def test_encode_alphanumeric(self):
+        """Test.
+        """
+        self.assertEqual(encode("10A1B2" + FNC1 + "17190731"),
+                         [105, 102, 10, 100, 33, 17, 34, 18, 99, 102, 17, 19,
+                          7, 31])
+        self.assertEqual(encode("ab\x01c", gs1=False),
+                         [104, 65, 66, 98, 65, 67])
+
+    def test_encode_odd_digits(self):
+        """Test.
+        """
+        self.assertEqual(len(encode("10123" + FNC1 + "17190731")), 11)
+
+    def test_encode_zpl(self):
+        """Test.
+        """
+        self.assertEqual(encode_zpl(self.data),
+                         ">;>80105996527176340102014>8"
+                         "171907312128012280>64")
+        self.assertEqual(encode_zpl("10AB>" + FNC1 + "17190731"),
+                         ">;>810>6AB>0>5>817190731")
+
+    def test_encode_invalid(self):
+        """Test.
+        """
+        self.assertRaises(ValueError, encode, "10É")
+
+    def test_decode(self):
+        """Test.
+        """
+        self.assertEqual(decode(encode(self.data)), self.data)
+        self.assertEqual(decode([104, 65, 66, 98, 65, 67], gs1=False),
+                         "ab\x01c")
+        rand = random.Random(103)
+        alphabet = "0123456789AZaz\x01\x1f !~" + FNC1
+        for _ in range(200):
+            data = "".join(rand.choice(alphabet)
+                           for _ in range(rand.randint(1, 30)))
+            self.assertEqual(decode(encode(data)), data)
+
+    def test_decode_invalid(self):
+        """Test.
+        """
+        self.assertRaises(ValueError, decode, [])
+        self.assertRaises(ValueError, decode, [104, 33])
+        self.assertRaises(ValueError, decode, [104, 102, 100, 33])
+        self.assertRaises(ValueError, decode, [104, 102, 98])
+
+    def test_decode_zpl(self):
+        """Test.
+        """
+        self.assertEqual(decode_zpl(encode_zpl(self.data)), self.data)
+        self.assertEqual(decode_zpl(">;>810>6AB>0>5>817190731"),
+                         "10AB>" + FNC1 + "17190731")
+        rand = random.Random(128)
+        alphabet = "0123456789AZaz\x01\x1f >~" + FNC1
+        for _ in range(200):
+            data = "".join(rand.choice(alphabet)
+                           for _ in range(rand.randint(1, 30)))
+            self.assertEqual(decode_zpl(encode_zpl(data)), data)
+        for data in (">:A", ">;>8123", ">;>812>1", ">:>8A>4>4A"):
+            self.assertRaises(ValueError, decode_zpl, data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+This module serves gs1.py functions from a long-lived process.
+
+The daemon listens on a Unix domain socket and keeps the GS1Check,
+GS1GetElement and GS1Create instances of gs1.py warm. Each request is one
+JSON line with the gs1.py argument list, each response one JSON line with
+the output the program would print (see gs1_client.py).
+"""
+
+
+import argparse
+import errno
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from contextlib import redirect_stderr, redirect_stdout
+
+import gs1
+
+DEFAULT_SOCKET = os.environ.get("GS1_SOCKET", "/tmp/gs1.sock")
+
+# The warm gs1 instances keep per-call state, so requests run one at a time.
+GS1_LOCK = threading.Lock()
+
+
+def execute_request(argv):
+    """Run gs1.py with an argument list.
+
+    Arguments:
+        argv {list} -- gs1.py arguments
+
+    Returns:
+        dict -- output and error of the run
+    """
+
+    with GS1_LOCK:
+        messages = io.StringIO()
+        try:
+            with redirect_stdout(messages), redirect_stderr(messages):
+                args = gs1.parse_arguments(argv)
+        except SystemExit:
+            return {"output": None, "error": messages.getvalue().strip()}
+        if args.batch:
+            return {"output": None, "error": "batch mode is not supported"}
+        if args.function is None:
+            return {"output": None, "error": "no function given"}
+        try:
+            return {"output": gs1.format_result(args, gs1.get_result(args)),
+                    "error": None}
+        except Exception as err:  # pylint: disable=broad-except
+            # Missing arguments fail deep in gs1.py with any error type,
+            # the client gets an answer for every request.
+            return {"output": None, "error": "%s: %s" %
+                    (type(err).__name__, err)}
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Class to answer the requests of one client connection
+    """
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                argv = json.loads(line.decode("utf-8"))
+            except ValueError:
+                argv = None
+            if not isinstance(argv, list):
+                response = {"output": None, "error": "invalid request"}
+            else:
+                response = execute_request([str(arg) for arg in argv])
+            self.wfile.write(json.dumps(response, ensure_ascii=False)
+                             .encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class GS1Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Class to serve gs1.py requests on a Unix domain socket
+    """
+
+    daemon_threads = True
+
+
+def open_server(path=DEFAULT_SOCKET):
+    """Bind the daemon socket.
+
+    A socket left behind by a daemon that is gone is replaced, the socket
+    of a daemon that still accepts connections is not.
+
+    Arguments:
+        path {str} -- socket path
+
+    Raises:
+        OSError -- a daemon is already serving the path
+
+    Returns:
+        GS1Server -- bound server
+    """
+
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)
+        else:
+            raise OSError(errno.EADDRINUSE,
+                          "a gs1 daemon is already serving", path)
+        finally:
+            probe.close()
+    return GS1Server(path, RequestHandler)
+
+
+def serve(path=DEFAULT_SOCKET):
+    """Serve requests until interrupted.
+
+    Arguments:
+        path {str} -- socket path, replaced if no daemon serves it
+
+    Raises:
+        OSError -- a daemon is already serving the path
+    """
+
+    server = open_server(path)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        os.unlink(path)
+
+
+def parse_arguments():
+    """
+    Parse program arguments.
+
+    @return arguments
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-s', '--socket', default=DEFAULT_SOCKET,
+                        help='Unix domain socket path')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    try:
+        serve(parse_arguments().socket)
+    except KeyboardInterrupt:
+        pass
+    except OSError as ERR:
+        sys.exit("gs1_daemon.py: %s" % ERR)
+    sys.exit()
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+This module tests for GS1 daemon and client modules.
+"""
+
+import os
+import socket
+import tempfile
+import threading
+import unittest
+
+from gs1_client import request
+from gs1_daemon import GS1Server, RequestHandler, execute_request
+from gs1_daemon import open_server
+
+
+class TestFunctions(unittest.TestCase):
+    """Test functions.
+
+    Arguments:
+        unittest {unittest} -- Calling attribut
+    """
+
+    def setUp(self):
+        self.barcode = "01059965271763401020141719073121280122804"
+
+    def test_execute_request(self):
+        """Test.
+        """
+        self.assertEqual(execute_request(["-f", "verify", "-c", self.barcode]),
+                         {"output": "True", "error": None})
+        self.assertEqual(execute_request(["-f", "get_lot_number", "-v",
+                                          "-c", self.barcode]),
+                         {"output": "LOT number: 2014", "error": None})
+        response = execute_request(["-f", "unknown"])
+        self.assertEqual(response["output"], None)
+        self.assertIn("invalid choice", response["error"])
+
+    def test_execute_request_missing_argument(self):
+        """Test.
+        """
+        response = execute_request(["-f", "verify"])
+        self.assertEqual(response["output"], None)
+        self.assertIn("Error", response["error"])
+
+    def test_client_request(self):
+        """Test.
+        """
+        path = os.path.join(tempfile.mkdtemp(), "gs1.sock")
+        server = GS1Server(path, RequestHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            self.assertEqual(
+                request(["-f", "create_gs1_character", "-ea", "05996527176340",
+                         "-ln", "2014", "-ex", "190731", "-cn", "280122804"],
+                        path),
+                {"output": "ÍÊ!%Ça;1_H*4.Ê13'?5<!6pÈ4pÎ", "error": None})
+            self.assertIsNotNone(request(["-f", "verify"], path)["error"])
+            self.assertEqual(request({"f": "verify"}, path),
+                             {"output": None, "error": "invalid request"})
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+            os.unlink(path)
+
+    def test_open_server(self):
+        """Test.
+        """
+        path = os.path.join(tempfile.mkdtemp(), "gs1.sock")
+        # A socket file without a daemon is replaced.
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+        server = open_server(path)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            self.assertRaises(OSError, open_server, path)
+            self.assertEqual(request(["-f", "verify", "-c", self.barcode],
+                                     path),
+                             {"output": "True", "error": None})
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+            os.unlink(path)
+
+    def test_client_closed_connection(self):
+        """Test.
+        """
+        path = os.path.join(tempfile.mkdtemp(), "gs1.sock")
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(path)
+        listener.listen(1)
+
+        def close_connection():
+            connection = listener.accept()[0]
+            connection.recv(65536)
+            connection.close()
+
+        thread = threading.Thread(target=close_connection)
+        thread.start()
+        try:
+            self.assertRaises(ConnectionError, request, ["-f", "verify"],
+                              path)
+        finally:
+            thread.join()
+            listener.close()
+            os.unlink(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
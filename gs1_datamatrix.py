@@ -0,0 +1,613 @@
+# -*- coding: utf-8 -*-
+"""
+This module deals with GS1 DataMatrix (ECC 200) symbols.
+
+The element string is encoded in ASCII, with digit pairs in one codeword,
+and runs of upper case letters, digits and spaces in C40 where that is
+shorter. The smallest symbol that holds the codewords is selected, and the
+Reed-Solomon check codewords are computed with GF(256) log and antilog
+tables. The module placement of every symbol size is computed once, so a
+symbol is laid out by a single lookup per module.
+"""
+
+
+import argparse
+import sys
+from collections import namedtuple
+from operator import itemgetter
+
+import gs1_ai
+from gs1 import GS1Create, split_gs1
+
+FNC1 = "\x1d"
+
+FNC1_CODEWORD = 232
+C40_LATCH = 230
+C40_UNLATCH = 254
+UPPER_SHIFT = 235
+PAD = 129
+DIGIT_PAIR_BASE = 130
+
+# Escape character of the ZPL ^BX field, outside the GS1 character set.
+ZPL_ESCAPE = "#"
+
+SymbolSize = namedtuple(
+    "SymbolSize",
+    ["rows", "columns", "data_codewords", "ecc_codewords", "region_rows",
+     "region_columns", "blocks"])
+
+# ECC 200 symbol sizes by data capacity: rows, columns, data codewords,
+# error correction codewords, data region size and interleaved blocks.
+SQUARE_SIZES = [
+    SymbolSize(10, 10, 3, 5, 8, 8, 1),
+    SymbolSize(12, 12, 5, 7, 10, 10, 1),
+    SymbolSize(14, 14, 8, 10, 12, 12, 1),
+    SymbolSize(16, 16, 12, 12, 14, 14, 1),
+    SymbolSize(18, 18, 18, 14, 16, 16, 1),
+    SymbolSize(20, 20, 22, 18, 18, 18, 1),
+    SymbolSize(22, 22, 30, 20, 20, 20, 1),
+    SymbolSize(24, 24, 36, 24, 22, 22, 1),
+    SymbolSize(26, 26, 44, 28, 24, 24, 1),
+    SymbolSize(32, 32, 62, 36, 14, 14, 1),
+    SymbolSize(36, 36, 86, 42, 16, 16, 1),
+    SymbolSize(40, 40, 114, 48, 18, 18, 1),
+    SymbolSize(44, 44, 144, 56, 20, 20, 1),
+    SymbolSize(48, 48, 174, 68, 22, 22, 1),
+    SymbolSize(52, 52, 204, 84, 24, 24, 2),
+    SymbolSize(64, 64, 280, 112, 14, 14, 2),
+    SymbolSize(72, 72, 368, 144, 16, 16, 4),
+    SymbolSize(80, 80, 456, 192, 18, 18, 4),
+    SymbolSize(88, 88, 576, 224, 20, 20, 4),
+    SymbolSize(96, 96, 696, 272, 22, 22, 4),
+    SymbolSize(104, 104, 816, 336, 24, 24, 6),
+    SymbolSize(120, 120, 1050, 408, 18, 18, 6),
+    SymbolSize(132, 132, 1304, 496, 20, 20, 8),
+    SymbolSize(144, 144, 1558, 620, 22, 22, 10),
+]
+RECTANGLE_SIZES = [
+    SymbolSize(8, 18, 5, 7, 6, 16, 1),
+    SymbolSize(8, 32, 10, 11, 6, 14, 1),
+    SymbolSize(12, 26, 16, 14, 10, 24, 1),
+    SymbolSize(12, 36, 22, 18, 10, 16, 1),
+    SymbolSize(16, 36, 32, 24, 14, 16, 1),
+    SymbolSize(16, 48, 49, 28, 14, 22, 1),
+]
+SIZES = {"square": SQUARE_SIZES, "rectangle": RECTANGLE_SIZES}
+
+DataMatrix = namedtuple("DataMatrix", ["size", "codewords", "modules"])
+
+# GF(256) with the ECC 200 polynomial x^8 + x^5 + x^3 + x^2 + 1.
+GF_EXP = [0] * 512
+GF_LOG = [0] * 256
+
+
+def _gf_tables():
+    value = 1
+    for power in range(255):
+        GF_EXP[power] = value
+        GF_LOG[value] = power
+        value <<= 1
+        if value & 0x100:
+            value ^= 0x12D
+    for power in range(255, 512):
+        GF_EXP[power] = GF_EXP[power - 255]
+
+
+_gf_tables()
+
+# C40 values of the basic set: space, digits and upper case letters.
+C40_VALUES = {" ": 3}
+C40_VALUES.update((chr(48 + digit), 4 + digit) for digit in range(10))
+C40_VALUES.update((chr(65 + letter), 14 + letter) for letter in range(26))
+
+RS_TABLES = {}
+PLACEMENTS = {}
+
+
+def rs_table(ecc_length):
+    """Get the Reed-Solomon feedback table of an error correction length.
+
+    The check codewords of a block are kept as one integer register of
+    ecc_length bytes, and the table holds the generator polynomial
+    multiplied by every feedback value, so a data codeword costs one
+    lookup, one shift and one XOR.
+
+    Arguments:
+        ecc_length {int} -- error correction codewords per block
+
+    Returns:
+        list -- register update by feedback value
+    """
+
+    table = RS_TABLES.get(ecc_length)
+    if table is not None:
+        return table
+    # Generator (x - 2^1)(x - 2^2)...(x - 2^n), highest power first.
+    generator = [1]
+    for power in range(1, ecc_length + 1):
+        factor = GF_EXP[power]
+        product = generator + [0]
+        for index, coefficient in enumerate(generator):
+            if coefficient:
+                product[index + 1] ^= GF_EXP[GF_LOG[coefficient] +
+                                             GF_LOG[factor]]
+        generator = product
+    logs = [GF_LOG[coefficient] for coefficient in generator[1:]]
+    table = [0]
+    for feedback in range(1, 256):
+        feedback_log = GF_LOG[feedback]
+        table.append(int.from_bytes(bytes(
+            GF_EXP[feedback_log + log] for log in logs), "big"))
+    RS_TABLES[ecc_length] = table
+    return table
+
+
+def rs_block(data, ecc_length):
+    """Compute the Reed-Solomon check codewords of one block.
+
+    Arguments:
+        data {list} -- data codewords of the block
+        ecc_length {int} -- number of check codewords
+
+    Returns:
+        bytes -- check codewords
+    """
+
+    table = rs_table(ecc_length)
+    shift = 8 * (ecc_length - 1)
+    mask = (1 << (8 * ecc_length)) - 1
+    register = 0
+    for codeword in data:
+        register = ((register << 8) & mask) ^ \
+            table[codeword ^ (register >> shift)]
+    return register.to_bytes(ecc_length, "big")
+
+
+def add_error_correction(codewords, size):
+    """Append the interleaved Reed-Solomon check codewords.
+
+    Arguments:
+        codewords {list} -- padded data codewords
+        size {SymbolSize} -- symbol size
+
+    Returns:
+        list -- data and check codewords
+    """
+
+    blocks = size.blocks
+    ecc_length = size.ecc_codewords // blocks
+    ret = codewords + [0] * size.ecc_codewords
+    data_length = len(codewords)
+    for block in range(blocks):
+        ecc = rs_block(codewords[block::blocks], ecc_length)
+        ret[data_length + block::blocks] = ecc
+    return ret
+
+
+def ascii_cost(data):
+    """Count the ASCII codewords of data.
+
+    Arguments:
+        data {str} -- data
+
+    Returns:
+        int -- codewords
+    """
+
+    cost = 0
+    pos = 0
+    length = len(data)
+    while pos < length:
+        if data[pos:pos + 2].isdigit() and pos + 1 < length:
+            pos += 2
+        else:
+            if data[pos] > "\x7f":
+                cost += 1
+            pos += 1
+        cost += 1
+    return cost
+
+
+def encode_ascii(data, codewords):
+    """Append the ASCII codewords of data.
+
+    Arguments:
+        data {str} -- data, FNC1 as GS
+        codewords {list} -- codewords to append to
+
+    Raises:
+        ValueError -- character outside ISO 8859-1
+    """
+
+    pos = 0
+    length = len(data)
+    while pos < length:
+        char = data[pos]
+        if "0" <= char <= "9" and pos + 1 < length and \
+                "0" <= data[pos + 1] <= "9":
+            codewords.append(DIGIT_PAIR_BASE + int(data[pos:pos + 2]))
+            pos += 2
+            continue
+        if char == FNC1:
+            codewords.append(FNC1_CODEWORD)
+        else:
+            code = ord(char)
+            if code > 255:
+                raise ValueError("character %r is not in DataMatrix" % char)
+            if code > 127:
+                codewords.append(UPPER_SHIFT)
+                code -= 128
+            codewords.append(code + 1)
+        pos += 1
+
+
+def encode_c40(data, codewords):
+    """Append the C40 codewords of data from the basic set.
+
+    Arguments:
+        data {str} -- spaces, digits and upper case letters, a multiple of
+        three characters long
+        codewords {list} -- codewords to append to
+    """
+
+    codewords.append(C40_LATCH)
+    for pos in range(0, len(data), 3):
+        value = 1600 * C40_VALUES[data[pos]] + \
+            40 * C40_VALUES[data[pos + 1]] + C40_VALUES[data[pos + 2]] + 1
+        codewords.append(value >> 8)
+        codewords.append(value & 0xFF)
+    codewords.append(C40_UNLATCH)
+
+
+def encode_codewords(data, gs1=True):
+    """Encode data to DataMatrix data codewords, without padding.
+
+    Runs of C40 basic set characters are encoded in C40 when that takes
+    fewer codewords than ASCII, everything else in ASCII.
+
+    Arguments:
+        data {str} -- data, FNC1 as GS
+
+    Keyword Arguments:
+        gs1 {bool} -- start with FNC1 (GS1 DataMatrix) (default: {True})
+
+    Raises:
+        ValueError -- character outside ISO 8859-1
+
+    Returns:
+        list -- data codewords
+    """
+
+    codewords = [FNC1_CODEWORD] if gs1 else []
+    # Data before pos is encoded, the ASCII stretch from pos is encoded in
+    # one piece, so digit pairs are packed across short C40 runs.
+    pos = 0
+    start = 0
+    length = len(data)
+    while start < length:
+        if data[start] not in C40_VALUES:
+            start += 1
+            continue
+        end = start + 1
+        while end < length and data[end] in C40_VALUES:
+            end += 1
+        # Shorter runs do not repay the latch and unlatch codewords.
+        if end - start >= 6:
+            run = data[start:end]
+            c40_length = len(run) - len(run) % 3
+            if 2 + 2 * c40_length // 3 + ascii_cost(run[c40_length:]) < \
+                    ascii_cost(run):
+                encode_ascii(data[pos:start], codewords)
+                encode_c40(run[:c40_length], codewords)
+                pos = start + c40_length
+        start = end
+    encode_ascii(data[pos:], codewords)
+    return codewords
+
+
+def select_size(count, shape="square"):
+    """Select the smallest symbol for a number of data codewords.
+
+    Arguments:
+        count {int} -- data codewords
+
+    Keyword Arguments:
+        shape {str} -- square or rectangle (default: {"square"})
+
+    Raises:
+        ValueError -- data does not fit the largest symbol
+
+    Returns:
+        SymbolSize -- symbol size
+    """
+
+    for size in SIZES[shape]:
+        if size.data_codewords >= count:
+            return size
+    raise ValueError("%d codewords do not fit a %s DataMatrix" %
+                     (count, shape))
+
+
+def pad(codewords, capacity):
+    """Pad data codewords to the symbol capacity.
+
+    Arguments:
+        codewords {list} -- data codewords
+        capacity {int} -- data codewords of the symbol
+
+    Returns:
+        list -- padded data codewords
+    """
+
+    ret = list(codewords)
+    if len(ret) < capacity:
+        ret.append(PAD)
+    while len(ret) < capacity:
+        # 253-state randomizing of every further pad by its position.
+        value = PAD + (149 * (len(ret) + 1)) % 253 + 1
+        ret.append(value - 254 if value > 254 else value)
+    return ret
+
+
+def _mapping(rows, columns):
+    """Compute the ECC 200 module placement of a mapping matrix.
+
+    Arguments:
+        rows {int} -- mapping matrix rows
+        columns {int} -- mapping matrix columns
+
+    Returns:
+        list -- per module 8 * codeword index + bit (bit 0 is the most
+        significant), or -1 for a light and -2 for a dark fixed module
+    """
+
+    array = [None] * (rows * columns)
+
+    def module(row, column, index, bit):
+        if row < 0:
+            row += rows
+            column += 4 - ((rows + 4) % 8)
+        if column < 0:
+            column += columns
+            row += 4 - ((columns + 4) % 8)
+        array[row * columns + column] = 8 * index + bit
+
+    def utah(row, column, index):
+        module(row - 2, column - 2, index, 0)
+        module(row - 2, column - 1, index, 1)
+        module(row - 1, column - 2, index, 2)
+        module(row - 1, column - 1, index, 3)
+        module(row - 1, column, index, 4)
+        module(row, column - 2, index, 5)
+        module(row, column - 1, index, 6)
+        module(row, column, index, 7)
+
+    def corner(index, positions):
+        for bit, (row, column) in enumerate(positions):
+            module(row, column, index, bit)
+
+    last_row = rows - 1
+    last_column = columns - 1
+    corners = {
+        1: [(last_row, 0), (last_row, 1), (last_row, 2),
+            (0, last_column - 1), (0, last_column), (1, last_column),
+            (2, last_column), (3, last_column)],
+        2: [(last_row - 2, 0), (last_row - 1, 0), (last_row, 0),
+            (0, last_column - 3), (0, last_column - 2),
+            (0, last_column - 1), (0, last_column), (1, last_column)],
+        3: [(last_row - 2, 0), (last_row - 1, 0), (last_row, 0),
+            (0, last_column - 1), (0, last_column), (1, last_column),
+            (2, last_column), (3, last_column)],
+        4: [(last_row, 0), (last_row, last_column), (0, last_column - 2),
+            (0, last_column - 1), (0, last_column), (1, last_column - 2),
+            (1, last_column - 1), (1, last_column)],
+    }
+    index = 0
+    row = 4
+    column = 0
+    while True:
+        if row == rows and column == 0:
+            corner(index, corners[1])
+            index += 1
+        if row == rows - 2 and column == 0 and columns % 4:
+            corner(index, corners[2])
+            index += 1
+        if row == rows - 2 and column == 0 and columns % 8 == 4:
+            corner(index, corners[3])
+            index += 1
+        if row == rows + 4 and column == 2 and not columns % 8:
+            corner(index, corners[4])
+            index += 1
+        while True:
+            if row < rows and column >= 0 and \
+                    array[row * columns + column] is None:
+                utah(row, column, index)
+                index += 1
+            row -= 2
+            column += 2
+            if row < 0 or column >= columns:
+                break
+        row += 1
+        column += 3
+        while True:
+            if row >= 0 and column < columns and \
+                    array[row * columns + column] is None:
+                utah(row, column, index)
+                index += 1
+            row += 2
+            column -= 2
+            if row >= rows or column < 0:
+                break
+        row += 3
+        column += 1
+        if row >= rows and column >= columns:
+            break
+    if array[-1] is None:
+        array[-1] = array[-columns - 2] = -2
+        array[-2] = array[-columns - 1] = -1
+    return array
+
+
+def placement(size):
+    """Get the module placement of a symbol size.
+
+    Arguments:
+        size {SymbolSize} -- symbol size
+
+    Returns:
+        function -- picks the module characters of a symbol, row by row,
+        from the codeword bits followed by "0" and "1"
+    """
+
+    picker = PLACEMENTS.get(size)
+    if picker is not None:
+        return picker
+    region_rows = size.region_rows
+    region_columns = size.region_columns
+    mapping_columns = size.columns // (region_columns + 2) * region_columns
+    mapping = _mapping(size.rows // (region_rows + 2) * region_rows,
+                       mapping_columns)
+    bits = 8 * (size.data_codewords + size.ecc_codewords)
+    light = bits
+    dark = bits + 1
+    indexes = []
+    for row in range(size.rows):
+        region_row, inner_row = divmod(row, region_rows + 2)
+        for column in range(size.columns):
+            region_column, inner_column = divmod(column,
+                                                 region_columns + 2)
+            if inner_row == region_rows + 1 or inner_column == 0:
+                indexes.append(dark)
+            elif inner_row == 0:
+                indexes.append(light if inner_column % 2 else dark)
+            elif inner_column == region_columns + 1:
+                indexes.append(dark if inner_row % 2 else light)
+            else:
+                value = mapping[(region_row * region_rows + inner_row - 1) *
+                                mapping_columns +
+                                region_column * region_columns +
+                                inner_column - 1]
+                indexes.append(value if value >= 0 else
+                               (light if value == -1 else dark))
+    picker = PLACEMENTS[size] = itemgetter(*indexes)
+    return picker
+
+
+def encode(data, gs1=True, shape="square"):
+    """Encode data to a DataMatrix ECC 200 symbol.
+
+    Arguments:
+        data {str} -- data, FNC1 as GS
+
+    Keyword Arguments:
+        gs1 {bool} -- start with FNC1 (GS1 DataMatrix) (default: {True})
+        shape {str} -- square or rectangle (default: {"square"})
+
+    Raises:
+        ValueError -- data cannot be encoded or does not fit
+
+    Returns:
+        DataMatrix -- symbol size, codewords and module matrix, one string
+        of "1" (dark) and "0" (light) per row
+    """
+
+    codewords = encode_codewords(data, gs1)
+    size = select_size(len(codewords), shape)
+    codewords = add_error_correction(pad(codewords, size.data_codewords),
+                                     size)
+    bits = format(int.from_bytes(bytes(codewords), "big"),
+                  "0%db" % (8 * len(codewords))) + "01"
+    modules = "".join(placement(size)(bits))
+    columns = size.columns
+    return DataMatrix(size, codewords,
+                      [modules[pos:pos + columns]
+                       for pos in range(0, len(modules), columns)])
+
+
+def encode_zpl(data, module_size=5, shape="square"):
+    """Encode data to a ZPL ^BX GS1 DataMatrix field.
+
+    The symbol size is selected here, so the printer prints the same
+    rows and columns as encode().
+
+    Arguments:
+        data {str} -- element string, FNC1 as GS
+
+    Keyword Arguments:
+        module_size {int} -- module size in dots (default: {5})
+        shape {str} -- square or rectangle (default: {"square"})
+
+    Raises:
+        ValueError -- data cannot be encoded or does not fit
+
+    Returns:
+        str -- ^BX and ^FD commands
+    """
+
+    size = select_size(len(encode_codewords(data)), shape)
+    return "^BXN,%d,200,%d,%d,,%s^FD%s1%s^FS" % (
+        module_size, size.columns, size.rows, ZPL_ESCAPE, ZPL_ESCAPE,
+        data.replace(FNC1, ZPL_ESCAPE + "1"))
+
+
+def element_data(barcode):
+    """Get the element string of a barcode, FNC1 as GS.
+
+    Arguments:
+        barcode {str} -- plain barcode with the fixed layout or GS1 string
+        with brackets or FNC1 as GS
+
+    Raises:
+        ValueError -- invalid GS1 elements
+
+    Returns:
+        str -- element string
+    """
+
+    elements = split_gs1(barcode)
+    if elements is not None:
+        gs1_create = GS1Create()
+        (gs1_create.ean_number, gs1_create.lot_number,
+         gs1_create.expiration_date, gs1_create.catalog_number) = elements
+        return gs1_create.get_element_string()
+    return gs1_ai.to_element_string(gs1_ai.parse(barcode))
+
+
+def parse_arguments(argv=None):
+    """
+    Parse program arguments.
+
+    @param argv argument list, sys.argv when None
+    @return arguments
+    """
+    parser = argparse.ArgumentParser(prog="gs1_datamatrix.py")
+    parser.add_argument('barcode', help='barcode: plain or with brackets')
+    parser.add_argument('-z', '--zpl', action='store_true',
+                        help='write a ZPL ^BX field instead of the modules')
+    parser.add_argument('-r', '--rectangle', action='store_true',
+                        help='use a rectangular symbol')
+    parser.add_argument('-m', '--module-size', type=int, default=5,
+                        help='ZPL module size in dots')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Write the modules or the ZPL field of a GS1 DataMatrix.
+
+    Keyword Arguments:
+        argv {list} -- arguments, sys.argv when None (default: {None})
+    """
+
+    args = parse_arguments(argv)
+    shape = "rectangle" if args.rectangle else "square"
+    data = element_data(args.barcode)
+    if args.zpl:
+        sys.stdout.write(encode_zpl(data, args.module_size, shape) + "\n")
+        return
+    for row in encode(data, shape=shape).modules:
+        sys.stdout.write(row + "\n")
+
+
+if __name__ == '__main__':
+    main()
+    sys.exit()
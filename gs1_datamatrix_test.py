@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+This module tests for GS1 DataMatrix module.
+"""
+
+import unittest
+
+from gs1_datamatrix import SIZES, element_data, encode, encode_codewords
+from gs1_datamatrix import encode_zpl, pad, select_size
+
+
+class TestFunctions(unittest.TestCase):
+    """Test functions.
+
+    Arguments:
+        unittest {unittest} -- Calling attribut
+    """
+
+    def setUp(self):
+        self.data = element_data(
+            "(01)05996527176340(10)2014(17)190731(21)280122804")
+
+    def test_element_data(self):
+        """Test.
+        """
+        self.assertEqual(self.data,
+                         "0105996527176340102014\x1d1719073121280122804")
+        self.assertEqual(
+            element_data("01059965271763401020141719073121280122804"),
+            self.data)
+
+    def test_encode_codewords(self):
+        """Test.
+        """
+        self.assertEqual(encode_codewords("123456", gs1=False),
+                         [142, 164, 186])
+        self.assertEqual(encode_codewords("1A\x1d", gs1=True),
+                         [232, 50, 66, 232])
+        # C40 for the letter run, ASCII for the two left over.
+        self.assertEqual(encode_codewords("ABCDEFGHIJKL\x1d21XYZ")[:3],
+                         [232, 230, 89])
+        self.assertEqual(encode_codewords("\xe9", gs1=False), [235, 106])
+        # Digit pairs separated by FNC1 stay packed.
+        self.assertEqual(encode_codewords("12\x1d34", gs1=False),
+                         [142, 232, 164])
+        self.assertEqual(len(encode_codewords(self.data)), 23)
+        self.assertRaises(ValueError, encode_codewords, "€")
+
+    def test_pad(self):
+        """Test.
+        """
+        self.assertEqual(pad([142, 164], 5), [142, 164, 129, 220, 115])
+        self.assertEqual(pad([1, 2, 3], 3), [1, 2, 3])
+
+    def test_select_size(self):
+        """Test.
+        """
+        self.assertEqual(select_size(23).rows, 22)
+        self.assertEqual(select_size(23, "rectangle")[:2], (16, 36))
+        self.assertEqual(select_size(1558).rows, 144)
+        self.assertRaises(ValueError, select_size, 1559)
+        for sizes in SIZES.values():
+            for size in sizes:
+                self.assertEqual(size.ecc_codewords % size.blocks, 0)
+                self.assertEqual(size.rows % (size.region_rows + 2), 0)
+                self.assertEqual(size.columns % (size.region_columns + 2),
+                                 0)
+
+    def test_encode(self):
+        """Test.
+        """
+        symbol = encode("123456", gs1=False)
+        self.assertEqual(symbol.codewords,
+                         [142, 164, 186, 114, 25, 5, 88, 102])
+        self.assertEqual(symbol.modules, [
+            "1010101010", "1100101101", "1100000100", "1100011101",
+            "1100001000", "1000001111", "1110110000", "1111011001",
+            "1001110100", "1111111111"])
+
+    def test_encode_finder(self):
+        """Test.
+        """
+        for shape, data in (("square", self.data * 30),
+                            ("rectangle", self.data)):
+            symbol = encode(data, shape=shape)
+            size = symbol.size
+            self.assertEqual(len(symbol.modules), size.rows)
+            self.assertEqual(symbol.modules[-1], "1" * size.columns)
+            self.assertEqual(symbol.modules[0],
+                             "10" * (size.columns // 2))
+            self.assertEqual(
+                "".join(row[0] for row in symbol.modules), "1" * size.rows)
+            self.assertEqual(
+                "".join(row[-1] for row in symbol.modules),
+                "01" * (size.rows // 2))
+            self.assertEqual(len(symbol.codewords),
+                             size.data_codewords + size.ecc_codewords)
+
+    def test_encode_zpl(self):
+        """Test.
+        """
+        self.assertEqual(
+            encode_zpl(self.data),
+            "^BXN,5,200,22,22,,#^FD#10105996527176340102014"
+            "#11719073121280122804^FS")
+        self.assertTrue(encode_zpl(self.data, 8, "rectangle").startswith(
+            "^BXN,8,200,36,16,,#"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,475 @@
+# -*- coding: utf-8 -*-
+"""
+This module detects repeated GTIN and serial number combinations.
+
+The first serials are kept exactly in an open addressing table of 64-bit
+keys: the GTIN as a dictionary code, and the serial length and value when
+the serial is numeric. Once the table holds its capacity, further serials
+go to a Bloom filter in a memory-mapped file, so the memory used stays
+fixed however many serials are checked. The GTIN dictionary only gains
+the GTINs of exact serials, so it is bounded by the capacity as well. The
+Bloom filter is sized for the expected serials and may report a new
+serial as a duplicate at the configured error rate, never the reverse.
+Without a file it is only created once the exact table is full.
+
+sync() adds the exact serials to the Bloom filter as well, so a filter
+file reopened later knows every serial checked before.
+"""
+
+
+import argparse
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from hashlib import blake2b
+
+import gs1_ai
+from gs1 import split_gs1
+from gs1_store import Dictionary
+
+CAPACITY = 1 << 20
+# Serials the Bloom filter is sized for, per serial of the capacity.
+EXPECTED_PER_CAPACITY = 8
+ERROR_RATE = 1e-6
+GS = "\x1d"
+
+BLOOM_MAGIC = b"GS1BLOOM"
+# Magic, version, bits, hash count, serials added.
+BLOOM_HEADER = struct.Struct("<8sIQIQ")
+# The serials added, last field of the header.
+BLOOM_COUNT = struct.Struct("<Q")
+BLOOM_VERSION = 1
+# 2^64 / golden ratio, spreads keys over the table.
+FIBONACCI = 0x9E3779B97F4A7C15
+MASK64 = (1 << 64) - 1
+MAX_SERIAL_DIGITS = 9
+MAX_GTIN_CODE = 1 << 30
+
+
+class CompactSet(object):
+    """Class to hold non-zero 64-bit integers in a fixed size table
+    """
+
+    def __init__(self, capacity):
+        bits = max(4, (2 * capacity - 1).bit_length())
+        self.shift = 64 - bits
+        self.mask = (1 << bits) - 1
+        self.table = array("Q", bytes(8 << bits))
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return (key for key in self.table if key)
+
+    def __contains__(self, key):
+        table = self.table
+        mask = self.mask
+        pos = ((key * FIBONACCI) & MASK64) >> self.shift
+        while True:
+            value = table[pos]
+            if value == key:
+                return True
+            if not value:
+                return False
+            pos = (pos + 1) & mask
+
+    def add(self, key):
+        """Add a key.
+
+        Arguments:
+            key {int} -- non-zero 64-bit integer
+
+        Returns:
+            bool -- key was new
+        """
+
+        table = self.table
+        mask = self.mask
+        pos = ((key * FIBONACCI) & MASK64) >> self.shift
+        while True:
+            value = table[pos]
+            if value == key:
+                return False
+            if not value:
+                table[pos] = key
+                self.count += 1
+                return True
+            pos = (pos + 1) & mask
+
+    def nbytes(self):
+        """Get the memory used by the table.
+
+        Returns:
+            int -- bytes
+        """
+
+        return len(self.table) * self.table.itemsize
+
+
+class BloomFilter(object):
+    """Class to test set membership in a memory-mapped bit array
+    """
+
+    def __init__(self, path=None, expected=EXPECTED_PER_CAPACITY * CAPACITY,
+                 error_rate=ERROR_RATE):
+        """Open or create a Bloom filter.
+
+        Arguments:
+            path {str} -- filter file, kept in memory only when None
+
+        Keyword Arguments:
+            expected {int} -- serials the filter is sized for, ignored for
+            an existing file (default: {8 million})
+            error_rate {float} -- false positive rate at the expected
+            serials (default: {1e-6})
+
+        Raises:
+            ValueError -- file is not a Bloom filter
+        """
+
+        bits = int(math.ceil(-expected * math.log(error_rate) /
+                             math.log(2) ** 2))
+        bits += -bits % 8
+        hashes = max(1, int(round(bits / expected * math.log(2))))
+        self.count = 0
+        size = BLOOM_HEADER.size + bits // 8
+        self.file = None
+        created = True
+        if path is None:
+            self.map = mmap.mmap(-1, size)
+        elif os.path.exists(path) and os.path.getsize(path):
+            self.file = open(path, "r+b")
+            self.map = mmap.mmap(self.file.fileno(), 0)
+            created = False
+            magic, version, bits, hashes, self.count = \
+                BLOOM_HEADER.unpack_from(self.map)
+            if magic != BLOOM_MAGIC or version != BLOOM_VERSION or \
+                    len(self.map) != BLOOM_HEADER.size + bits // 8:
+                self.map.close()
+                self.file.close()
+                raise ValueError("%s is not a GS1 Bloom filter" % path)
+        else:
+            self.file = open(path, "w+b")
+            self.file.truncate(size)
+            self.map = mmap.mmap(self.file.fileno(), size)
+        if created:
+            # The header is written at once, so the file of a process that
+            # never flushed still opens.
+            BLOOM_HEADER.pack_into(self.map, 0, BLOOM_MAGIC, BLOOM_VERSION,
+                                   bits, hashes, 0)
+            if self.file is not None:
+                self.map.flush()
+        self.bits = bits
+        self.hashes = hashes
+        self.offset = BLOOM_HEADER.size
+
+    def __len__(self):
+        return self.count
+
+    def _positions(self, key):
+        # Double hashing, two 64-bit halves of one digest.
+        digest = blake2b(key, digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        bits = self.bits
+        return [(first + index * step) % bits
+                for index in range(self.hashes)]
+
+    def __contains__(self, key):
+        data = self.map
+        offset = self.offset
+        for pos in self._positions(key):
+            if not data[offset + (pos >> 3)] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def add(self, key):
+        """Add a key.
+
+        Arguments:
+            key {bytes} -- key
+
+        Returns:
+            bool -- key was new, False also for false positives
+        """
+
+        data = self.map
+        offset = self.offset
+        added = False
+        for pos in self._positions(key):
+            index = offset + (pos >> 3)
+            bit = 1 << (pos & 7)
+            if not data[index] & bit:
+                data[index] |= bit
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def flush(self):
+        """Write the count of serials and the bits to the file.
+        """
+
+        BLOOM_COUNT.pack_into(self.map, BLOOM_HEADER.size - BLOOM_COUNT.size,
+                              self.count)
+        if self.file is not None:
+            self.map.flush()
+
+    def close(self):
+        """Flush and close the file.
+        """
+
+        if self.map.closed:
+            return
+        self.flush()
+        self.map.close()
+        if self.file is not None:
+            self.file.close()
+
+    def nbytes(self):
+        """Get the size of the bit array.
+
+        Returns:
+            int -- bytes
+        """
+
+        return self.bits // 8
+
+
+def barcode_serial(barcode):
+    """Get the GTIN and serial number of a barcode.
+
+    Arguments:
+        barcode {str} -- plain barcode with the fixed layout or GS1 string
+        with brackets or FNC1 as GS
+
+    Returns:
+        tuple -- GTIN (01) and serial number (21), None if the barcode
+        has no valid GTIN and serial number
+    """
+
+    elements = split_gs1(barcode)
+    if elements is not None:
+        return elements.ean_number, elements.catalog_number
+    try:
+        elements = dict(gs1_ai.parse(barcode))
+    except ValueError:
+        return None
+    if "01" not in elements or "21" not in elements:
+        return None
+    return elements["01"], elements["21"]
+
+
+class Deduplicator(object):
+    """Class to detect repeated GTIN and serial number combinations
+    """
+
+    def __init__(self, path=None, capacity=CAPACITY, expected=None,
+                 error_rate=ERROR_RATE):
+        """Create a deduplicator.
+
+        Keyword Arguments:
+            path {str} -- Bloom filter file, in memory only when None
+            (default: {None})
+            capacity {int} -- serials kept exactly (default: {1048576})
+            expected {int} -- serials the Bloom filter is sized for
+            (default: {8 times the capacity})
+            error_rate {float} -- Bloom filter false positive rate
+            (default: {1e-6})
+        """
+
+        self.capacity = capacity
+        self.expected = expected or EXPECTED_PER_CAPACITY * capacity
+        self.error_rate = error_rate
+        self.gtins = Dictionary()
+        self.exact = CompactSet(capacity)
+        # Serials that do not pack into 64 bits, also exact.
+        self.others = set()
+        # A file may hold serials of earlier runs and is opened now, an
+        # in-memory filter is created when the exact table is full.
+        self.bloom = None
+        # Exact serials added to the Bloom filter by sync(), not counted
+        # twice.
+        self.synced = 0
+        if path is not None:
+            self.bloom = BloomFilter(path, self.expected, error_rate)
+        self.checked = 0
+        self.duplicates = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return len(self.exact) + len(self.others) - self.synced + \
+            (len(self.bloom) if self.bloom is not None else 0)
+
+    def _is_full(self):
+        return len(self.exact) + len(self.others) >= self.capacity
+
+    def _pack(self, gtin, serial):
+        if self._is_full():
+            # No new GTINs once full, they have no serial in the table.
+            code = self.gtins.codes.get(gtin)
+            if code is None:
+                return None
+        else:
+            code = self.gtins.encode(gtin)
+        if 0 < len(serial) <= MAX_SERIAL_DIGITS and code < MAX_GTIN_CODE \
+                and serial.isascii() and serial.isdigit():
+            return code << 34 | len(serial) << 30 | int(serial)
+        return None
+
+    def add(self, gtin, serial):
+        """Check a serial and remember it.
+
+        Arguments:
+            gtin {str} -- GTIN (01)
+            serial {str} -- serial number (21)
+
+        Returns:
+            bool -- the combination was checked before
+        """
+
+        self.checked += 1
+        key = self._pack(gtin, serial)
+        if key is not None:
+            seen = key in self.exact
+        else:
+            seen = (gtin, serial) in self.others
+        bloom_key = None
+        if not seen and self.bloom is not None and self.bloom.count:
+            bloom_key = (gtin + GS + serial).encode("latin-1")
+            seen = bloom_key in self.bloom
+        if seen:
+            self.duplicates += 1
+            return True
+        if not self._is_full():
+            if key is not None:
+                self.exact.add(key)
+            else:
+                self.others.add((gtin, serial))
+        else:
+            if self.bloom is None:
+                self.bloom = BloomFilter(None, self.expected,
+                                         self.error_rate)
+            self.bloom.add(bloom_key or
+                           (gtin + GS + serial).encode("latin-1"))
+        return False
+
+    def add_barcode(self, barcode):
+        """Check the serial of a barcode and remember it.
+
+        Arguments:
+            barcode {str} -- barcode, as accepted by barcode_serial()
+
+        Returns:
+            bool -- the combination was checked before, None if the barcode
+            has no GTIN and serial number
+        """
+
+        serial = barcode_serial(barcode)
+        if serial is None:
+            return None
+        return self.add(*serial)
+
+    def sync(self):
+        """Add the exact serials to the Bloom filter and flush it.
+
+        Nothing is done without a Bloom filter, an in-memory deduplicator
+        that never filled its exact table.
+        """
+
+        if self.bloom is None:
+            return
+        gtins = self.gtins.values
+        add = self.bloom.add
+        for key in self.exact:
+            length = key >> 30 & 0xF
+            add((gtins[key >> 34] + GS +
+                 str(key & 0x3FFFFFFF).zfill(length)).encode("latin-1"))
+        for gtin, serial in self.others:
+            add((gtin + GS + serial).encode("latin-1"))
+        self.synced = len(self.exact) + len(self.others)
+        self.bloom.flush()
+
+    def close(self):
+        """Sync and close the Bloom filter.
+        """
+
+        if self.bloom is None:
+            return
+        if not self.bloom.map.closed:
+            self.sync()
+        self.bloom.close()
+
+    def nbytes(self):
+        """Estimate the memory used, the Bloom filter counted in full.
+
+        Returns:
+            int -- bytes
+        """
+
+        return self.exact.nbytes() + self.gtins.nbytes() + \
+            (self.bloom.nbytes() if self.bloom is not None else 0) + \
+            sys.getsizeof(self.others)
+
+
+def parse_arguments(argv=None):
+    """
+    Parse program arguments.
+
+    @param argv argument list, sys.argv when None
+    @return arguments
+    """
+    parser = argparse.ArgumentParser(prog="gs1_dedup.py")
+    parser.add_argument('-i', '--input', default='-',
+                        help='barcode per line, - for stdin')
+    parser.add_argument('-s', '--state',
+                        help='Bloom filter file kept between runs')
+    parser.add_argument('-c', '--capacity', type=int, default=CAPACITY,
+                        help='serials kept exactly')
+    parser.add_argument('-n', '--expected', type=int,
+                        help='serials the Bloom filter is sized for, '
+                        '8 times the capacity by default')
+    parser.add_argument('-e', '--error-rate', type=float, default=ERROR_RATE,
+                        help='Bloom filter false positive rate')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Write the repeated barcodes of a scan stream.
+
+    Every input line is flushed as soon as it is checked, so the program
+    can read a live stream.
+
+    Keyword Arguments:
+        argv {list} -- arguments, sys.argv when None (default: {None})
+    """
+
+    args = parse_arguments(argv)
+    source = sys.stdin if args.input == '-' else \
+        open(args.input, encoding="utf-8")
+    try:
+        with Deduplicator(args.state, args.capacity, args.expected,
+                          args.error_rate) as deduplicator:
+            for line in source:
+                barcode = line.strip()
+                if barcode and deduplicator.add_barcode(barcode):
+                    sys.stdout.write(barcode + "\n")
+                    sys.stdout.flush()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+if __name__ == '__main__':
+    main()
+    sys.exit()
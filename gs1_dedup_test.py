@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+This module tests for GS1 duplicate serial module.
+"""
+
+import os
+import tempfile
+import unittest
+
+from gs1_dedup import BloomFilter, CompactSet, Deduplicator, barcode_serial
+
+
+class TestFunctions(unittest.TestCase):
+    """Test functions.
+
+    Arguments:
+        unittest {unittest} -- Calling attribut
+    """
+
+    def setUp(self):
+        self.gtin = "05996527176340"
+        handle, self.path = tempfile.mkstemp(suffix=".bloom")
+        os.close(handle)
+        os.unlink(self.path)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def test_compact_set(self):
+        """Test.
+        """
+        keys = CompactSet(100)
+        self.assertEqual(len(keys.table), 256)
+        for key in range(1, 101):
+            self.assertTrue(keys.add(key << 40))
+        self.assertFalse(keys.add(5 << 40))
+        self.assertIn(100 << 40, keys)
+        self.assertNotIn(101 << 40, keys)
+        self.assertEqual(sorted(keys), [key << 40 for key in range(1, 101)])
+
+    def test_bloom_filter(self):
+        """Test.
+        """
+        bloom = BloomFilter(None, 1000, 1e-3)
+        self.assertEqual(bloom.hashes, 10)
+        keys = [b"%d" % key for key in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+        self.assertLess(sum(b"x%d" % key in bloom for key in range(10000)),
+                        50)
+
+    def test_barcode_serial(self):
+        """Test.
+        """
+        self.assertEqual(
+            barcode_serial("01059965271763401020141719073121280122804"),
+            (self.gtin, "280122804"))
+        self.assertEqual(barcode_serial("(01)05996527176340(21)AB-12"),
+                         (self.gtin, "AB-12"))
+        self.assertIsNone(barcode_serial("(01)05996527176340(10)2014"))
+        self.assertIsNone(barcode_serial("(99)x(21"))
+
+    def test_add(self):
+        """Test.
+        """
+        deduplicator = Deduplicator(capacity=4, expected=1000)
+        self.assertFalse(deduplicator.add(self.gtin, "000000001"))
+        self.assertFalse(deduplicator.add(self.gtin, "1"))
+        self.assertFalse(deduplicator.add(self.gtin, "AB-1"))
+        self.assertFalse(deduplicator.add("05996527176357", "1"))
+        self.assertTrue(deduplicator.add(self.gtin, "1"))
+        self.assertTrue(deduplicator.add(self.gtin, "AB-1"))
+        self.assertEqual(len(deduplicator.exact), 3)
+        # Beyond the capacity serials go to the Bloom filter.
+        self.assertFalse(deduplicator.add(self.gtin, "2"))
+        self.assertTrue(deduplicator.add(self.gtin, "2"))
+        self.assertEqual(len(deduplicator.bloom), 1)
+        self.assertEqual(len(deduplicator), 5)
+        self.assertEqual((deduplicator.checked, deduplicator.duplicates),
+                         (8, 3))
+        self.assertTrue(deduplicator.add_barcode(
+            "(01)05996527176340(21)000000001"))
+        self.assertIsNone(deduplicator.add_barcode("(01)05996527176340"))
+
+    def test_bounded_memory(self):
+        """Test.
+        """
+        self.assertEqual(Deduplicator(capacity=4).expected, 32)
+        deduplicator = Deduplicator(capacity=4, expected=1000)
+        self.assertIsNone(deduplicator.bloom)
+        for serial in range(4):
+            deduplicator.add(self.gtin, str(serial))
+        self.assertIsNone(deduplicator.bloom)
+        deduplicator.sync()
+        for gtin in range(100):
+            self.assertFalse(deduplicator.add("%014d" % gtin, "1"))
+        self.assertEqual(len(deduplicator.gtins), 1)
+        self.assertEqual(len(deduplicator.bloom), 100)
+        self.assertTrue(deduplicator.add("%014d" % 7, "1"))
+        deduplicator.close()
+
+    def test_persistence(self):
+        """Test.
+        """
+        with Deduplicator(self.path, capacity=10,
+                          expected=1000) as deduplicator:
+            for serial in range(20):
+                deduplicator.add(self.gtin, "%09d" % serial)
+            deduplicator.add(self.gtin, "AB-1")
+            self.assertEqual(len(deduplicator), 21)
+            deduplicator.sync()
+            self.assertEqual(len(deduplicator), 21)
+            deduplicator.add(self.gtin, "AB-2")
+            deduplicator.sync()
+            self.assertEqual(len(deduplicator), 22)
+        with Deduplicator(self.path, capacity=10,
+                          expected=1000) as deduplicator:
+            self.assertTrue(all(deduplicator.add(self.gtin, "%09d" % serial)
+                                for serial in range(20)))
+            self.assertTrue(deduplicator.add(self.gtin, "AB-1"))
+            self.assertFalse(deduplicator.add(self.gtin, "AB-3"))
+        with open(self.path, "r+b") as target:
+            target.write(b"NOTBLOOM")
+        self.assertRaises(ValueError, BloomFilter, self.path)
+
+    def test_bloom_filter_without_flush(self):
+        """Test.
+        """
+        bloom = BloomFilter(self.path, 1000)
+        bloom.add(b"x")
+        # Closed without flush(), as by a crash.
+        bloom.map.close()
+        bloom.file.close()
+        bloom = BloomFilter(self.path)
+        self.assertIn(b"x", bloom)
+        bloom.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
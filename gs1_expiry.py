@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+This module indexes GS1 records by expiration date.
+
+Expiration dates YYMMDD (17) are converted once per distinct value to day
+ordinals, date.toordinal() numbers, with the GS1 rules: day 00 is the last
+day of the month and the century is chosen in a window around the
+reference year. The records of a GS1Store are sorted by EAN number, LOT
+and ordinal, so the records of an EAN number or an EAN number and LOT
+expiring in a date range are found by binary search.
+"""
+
+
+from array import array
+from bisect import bisect_left, bisect_right
+from calendar import monthrange
+from datetime import date, timedelta
+
+
+def expiration_ordinal(expiration_date, reference_year=None):
+    """Convert an expiration date to a day ordinal.
+
+    Day 00 means the last day of the month. The century is the one that
+    puts the year at most 49 years before or 50 years after the reference
+    year.
+
+    Arguments:
+        expiration_date {str} -- expiration date YYMMDD (17)
+
+    Keyword Arguments:
+        reference_year {int} -- four digit year (default: {this year})
+
+    Raises:
+        ValueError -- not a valid YYMMDD date
+
+    Returns:
+        int -- date.toordinal() of the expiration day
+    """
+
+    if len(expiration_date) != 6 or not (expiration_date.isascii() and
+                                         expiration_date.isdigit()):
+        raise ValueError("expiration date %r is not YYMMDD" %
+                         expiration_date)
+    if reference_year is None:
+        reference_year = date.today().year
+    year = reference_year - reference_year % 100 + int(expiration_date[:2])
+    if year - reference_year > 50:
+        year -= 100
+    elif reference_year - year >= 50:
+        year += 100
+    month = int(expiration_date[2:4])
+    day = int(expiration_date[4:])
+    if not 1 <= month <= 12:
+        raise ValueError("expiration date %r has no month %d" %
+                         (expiration_date, month))
+    last_day = monthrange(year, month)[1]
+    if day > last_day:
+        raise ValueError("expiration date %r has no day %d" %
+                         (expiration_date, day))
+    return date(year, month, day or last_day).toordinal()
+
+
+class ExpiryIndex(object):
+    """Class to find the records of a GS1Store by expiration date
+    """
+
+    def __init__(self, store, reference_year=None):
+        """Sort the records of a store by EAN number, LOT and expiry.
+
+        Arguments:
+            store {GS1Store} -- records, not changed while indexed
+
+        Keyword Arguments:
+            reference_year {int} -- year of the century window
+            (default: {this year})
+        """
+
+        self.store = store
+        # One conversion per distinct expiration date, 0 if invalid.
+        ordinals = []
+        for expiration_date in store.expirations.values:
+            try:
+                ordinals.append(expiration_ordinal(expiration_date,
+                                                   reference_year))
+            except ValueError:
+                ordinals.append(0)
+        count = len(store)
+        days = max(ordinals, default=0) + 1
+        lots = len(store.lots)
+        # One integer per record sorts by EAN, LOT, ordinal and index.
+        keys = sorted(
+            ((ean_code * lots + lot_code) * days + ordinals[code]) * count +
+            index
+            for index, (ean_code, lot_code, code) in enumerate(zip(
+                store.ean_codes, store.lot_codes, store.expiration_codes))
+            if ordinals[code])
+        self.invalid = count - len(keys)
+        self.ordinals = array("I")
+        self.indexes = array("I")
+        # Start and end position of every EAN number and LOT code pair.
+        self.groups = {}
+        group = None
+        for position, key in enumerate(keys):
+            rest, index = divmod(key, count)
+            rest, ordinal = divmod(rest, days)
+            self.ordinals.append(ordinal)
+            self.indexes.append(index)
+            if rest != group:
+                group = rest
+                self.groups[divmod(rest, lots)] = [position, position + 1]
+            else:
+                self.groups[divmod(rest, lots)][1] = position + 1
+        self.lots_by_ean = {}
+        for ean_code, lot_code in self.groups:
+            self.lots_by_ean.setdefault(ean_code, []).append(lot_code)
+
+    def __len__(self):
+        return len(self.indexes)
+
+    def _ranges(self, ean_number, lot_number):
+        ean_code = self.store.eans.codes.get(ean_number)
+        if ean_code is None:
+            return []
+        if lot_number is None:
+            lot_codes = self.lots_by_ean.get(ean_code, [])
+        else:
+            lot_code = self.store.lots.codes.get(lot_number)
+            lot_codes = [] if lot_code is None else [lot_code]
+        return [self.groups[ean_code, lot_code] for lot_code in lot_codes
+                if (ean_code, lot_code) in self.groups]
+
+    def between(self, ean_number, first, last, lot_number=None):
+        """Find the records expiring between two days.
+
+        Arguments:
+            ean_number {str} -- EAN number (01)
+            first {date} -- first expiration day, included
+            last {date} -- last expiration day, included
+
+        Keyword Arguments:
+            lot_number {str} -- LOT number (10) (default: {any})
+
+        Returns:
+            list -- record indexes of the store, by LOT and expiration
+        """
+
+        first = first.toordinal()
+        last = last.toordinal()
+        ordinals = self.ordinals
+        indexes = self.indexes
+        ret = []
+        for start, end in self._ranges(ean_number, lot_number):
+            ret.extend(indexes[bisect_left(ordinals, first, start, end):
+                               bisect_right(ordinals, last, start, end)])
+        return ret
+
+    def expiring(self, ean_number, days, lot_number=None, today=None):
+        """Find the records expiring within a number of days.
+
+        Records that have expired already are not included.
+
+        Arguments:
+            ean_number {str} -- EAN number (01)
+            days {int} -- days from today
+
+        Keyword Arguments:
+            lot_number {str} -- LOT number (10) (default: {any})
+            today {date} -- first day (default: {today})
+
+        Returns:
+            list -- record indexes of the store, by LOT and expiration
+        """
+
+        today = today or date.today()
+        return self.between(ean_number, today, today + timedelta(days),
+                            lot_number)
+
+    def expired(self, ean_number, lot_number=None, today=None):
+        """Find the records that have expired before a day.
+
+        Arguments:
+            ean_number {str} -- EAN number (01)
+
+        Keyword Arguments:
+            lot_number {str} -- LOT number (10) (default: {any})
+            today {date} -- first day that is not expired (default: {today})
+
+        Returns:
+            list -- record indexes of the store, by LOT and expiration
+        """
+
+        today = today or date.today()
+        return self.between(ean_number, date.min,
+                            today - timedelta(1), lot_number)
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+This module tests for GS1 expiry index module.
+"""
+
+import unittest
+from datetime import date
+
+from gs1_expiry import ExpiryIndex, expiration_ordinal
+from gs1_store import GS1Store
+
+
+class TestFunctions(unittest.TestCase):
+    """Test functions.
+
+    Arguments:
+        unittest {unittest} -- Calling attribut
+    """
+
+    def setUp(self):
+        self.store = GS1Store()
+        self.store.extend_barcodes(
+            "010599652717634010%s17%s21%09d" % (lot, expiration_date, serial)
+            for serial, (lot, expiration_date) in enumerate([
+                ("2014", "261031"), ("2014", "261100"), ("2015", "261020"),
+                ("2015", "261200"), ("2014", "261301"), ("2014", "260930"),
+                ("2015", "261018")]))
+        self.store.append("05996527176357", "2014", "261020", "000000099")
+        self.index = ExpiryIndex(self.store, 2026)
+
+    def test_expiration_ordinal(self):
+        """Test.
+        """
+        self.assertEqual(expiration_ordinal("240229", 2026),
+                         date(2024, 2, 29).toordinal())
+        self.assertEqual(expiration_ordinal("240200", 2026),
+                         date(2024, 2, 29).toordinal())
+        self.assertEqual(expiration_ordinal("250200", 2026),
+                         date(2025, 2, 28).toordinal())
+        self.assertEqual(expiration_ordinal("761231", 2026),
+                         date(2076, 12, 31).toordinal())
+        self.assertEqual(expiration_ordinal("770101", 2026),
+                         date(1977, 1, 1).toordinal())
+        self.assertEqual(expiration_ordinal("990101", 2051),
+                         date(2099, 1, 1).toordinal())
+        for expiration_date in ("251301", "250230", "2502", "25020A"):
+            self.assertRaises(ValueError, expiration_ordinal,
+                              expiration_date, 2026)
+
+    def test_index(self):
+        """Test.
+        """
+        self.assertEqual(len(self.index), 7)
+        self.assertEqual(self.index.invalid, 1)
+
+    def test_expiring(self):
+        """Test.
+        """
+        today = date(2026, 10, 18)
+        self.assertEqual(self.index.expiring("05996527176340", 30,
+                                             today=today), [0, 6, 2])
+        self.assertEqual(self.index.expiring("05996527176340", 43,
+                                             today=today), [0, 1, 6, 2])
+        self.assertEqual(self.index.expiring("05996527176340", 30, "2015",
+                                             today=today), [6, 2])
+        self.assertEqual(self.index.expiring("05996527176340", 30, "9999",
+                                             today=today), [])
+        self.assertEqual(self.index.expiring("05996527176357", 30,
+                                             today=today), [7])
+        self.assertEqual(self.index.expiring("00000000000000", 30,
+                                             today=today), [])
+
+    def test_expired(self):
+        """Test.
+        """
+        self.assertEqual(self.index.expired("05996527176340",
+                                            today=date(2026, 10, 20)),
+                         [5, 6])
+        records = self.store.take(self.index.between(
+            "05996527176340", date(2026, 11, 30), date(2026, 12, 31)))
+        self.assertEqual([elements.catalog_number for elements in records],
+                         ["000000001", "000000003"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""
+This module ingests barcodes from many scanners at once with asyncio.
+
+Every scanner is a line source, a pair of asyncio streams: a TCP connection
+accepted by serve(), a TCP scanner reached by connect(), or any other
+stream pair, such as a serial port adapter, given to handle_source(). Each
+barcode is normalized, checked with GS1Check and split with GS1GetElement,
+and its verdict is written back to its scanner as one JSON line.
+
+Each source has a bounded queue between reading and verifying. A source
+that sends faster than its verdicts are written or consumed fills its
+queue and then is no longer read, so TCP flow control slows the scanner
+down instead of the service buffering without limit.
+"""
+
+
+import argparse
+import asyncio
+import json
+import sys
+
+from gs1 import GS1Check, GS1GetElement
+from gs1_ai import SYMBOLOGY_IDS
+
+SOURCE_QUEUE = 64
+RESULT_QUEUE = 1024
+GS = "\x1d"
+
+
+def normalize(line):
+    """Normalize a scanned line to a barcode without brackets.
+
+    The symbology identifier and FNC1 separators sent by the scanner are
+    removed.
+
+    Arguments:
+        line {str} -- scanned line
+
+    Returns:
+        str -- barcode, empty for a blank line
+    """
+
+    barcode = line.strip()
+    if barcode[:3] in SYMBOLOGY_IDS:
+        barcode = barcode[3:]
+    return barcode.replace(GS, "").replace("(", "").replace(")", "")
+
+
+class Verifier(object):
+    """Class to verify barcodes with the gs1.py classes
+    """
+
+    def __init__(self):
+        self.gs1_check = GS1Check()
+        self.gs1_element = GS1GetElement()
+
+    def verdict(self, barcode):
+        """Verify a barcode.
+
+        Arguments:
+            barcode {str} -- normalized barcode
+
+        Returns:
+            dict -- barcode, valid, gtin_check_digit and elements
+        """
+
+        self.gs1_check.set_barcode(barcode)
+        self.gs1_element.set_barcode(barcode)
+        elements = self.gs1_element.parse_gs1()
+        return {"barcode": barcode,
+                "valid": self.gs1_check.verify(),
+                "gtin_check_digit": self.gs1_check.check_gtin_check_digit(),
+                "elements": elements._asdict() if elements else None}
+
+
+class IngestService(object):
+    """Class to verify the barcodes of many line sources concurrently
+    """
+
+    def __init__(self, queue_size=SOURCE_QUEUE, results=None):
+        """Create the service.
+
+        Keyword Arguments:
+            queue_size {int} -- barcodes read ahead per source
+            (default: {64})
+            results {asyncio.Queue} -- receives every verdict, bounded to
+            pass backpressure on to the sources (default: {None})
+        """
+
+        self.queue_size = queue_size
+        self.results = results
+        self.verifier = Verifier()
+        self.stats = {}
+
+    async def handle_source(self, source, reader, writer):
+        """Verify the barcodes of one source until it ends.
+
+        Arguments:
+            source {str} -- source name
+            reader {asyncio.StreamReader} -- scanned lines
+            writer {asyncio.StreamWriter} -- receives the verdicts
+        """
+
+        queue = asyncio.Queue(self.queue_size)
+        stats = self.stats.setdefault(
+            source, {"scanned": 0, "valid": 0, "invalid": 0, "error": None})
+        reading = asyncio.ensure_future(self._read(reader, queue, stats))
+        verifying = asyncio.ensure_future(
+            self._verify(source, queue, writer, stats))
+        try:
+            await verifying
+        except ConnectionError as err:
+            stats["error"] = "%s: %s" % (type(err).__name__, err)
+        finally:
+            reading.cancel()
+            verifying.cancel()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def _read(reader, queue, stats):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                barcode = normalize(line.decode("latin-1"))
+                if barcode:
+                    await queue.put(barcode)
+        except (ConnectionError, ValueError) as err:
+            # ValueError is a line over the stream limit.
+            stats["error"] = "%s: %s" % (type(err).__name__, err)
+        await queue.put(None)
+
+    async def _verify(self, source, queue, writer, stats):
+        sequence = 0
+        while True:
+            barcode = await queue.get()
+            if barcode is None:
+                return
+            sequence += 1
+            verdict = self.verifier.verdict(barcode)
+            verdict["source"] = source
+            verdict["sequence"] = sequence
+            stats["scanned"] += 1
+            stats["valid" if verdict["valid"] else "invalid"] += 1
+            writer.write(json.dumps(verdict).encode("utf-8") + b"\n")
+            await writer.drain()
+            if self.results is not None:
+                await self.results.put(verdict)
+
+    async def serve(self, host, port):
+        """Accept scanner connections.
+
+        Arguments:
+            host {str} -- listening address
+            port {int} -- listening port, 0 for any free port
+
+        Returns:
+            asyncio.Server -- started server
+        """
+
+        async def accept(reader, writer):
+            peer = writer.get_extra_info("peername")
+            await self.handle_source("%s:%d" % peer[:2], reader, writer)
+
+        return await asyncio.start_server(accept, host, port)
+
+    async def connect(self, host, port):
+        """Read a scanner listening for connections until it disconnects.
+
+        Arguments:
+            host {str} -- scanner address
+            port {int} -- scanner port
+        """
+
+        source = "%s:%d" % (host, port)
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError as err:
+            self.stats[source] = {"scanned": 0, "valid": 0, "invalid": 0,
+                                  "error": "%s: %s" % (type(err).__name__,
+                                                       err)}
+            return
+        await self.handle_source(source, reader, writer)
+
+
+def parse_address(address):
+    """Split a host:port address.
+
+    Arguments:
+        address {str} -- host:port, host defaults to localhost
+
+    Returns:
+        tuple -- host and port
+    """
+
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def parse_arguments(argv=None):
+    """
+    Parse program arguments.
+
+    @param argv argument list, sys.argv when None
+    @return arguments
+    """
+    parser = argparse.ArgumentParser(prog="gs1_ingest.py")
+    parser.add_argument('-l', '--listen', action='append', default=[],
+                        help='host:port to accept scanners on, repeatable')
+    parser.add_argument('-c', '--connect', action='append', default=[],
+                        help='host:port of a listening scanner, repeatable')
+    parser.add_argument('-q', '--queue-size', type=int, default=SOURCE_QUEUE,
+                        help='barcodes read ahead per scanner')
+    return parser.parse_args(argv)
+
+
+async def run(args):
+    """Ingest until the connected scanners end or forever when listening.
+
+    Verdicts of every source are written to stdout as JSON lines.
+
+    Arguments:
+        args {Namespace} -- program arguments
+    """
+
+    results = asyncio.Queue(RESULT_QUEUE)
+    service = IngestService(args.queue_size, results)
+
+    async def write_results():
+        while True:
+            verdict = await results.get()
+            sys.stdout.write(json.dumps(verdict) + "\n")
+            sys.stdout.flush()
+            results.task_done()
+
+    writing = asyncio.ensure_future(write_results())
+    servers = [await service.serve(*parse_address(address))
+               for address in args.listen]
+    try:
+        await asyncio.gather(*[service.connect(*parse_address(address))
+                               for address in args.connect])
+        if servers:
+            await asyncio.gather(*[server.serve_forever()
+                                   for server in servers])
+        await results.join()
+    finally:
+        writing.cancel()
+        for server in servers:
+            server.close()
+
+
+def main(argv=None):
+    """Ingest barcodes from the scanners given on the command line.
+
+    Keyword Arguments:
+        argv {list} -- arguments, sys.argv when None (default: {None})
+    """
+
+    args = parse_arguments(argv)
+    if not args.listen and not args.connect:
+        sys.exit("gs1_ingest.py: give --listen or --connect")
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
+    sys.exit()
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+This module tests for GS1 scanner ingestion module.
+"""
+
+import asyncio
+import json
+import unittest
+
+from gs1_ingest import IngestService, normalize
+
+
+class TestFunctions(unittest.IsolatedAsyncioTestCase):
+    """Test functions.
+
+    Arguments:
+        unittest {unittest} -- Calling attribut
+    """
+
+    def setUp(self):
+        self.barcode = "01059965271763401020141719073121280122804"
+
+    def test_normalize(self):
+        """Test.
+        """
+        self.assertEqual(normalize("]C1%s\r\n" % self.barcode), self.barcode)
+        self.assertEqual(
+            normalize("]d20105996527176340102014\x1d1719073121280122804\n"),
+            self.barcode)
+        self.assertEqual(normalize(
+            "(01)05996527176340(10)2014(17)190731(21)280122804"),
+            self.barcode)
+        self.assertEqual(normalize(" \n"), "")
+
+    async def scan(self, port, lines):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write("".join(lines).encode("latin-1"))
+        await writer.drain()
+        writer.write_eof()
+        verdicts = [json.loads(line) async for line in reader]
+        writer.close()
+        return verdicts
+
+    async def test_serve(self):
+        """Test.
+        """
+        service = IngestService()
+        server = await service.serve("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            results = await asyncio.gather(*[
+                self.scan(port, ["]C1%s\n" % self.barcode, "\n", "0105\n",
+                                 "01059965271763401020141719073121%09d\n" %
+                                 scanner] * 50)
+                for scanner in range(10)])
+        finally:
+            server.close()
+            await server.wait_closed()
+        self.assertEqual(len(service.stats), 10)
+        for scanner, verdicts in enumerate(results):
+            self.assertEqual(len(verdicts), 150)
+            self.assertEqual([verdict["sequence"] for verdict in verdicts],
+                             list(range(1, 151)))
+            self.assertEqual(len({verdict["source"]
+                                  for verdict in verdicts}), 1)
+            self.assertEqual(verdicts[0]["barcode"], self.barcode)
+            self.assertTrue(verdicts[0]["valid"])
+            self.assertTrue(verdicts[0]["gtin_check_digit"])
+            self.assertEqual(verdicts[0]["elements"]["lot_number"], "2014")
+            self.assertFalse(verdicts[1]["valid"])
+            self.assertIsNone(verdicts[1]["elements"])
+            self.assertEqual(verdicts[2]["elements"]["catalog_number"],
+                             "%09d" % scanner)
+        for stats in service.stats.values():
+            self.assertEqual(stats, {"scanned": 150, "valid": 100,
+                                     "invalid": 50, "error": None})
+
+    async def test_backpressure(self):
+        """Test.
+        """
+        results = asyncio.Queue(1)
+        service = IngestService(queue_size=1, results=results)
+        reader, writer = asyncio.StreamReader(), _Sink()
+        handling = asyncio.ensure_future(
+            service.handle_source("scanner", reader, writer))
+        for _ in range(10):
+            reader.feed_data(("%s\n" % self.barcode).encode("ascii"))
+        reader.feed_eof()
+        for _ in range(20):
+            await asyncio.sleep(0)
+        # One verdict waits in the results, one for the results queue.
+        self.assertEqual(service.stats["scanner"]["scanned"], 2)
+        verdicts = [await results.get() for _ in range(10)]
+        await handling
+        self.assertEqual([verdict["sequence"] for verdict in verdicts],
+                         list(range(1, 11)))
+        self.assertEqual(len(writer.lines), 10)
+        self.assertTrue(writer.closed)
+
+    async def test_connect(self):
+        """Test.
+        """
+        verdicts = []
+
+        async def scanner(reader, writer):
+            writer.write(("%s\n" % self.barcode).encode("ascii") * 3)
+            await writer.drain()
+            for _ in range(3):
+                verdicts.append(json.loads(await reader.readline()))
+            writer.close()
+
+        server = await asyncio.start_server(scanner, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        service = IngestService()
+        try:
+            await service.connect("127.0.0.1", port)
+            await service.connect("127.0.0.1", 1)
+        finally:
+            server.close()
+            await server.wait_closed()
+        self.assertEqual([verdict["valid"] for verdict in verdicts],
+                         [True] * 3)
+        self.assertEqual(service.stats["127.0.0.1:%d" % port]["scanned"], 3)
+        self.assertIn("ConnectionRefusedError",
+                      service.stats["127.0.0.1:1"]["error"])
+
+
+class _Sink(object):
+    """Stand-in stream writer keeping the written lines
+    """
+
+    def __init__(self):
+        self.lines = []
+        self.closed = False
+
+    def write(self, data):
+        self.lines.append(data)
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    async def wait_closed(self):
+        pass
+
+
+if __name__ == '__main__':
+    unittest.main()
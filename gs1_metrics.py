@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+"""
+This module records metrics of the gs1.py hot paths.
+
+enable() replaces GS1Check.verify, GS1GetElement.parse_gs1 and
+GS1Create.create_gs1 with wrappers that count calls, failures by reason
+and latencies, and disable() puts the original methods back, so nothing
+is measured and nothing is paid while metrics are disabled. Batch worker
+processes record their own metrics, which the parent merges. The metrics
+are exported in the Prometheus text format.
+"""
+
+
+import os
+from bisect import bisect_left
+from time import perf_counter
+
+import gs1
+from gs1 import CATALOG_NUMBER_ID, EXPIRATION_DATE_ID, GTIN_ID, LOT_ID
+from gs1 import LOT_START, TAIL_LENGTH
+
+# Upper bounds of the latency buckets in seconds.
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4,
+                   1e-3, 1e-2)
+
+
+class Histogram(object):
+    """Class to count observations in cumulative buckets
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """Add an observation.
+
+        Arguments:
+            value {float} -- observed value
+        """
+
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other):
+        """Add the observations of another histogram.
+
+        Arguments:
+            other {Histogram} -- histogram with the same buckets
+        """
+
+        self.counts = [count + other_count for count, other_count
+                       in zip(self.counts, other.counts)]
+        self.sum += other.sum
+        self.count += other.count
+
+    def cumulative(self):
+        """Get the cumulative bucket counts.
+
+        Returns:
+            list -- (upper bound, count) pairs, the last bound is +Inf
+        """
+
+        pairs = []
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+
+class Metrics(object):
+    """Class to hold call, failure and latency metrics
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.failures = {}
+        self.latencies = {}
+
+    def record(self, operation, style, elapsed, reason=None):
+        """Record a call.
+
+        Arguments:
+            operation {str} -- function name
+            style {str} -- output style, empty for barcode functions
+            elapsed {float} -- latency in seconds
+
+        Keyword Arguments:
+            reason {str} -- failure reason, None on success (default: {None})
+        """
+
+        key = (operation, style)
+        self.calls[key] = self.calls.get(key, 0) + 1
+        histogram = self.latencies.get(key)
+        if histogram is None:
+            histogram = self.latencies[key] = Histogram()
+        histogram.observe(elapsed)
+        if reason is not None:
+            key = (operation, reason)
+            self.failures[key] = self.failures.get(key, 0) + 1
+
+    def merge(self, other):
+        """Add the metrics recorded by another process.
+
+        Arguments:
+            other {Metrics} -- metrics, e.g. of a batch worker
+        """
+
+        for key, count in other.calls.items():
+            self.calls[key] = self.calls.get(key, 0) + count
+        for key, count in other.failures.items():
+            self.failures[key] = self.failures.get(key, 0) + count
+        for key, histogram in other.latencies.items():
+            if key not in self.latencies:
+                self.latencies[key] = Histogram(histogram.buckets)
+            self.latencies[key].merge(histogram)
+
+    def reset(self):
+        """Forget every recorded metric.
+        """
+
+        self.calls.clear()
+        self.failures.clear()
+        self.latencies.clear()
+
+    def to_prometheus(self):
+        """Export the metrics in the Prometheus text format.
+
+        Returns:
+            str -- metrics
+        """
+
+        lines = ["# HELP gs1_calls_total Calls of GS1 functions.",
+                 "# TYPE gs1_calls_total counter"]
+        for (operation, style), count in sorted(self.calls.items()):
+            lines.append('gs1_calls_total{%s} %d' %
+                         (_labels(operation, style), count))
+        lines += ["# HELP gs1_failures_total Failed GS1 calls by reason.",
+                  "# TYPE gs1_failures_total counter"]
+        for (operation, reason), count in sorted(self.failures.items()):
+            lines.append('gs1_failures_total{operation="%s",reason="%s"} %d'
+                         % (operation, reason, count))
+        lines += ["# HELP gs1_latency_seconds Latency of GS1 calls.",
+                  "# TYPE gs1_latency_seconds histogram"]
+        for (operation, style), histogram in sorted(self.latencies.items()):
+            labels = _labels(operation, style)
+            for bound, count in histogram.cumulative():
+                lines.append('gs1_latency_seconds_bucket{%s,le="%s"} %d' %
+                             (labels, "+Inf" if bound == float("inf")
+                              else repr(bound), count))
+            lines.append('gs1_latency_seconds_sum{%s} %r' %
+                         (labels, histogram.sum))
+            lines.append('gs1_latency_seconds_count{%s} %d' %
+                         (labels, histogram.count))
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Write the metrics to a Prometheus text file.
+
+        The file is replaced atomically, so a collector never reads a
+        partial file.
+
+        Arguments:
+            path {str} -- file path, usually *.prom
+        """
+
+        temporary = path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as target:
+            target.write(self.to_prometheus())
+        os.replace(temporary, path)
+
+
+def _labels(operation, style):
+    if style:
+        return 'operation="%s",style="%s"' % (operation, style)
+    return 'operation="%s"' % operation
+
+
+def failure_reason(barcode):
+    """Tell why a barcode does not match the GS1 layout.
+
+    Arguments:
+        barcode {str} -- barcode without brackets
+
+    Returns:
+        str -- too_short, gtin_id, lot_id, expiration_date_id,
+        catalog_number_id or non_digit
+    """
+
+    barcode = barcode or ""
+    if len(barcode) < LOT_START + TAIL_LENGTH:
+        return "too_short"
+    tail = len(barcode) - TAIL_LENGTH
+    if barcode[:2] != GTIN_ID:
+        return "gtin_id"
+    if barcode[16:LOT_START] != LOT_ID:
+        return "lot_id"
+    if barcode[tail:tail + 2] != EXPIRATION_DATE_ID:
+        return "expiration_date_id"
+    if barcode[tail + 8:tail + 10] != CATALOG_NUMBER_ID:
+        return "catalog_number_id"
+    return "non_digit"
+
+
+METRICS = Metrics()
+ORIGINALS = {}
+
+
+def instrument_verify(verify):
+    """Wrap GS1Check.verify."""
+
+    def wrapper(self):
+        start = perf_counter()
+        ret = verify(self)
+        elapsed = perf_counter() - start
+        METRICS.record("verify", "", elapsed,
+                       None if ret else failure_reason(self.barcode))
+        return ret
+    return wrapper
+
+
+def instrument_parse_gs1(parse_gs1):
+    """Wrap GS1GetElement.parse_gs1."""
+
+    def wrapper(self):
+        start = perf_counter()
+        ret = parse_gs1(self)
+        elapsed = perf_counter() - start
+        METRICS.record("parse_gs1", "", elapsed,
+                       None if ret is not None
+                       else failure_reason(self.barcode))
+        return ret
+    return wrapper
+
+
+def instrument_create_gs1(create_gs1):
+    """Wrap GS1Create.create_gs1."""
+
+    def wrapper(self):
+        start = perf_counter()
+        try:
+            ret = create_gs1(self)
+        except Exception as err:
+            METRICS.record("create_gs1", self.output_style,
+                           perf_counter() - start, type(err).__name__)
+            raise
+        METRICS.record("create_gs1", self.output_style,
+                       perf_counter() - start)
+        return ret
+    return wrapper
+
+
+INSTRUMENTED = [
+    ("GS1Check", "verify", instrument_verify),
+    ("GS1GetElement", "parse_gs1", instrument_parse_gs1),
+    ("GS1Create", "create_gs1", instrument_create_gs1),
+]
+
+
+def enable(module=gs1):
+    """Start recording metrics.
+
+    Keyword Arguments:
+        module {module} -- module of the instrumented classes, __main__
+        when gs1.py runs as a program (default: {gs1})
+
+    Returns:
+        Metrics -- the recorded metrics
+    """
+
+    for class_name, name, instrument in INSTRUMENTED:
+        cls = getattr(module, class_name)
+        if (cls, name) not in ORIGINALS:
+            ORIGINALS[(cls, name)] = getattr(cls, name)
+            setattr(cls, name, instrument(ORIGINALS[(cls, name)]))
+    return METRICS
+
+
+def disable():
+    """Stop recording metrics and restore the original methods.
+    """
+
+    for (cls, name), method in list(ORIGINALS.items()):
+        setattr(cls, name, method)
+        del ORIGINALS[(cls, name)]
+
+
+def is_enabled():
+    """Tell whether metrics are recorded.
+
+    Returns:
+        bool -- metrics are enabled
+    """
+
+    return bool(ORIGINALS)
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+This module tests for GS1 metrics module.
+"""
+
+import unittest
+
+import gs1_metrics
+from gs1 import GS1Check, GS1Create, GS1GetElement, iter_batch_parallel
+from gs1 import parse_arguments
+from gs1_metrics import Histogram, failure_reason
+
+
+class TestFunctions(unittest.TestCase):
+    """Test functions.
+
+    Arguments:
+        unittest {unittest} -- Calling attribut
+    """
+
+    def setUp(self):
+        self.barcode = "01059965271763401020141719073121280122804"
+        self.metrics = gs1_metrics.enable()
+        self.metrics.reset()
+
+    def tearDown(self):
+        gs1_metrics.disable()
+        self.metrics.reset()
+
+    def test_disable_restores_methods(self):
+        """Test.
+        """
+        self.assertTrue(gs1_metrics.is_enabled())
+        verify = GS1Check.verify
+        gs1_metrics.disable()
+        self.assertFalse(gs1_metrics.is_enabled())
+        self.assertIsNot(GS1Check.verify, verify)
+        self.assertEqual(GS1Check.verify.__name__, "verify")
+
+    def test_counts_and_failures(self):
+        """Test.
+        """
+        gs1_check = GS1Check()
+        for barcode in [self.barcode, self.barcode, "0105",
+                        "X" + self.barcode]:
+            gs1_check.barcode = barcode
+            gs1_check.verify()
+        gs1_element = GS1GetElement()
+        gs1_element.barcode = self.barcode[:-1] + "A"
+        gs1_element.parse_gs1()
+        gs1_create = GS1Create()
+        gs1_create.output_style = "ZPL"
+        gs1_create.ean_number = "05996527176340"
+        gs1_create.lot_number = "2014"
+        gs1_create.expiration_date = "190731"
+        gs1_create.catalog_number = "280122804"
+        gs1_create.create_gs1()
+        self.assertEqual(self.metrics.calls, {("verify", ""): 4,
+                                              ("parse_gs1", ""): 1,
+                                              ("create_gs1", "ZPL"): 1})
+        self.assertEqual(self.metrics.failures,
+                         {("verify", "too_short"): 1,
+                          ("verify", "gtin_id"): 1,
+                          ("parse_gs1", "non_digit"): 1})
+        self.assertEqual(self.metrics.latencies[("verify", "")].count, 4)
+
+    def test_create_failure(self):
+        """Test.
+        """
+        gs1_create = GS1Create()
+        gs1_create.output_style = "Character"
+        gs1_create.ean_number = "05996527176340"
+        gs1_create.lot_number = "2014é"
+        gs1_create.expiration_date = "190731"
+        gs1_create.catalog_number = "280122804"
+        with self.assertRaises(ValueError):
+            gs1_create.create_gs1()
+        self.assertEqual(self.metrics.failures,
+                         {("create_gs1", "ValueError"): 1})
+
+    def test_to_prometheus(self):
+        """Test.
+        """
+        self.metrics.record("create_gs1", "ZPL", 3e-6)
+        self.metrics.record("verify", "", 2e-5, "too_short")
+        text = self.metrics.to_prometheus()
+        self.assertIn('gs1_calls_total{operation="create_gs1",style="ZPL"} 1',
+                      text)
+        self.assertIn('gs1_failures_total{operation="verify",'
+                      'reason="too_short"} 1', text)
+        self.assertIn('gs1_latency_seconds_bucket{operation="create_gs1",'
+                      'style="ZPL",le="5e-06"} 1', text)
+        self.assertIn('gs1_latency_seconds_bucket{operation="verify",'
+                      'le="1e-05"} 0', text)
+        self.assertIn('gs1_latency_seconds_count{operation="verify"} 1',
+                      text)
+
+    def test_histogram(self):
+        """Test.
+        """
+        histogram = Histogram((1.0, 2.0))
+        for value in (0.5, 1.0, 1.5, 3.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.cumulative(),
+                         [(1.0, 2), (2.0, 3), (float("inf"), 4)])
+        self.assertEqual(histogram.sum, 6.0)
+
+    def test_failure_reason(self):
+        """Test.
+        """
+        self.assertEqual(failure_reason(""), "too_short")
+        self.assertEqual(failure_reason("02" + self.barcode[2:]), "gtin_id")
+        self.assertEqual(failure_reason(self.barcode[:16] + "11" +
+                                        self.barcode[18:]), "lot_id")
+
+    def test_merge(self):
+        """Test.
+        """
+        other = gs1_metrics.Metrics()
+        other.record("verify", "", 2e-6)
+        other.record("verify", "", 2e-3, "too_short")
+        self.metrics.record("verify", "", 2e-6)
+        self.metrics.merge(other)
+        self.assertEqual(self.metrics.calls, {("verify", ""): 3})
+        self.assertEqual(self.metrics.failures, {("verify", "too_short"): 1})
+        histogram = self.metrics.latencies[("verify", "")]
+        self.assertEqual(histogram.count, 3)
+        self.assertEqual(histogram.cumulative()[2], (5e-6, 2))
+
+    def test_parallel_batch(self):
+        """Test.
+        """
+        gs1_metrics.disable()
+        args = parse_arguments(["-b", "-f", "verify", "-p", "2",
+                                "--chunk-size", "3", "--metrics",
+                                "unused.prom"])
+        lines = [self.barcode if index % 4 else "x" for index in range(10)]
+        self.assertEqual(len(list(iter_batch_parallel(args, lines))), 10)
+        self.assertEqual(self.metrics.calls, {("verify", ""): 10})
+        self.assertEqual(self.metrics.failures, {("verify", "too_short"): 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
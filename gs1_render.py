@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+"""
+This module renders GS1-128 barcodes to PBM, PNG and SVG images.
+
+Every Code 128 symbol value maps to a precomputed pattern of 11 modules
+(13 for the stop), so a barcode is one row of modules that is packed to
+bits once and repeated for the height of the image. PNG files are written
+with zlib only, no imaging library is needed.
+"""
+
+
+import argparse
+import sys
+import zipfile
+from struct import pack
+from zlib import compress, crc32
+
+import gs1_ai
+import gs1_checksum
+import gs1_code128
+from gs1 import GS1Create, decode_character, split_gs1
+from gs1 import GS1_CHART_DIC_REV
+
+# Bar and space widths of every symbol value, bars first.
+BAR_WIDTHS = (
+    "212222 222122 222221 121223 121322 131222 122213 122312 132212 221213 "
+    "221312 231212 112232 122132 122231 113222 123122 123221 223211 221132 "
+    "221231 213212 223112 312131 311222 321122 321221 312212 322112 322211 "
+    "212123 212321 232121 111323 131123 131321 112313 132113 132311 211313 "
+    "231113 231311 112133 112331 132131 113123 113321 133121 313121 211331 "
+    "231131 213113 213311 213131 311123 311321 331121 312113 312311 332111 "
+    "314111 221411 431111 111224 111422 121124 121421 141122 141221 112214 "
+    "112412 122114 122411 142112 142211 241211 221114 413111 241112 134111 "
+    "111242 121142 121241 114212 124112 124211 411212 421112 421211 212141 "
+    "214121 412121 111143 111341 131141 114113 114311 411113 411311 113141 "
+    "114131 311141 411131 211412 211214 211232 2331112").split()
+
+# Modules of every symbol value, "1" for bar and "0" for space.
+MODULES = ["".join(("1" if index % 2 == 0 else "0") * int(width)
+                   for index, width in enumerate(widths))
+           for widths in BAR_WIDTHS]
+
+QUIET_ZONE = 10
+MODULE_WIDTH = 2
+HEIGHT = 80
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Inverts packed bits, PBM draws 1 as black and 1-bit PNG as white.
+INVERT = bytes(255 - value for value in range(256))
+FONT_START_CHARS = {char for char, value in GS1_CHART_DIC_REV.items()
+                    if value in gs1_code128.START_SETS}
+
+
+def symbol_values(barcode):
+    """Get the Code 128 symbol values of a barcode.
+
+    Arguments:
+        barcode {str} -- "Character" font barcode, plain barcode with the
+        fixed layout or GS1 string with brackets or FNC1 as GS
+
+    Raises:
+        ValueError -- barcode cannot be encoded
+
+    Returns:
+        list -- symbol values from the start to the stop
+    """
+
+    if barcode[:1] in FONT_START_CHARS:
+        decode_character(barcode)
+        return [GS1_CHART_DIC_REV[char] for char in barcode]
+    elements = split_gs1(barcode)
+    if elements is not None:
+        gs1_create = GS1Create()
+        (gs1_create.ean_number, gs1_create.lot_number,
+         gs1_create.expiration_date, gs1_create.catalog_number) = elements
+        data = gs1_create.get_element_string()
+    else:
+        data = gs1_ai.to_element_string(gs1_ai.parse(barcode))
+    values = gs1_code128.encode(data)
+    values.append(gs1_checksum.mod103_check_value(values))
+    values.append(gs1_code128.STOP_VALUE)
+    return values
+
+
+class BarcodeRenderer(object):
+    """Class to render Code 128 symbol values to images
+    """
+
+    def __init__(self, module_width=MODULE_WIDTH, height=HEIGHT,
+                 quiet_zone=QUIET_ZONE):
+        self.module_width = module_width
+        self.height = height
+        self.quiet_zone = quiet_zone
+        # Modules of every symbol value scaled to the module width.
+        self.scaled = [
+            "".join(module * module_width for module in modules)
+            for modules in MODULES]
+        self.margin = "0" * (quiet_zone * module_width)
+
+    def row_bits(self, values):
+        """Get the modules of one image row.
+
+        Arguments:
+            values {list} -- symbol values from the start to the stop
+
+        Returns:
+            str -- "1" for bar and "0" for space per pixel
+        """
+
+        scaled = self.scaled
+        return self.margin + "".join([scaled[value] for value in values]) + \
+            self.margin
+
+    def packed_row(self, values):
+        """Get one image row packed to bytes, bars as 1 bits.
+
+        Arguments:
+            values {list} -- symbol values from the start to the stop
+
+        Returns:
+            tuple -- row width in pixels and packed row
+        """
+
+        bits = self.row_bits(values)
+        width = len(bits)
+        padding = -width % 8
+        row = int(bits + "0" * padding, 2).to_bytes((width + padding) // 8,
+                                                    "big")
+        return width, row
+
+    def pbm(self, values):
+        """Render a binary PBM (P4) image.
+
+        Arguments:
+            values {list} -- symbol values from the start to the stop
+
+        Returns:
+            bytes -- image
+        """
+
+        width, row = self.packed_row(values)
+        return b"P4\n%d %d\n" % (width, self.height) + row * self.height
+
+    def png(self, values):
+        """Render a 1-bit grayscale PNG image.
+
+        Arguments:
+            values {list} -- symbol values from the start to the stop
+
+        Returns:
+            bytes -- image
+        """
+
+        width, row = self.packed_row(values)
+        scanlines = (b"\0" + row.translate(INVERT)) * self.height
+        return PNG_SIGNATURE + \
+            _png_chunk(b"IHDR", pack(">IIBBBBB", width, self.height,
+                                     1, 0, 0, 0, 0)) + \
+            _png_chunk(b"IDAT", compress(scanlines, 9)) + \
+            _png_chunk(b"IEND", b"")
+
+    def svg(self, values):
+        """Render an SVG image with one rectangle per bar.
+
+        Arguments:
+            values {list} -- symbol values from the start to the stop
+
+        Returns:
+            str -- image
+        """
+
+        module_width = self.module_width
+        width = (sum(len(MODULES[value]) for value in values) +
+                 2 * self.quiet_zone) * module_width
+        parts = ['<svg xmlns="http://www.w3.org/2000/svg" width="%d" '
+                 'height="%d" viewBox="0 0 %d %d">' %
+                 (width, self.height, width, self.height),
+                 '<rect width="100%" height="100%" fill="#fff"/>',
+                 '<path fill="#000" d="']
+        x = self.quiet_zone
+        for value in values:
+            for index, bar in enumerate(BAR_WIDTHS[value]):
+                bar = int(bar)
+                if index % 2 == 0:
+                    parts.append("M%d 0h%dv%dh-%dz" %
+                                 (x * module_width, bar * module_width,
+                                  self.height, bar * module_width))
+                x += bar
+        parts.append('"/></svg>\n')
+        return "".join(parts)
+
+    def render(self, values, image_format):
+        """Render an image.
+
+        Arguments:
+            values {list} -- symbol values from the start to the stop
+            image_format {str} -- pbm, png or svg
+
+        Returns:
+            bytes -- image
+        """
+
+        if image_format == "svg":
+            return self.svg(values).encode("ascii")
+        return getattr(self, image_format)(values)
+
+
+def _png_chunk(kind, data):
+    return pack(">I", len(data)) + kind + data + \
+        pack(">I", crc32(kind + data))
+
+
+def render_archive(barcodes, path, image_format="png", renderer=None):
+    """Render many barcodes into a ZIP archive.
+
+    Arguments:
+        barcodes {iterable} -- barcodes, as accepted by symbol_values()
+        path {str} -- archive path or file object
+
+    Keyword Arguments:
+        image_format {str} -- pbm, png or svg (default: {"png"})
+        renderer {BarcodeRenderer} -- renderer (default: {default size})
+
+    Returns:
+        list -- (line number, error) of every barcode that was skipped
+    """
+
+    renderer = renderer or BarcodeRenderer()
+    errors = []
+    # PNG and SVG are compressed already or compress well on their own,
+    # PBM rows repeat and are left to the archive.
+    compression = zipfile.ZIP_DEFLATED if image_format == "pbm" else \
+        zipfile.ZIP_STORED
+    with zipfile.ZipFile(path, "w", compression) as archive:
+        for number, barcode in enumerate(barcodes, 1):
+            barcode = barcode.strip()
+            if not barcode:
+                continue
+            try:
+                values = symbol_values(barcode)
+            except ValueError as err:
+                errors.append((number, str(err)))
+                continue
+            archive.writestr("%06d.%s" % (number, image_format),
+                             renderer.render(values, image_format))
+    return errors
+
+
+def parse_arguments(argv=None):
+    """
+    Parse program arguments.
+
+    @param argv argument list, sys.argv when None
+    @return arguments
+    """
+    parser = argparse.ArgumentParser(prog="gs1_render.py")
+    parser.add_argument('barcode', nargs='?',
+                        help='barcode: Character font, plain or with '
+                        'brackets')
+    parser.add_argument('-o', '--output', required=True,
+                        help='image file, or ZIP archive in batch mode')
+    parser.add_argument('-f', '--format', default='png',
+                        choices=['pbm', 'png', 'svg'], help='image format')
+    parser.add_argument('-b', '--batch', action='store_true',
+                        help='render every input line into a ZIP archive')
+    parser.add_argument('-i', '--input', default='-',
+                        help='batch input file, - for stdin')
+    parser.add_argument('-m', '--module-width', type=int,
+                        default=MODULE_WIDTH, help='pixels per module')
+    parser.add_argument('--height', type=int, default=HEIGHT,
+                        help='image height in pixels')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Render a barcode or a batch of barcodes.
+
+    Keyword Arguments:
+        argv {list} -- arguments, sys.argv when None (default: {None})
+    """
+
+    args = parse_arguments(argv)
+    renderer = BarcodeRenderer(args.module_width, args.height)
+    if args.batch:
+        if args.input == '-':
+            source = sys.stdin
+        else:
+            source = open(args.input, encoding="utf-8")
+        try:
+            errors = render_archive(source, args.output, args.format,
+                                    renderer)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        for number, error in errors:
+            sys.stderr.write("skipped line %d: %s\n" % (number, error))
+        return
+    if not args.barcode:
+        sys.exit("gs1_render.py: a barcode is required without --batch")
+    image = renderer.render(symbol_values(args.barcode), args.format)
+    with open(args.output, "wb") as target:
+        target.write(image)
+
+
+if __name__ == '__main__':
+    main()
+    sys.exit()
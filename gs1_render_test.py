@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+This module tests for GS1 barcode rendering module.
+"""
+
+import io
+import struct
+import unittest
+import zipfile
+import zlib
+
+from gs1_render import MODULES, BarcodeRenderer, render_archive
+from gs1_render import symbol_values
+
+
+class TestFunctions(unittest.TestCase):
+    """Test functions.
+
+    Arguments:
+        unittest {unittest} -- Calling attribut
+    """
+
+    def setUp(self):
+        self.values = symbol_values("ÍÊ!%Ça;1_H*4.Ê13'?5<!6pÈ4pÎ")
+        self.renderer = BarcodeRenderer(module_width=3, height=5)
+
+    def test_modules(self):
+        """Test.
+        """
+        self.assertEqual(len(set(MODULES)), 107)
+        for value, modules in enumerate(MODULES):
+            self.assertEqual(len(modules), 13 if value == 106 else 11)
+            self.assertEqual(modules[0], "1")
+        self.assertEqual(MODULES[104], "11010010000")
+        self.assertEqual(MODULES[106], "1100011101011")
+
+    def test_symbol_values(self):
+        """Test.
+        """
+        self.assertEqual(symbol_values(
+            "(01)05996527176340(10)2014(17)190731(21)280122804"),
+                         self.values)
+        self.assertEqual(symbol_values(
+            "01059965271763401020141719073121280122804"), self.values)
+        self.assertEqual(self.values[0], 105)
+        self.assertEqual(self.values[-1], 106)
+        self.assertRaises(ValueError, symbol_values, "ÍÊ!!Î")
+
+    def test_row_bits(self):
+        """Test.
+        """
+        renderer = BarcodeRenderer(module_width=1, quiet_zone=0)
+        bits = renderer.row_bits(self.values)
+        decoded = [MODULES.index(bits[pos:pos + 11])
+                   for pos in range(0, len(bits) - 13, 11)]
+        self.assertEqual(decoded + [MODULES.index(bits[-13:])], self.values)
+
+    def test_pbm(self):
+        """Test.
+        """
+        image = self.renderer.pbm(self.values)
+        width = (11 * (len(self.values) - 1) + 13 + 20) * 3
+        header = b"P4\n%d 5\n" % width
+        self.assertTrue(image.startswith(header))
+        self.assertEqual(len(image), len(header) + 5 * ((width + 7) // 8))
+
+    def test_png(self):
+        """Test.
+        """
+        image = self.renderer.png(self.values)
+        self.assertEqual(image[:8], b"\x89PNG\r\n\x1a\n")
+        pos = 8
+        chunks = {}
+        while pos < len(image):
+            length, = struct.unpack(">I", image[pos:pos + 4])
+            kind = image[pos + 4:pos + 8]
+            data = image[pos + 8:pos + 8 + length]
+            crc, = struct.unpack(">I", image[pos + 8 + length:
+                                             pos + 12 + length])
+            self.assertEqual(crc, zlib.crc32(kind + data))
+            chunks[kind] = data
+            pos += 12 + length
+        width, height, depth, color = struct.unpack(
+            ">IIBB", chunks[b"IHDR"][:10])
+        self.assertEqual((height, depth, color), (5, 1, 0))
+        scanlines = zlib.decompress(chunks[b"IDAT"])
+        row_bytes = (width + 7) // 8
+        self.assertEqual(len(scanlines), 5 * (row_bytes + 1))
+        _, row = self.renderer.packed_row(self.values)
+        self.assertEqual(scanlines[0], 0)
+        self.assertEqual(bytes(255 - value for value in scanlines[1:4]),
+                         row[:3])
+
+    def test_svg(self):
+        """Test.
+        """
+        image = self.renderer.svg(self.values)
+        self.assertTrue(image.startswith("<svg "))
+        self.assertEqual(image.count("z"), 3 * len(self.values) + 1)
+
+    def test_render_archive(self):
+        """Test.
+        """
+        target = io.BytesIO()
+        errors = render_archive(
+            ["01059965271763401020141719073121280122804\n", "\n",
+             "(01)123\n", "ÍÊ!%Ça;1_H*4.Ê13'?5<!6pÈ4pÎ\n"],
+            target, "pbm", self.renderer)
+        self.assertEqual([number for number, _ in errors], [3])
+        with zipfile.ZipFile(target) as archive:
+            self.assertEqual(archive.namelist(),
+                             ["000001.pbm", "000004.pbm"])
+            self.assertEqual(archive.read("000001.pbm"),
+                             self.renderer.pbm(self.values))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""
+This module extracts GS1 data from ZPL spool files and scanner logs.
+
+Files are memory-mapped and split into chunks that are scanned by a process
+pool, so files of any size are read without loading them into memory.
+
+In a spool file each chunk reports the ^FD fields that start in it; a field
+crossing the end of the chunk is still matched because the scan reads up
+to MAX_FIELD_LENGTH bytes into the next chunk. Log files are split at line
+ends, and a bytes pattern picks the candidate GS1 strings of a chunk
+before they are parsed.
+"""
+
+
+import argparse
+import json
+import mmap
+import os
+import re
+import sys
+
+import gs1_ai
+import gs1_code128
+from gs1 import LOT_START, TAIL_LENGTH, map_chunks, split_gs1
+
+# GS1-128 ^FD data: a start code set invocation followed by FNC1.
+ZPL_FIELD = re.compile(rb"\^FD(>[9:;]>8[^\^]*)\^FS")
+# Candidate GS1 strings of a log: a digit run starting with the GTIN AI,
+# long enough for the fixed layout, plain or in brackets.
+LOG_CANDIDATE = re.compile(
+    rb"(?<![0-9)])(?:01[0-9]{%d,}|\(01\)[0-9()]{%d,})(?![0-9(])" %
+    (LOT_START + TAIL_LENGTH - 2, LOT_START + TAIL_LENGTH + 4))
+MAX_FIELD_LENGTH = 4096
+CHUNK_SIZE = 64 << 20
+
+
+def iter_ranges(paths, chunk_size=CHUNK_SIZE):
+    """Split files into byte ranges.
+
+    Arguments:
+        paths {iterable} -- file paths
+
+    Keyword Arguments:
+        chunk_size {int} -- bytes per range (default: {64 MiB})
+
+    Yields:
+        tuple -- path, start and end offset of a range
+    """
+
+    for path in paths:
+        size = os.path.getsize(path)
+        for start in range(0, size, chunk_size):
+            yield path, start, min(start + chunk_size, size)
+
+
+def open_map(path):
+    """Memory-map a file read-only.
+
+    Arguments:
+        path {str} -- file path
+
+    Returns:
+        mmap -- file contents
+    """
+
+    with open(path, "rb") as source:
+        return mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def decode_field(data):
+    """Decode the ^FD data of a GS1-128 ZPL field.
+
+    Arguments:
+        data {bytes} -- ^FD data with code set invocations
+
+    Raises:
+        ValueError -- invalid invocations or GS1 elements
+
+    Returns:
+        dict -- GS1 element values by AI
+    """
+
+    return dict(gs1_ai.parse(gs1_code128.decode_zpl(data.decode("latin-1"))))
+
+
+def scan_zpl_range(path, start, end):
+    """Extract the GS1 fields starting in a byte range of a spool file.
+
+    Arguments:
+        path {str} -- spool file path
+        start {int} -- start offset
+        end {int} -- end offset
+
+    Returns:
+        list -- records with file, offset, elements and error
+    """
+
+    records = []
+    data = open_map(path)
+    try:
+        stop = min(end + MAX_FIELD_LENGTH, len(data))
+        for match in ZPL_FIELD.finditer(data, start, stop):
+            if match.start() >= end:
+                break
+            record = {"file": path, "offset": match.start(),
+                      "elements": None, "error": None}
+            try:
+                record["elements"] = decode_field(match.group(1))
+            except ValueError as err:
+                record["error"] = str(err)
+            records.append(record)
+    finally:
+        data.close()
+    return records
+
+
+def scan_zpl_ranges(ranges):
+    """Extract the GS1 fields of several byte ranges.
+
+    Arguments:
+        ranges {list} -- path, start and end offset tuples
+
+    Returns:
+        list -- records in range order
+    """
+
+    records = []
+    for path, start, end in ranges:
+        records.extend(scan_zpl_range(path, start, end))
+    return records
+
+
+def scan_zpl_files(paths, processes=None, chunk_size=CHUNK_SIZE):
+    """Extract the GS1 fields of ZPL spool files.
+
+    Arguments:
+        paths {iterable} -- spool file paths
+
+    Keyword Arguments:
+        processes {int} -- worker processes, 1 scans in this process
+        (default: {CPU count})
+        chunk_size {int} -- bytes per task (default: {64 MiB})
+
+    Yields:
+        dict -- file, offset, elements and error of every field, in file
+        order
+    """
+
+    ranges = iter_ranges(paths, chunk_size)
+    if processes == 1:
+        for path, start, end in ranges:
+            yield from scan_zpl_range(path, start, end)
+        return
+    yield from map_chunks(scan_zpl_ranges, ranges, processes, 1)
+
+
+def iter_line_ranges(paths, chunk_size=CHUNK_SIZE):
+    """Split files into byte ranges ending at line ends.
+
+    Arguments:
+        paths {iterable} -- file paths
+
+    Keyword Arguments:
+        chunk_size {int} -- minimum bytes per range (default: {64 MiB})
+
+    Yields:
+        tuple -- path, start and end offset of a range
+    """
+
+    for path in paths:
+        if not os.path.getsize(path):
+            continue
+        data = open_map(path)
+        try:
+            size = len(data)
+            start = 0
+            while start < size:
+                end = data.find(b"\n", start + chunk_size - 1) + 1 or size
+                yield path, start, end
+                start = end
+        finally:
+            data.close()
+
+
+def scan_log_range(path, start, end):
+    """Extract the GS1 strings of a byte range of a log file.
+
+    Arguments:
+        path {str} -- log file path
+        start {int} -- start offset, at a line start
+        end {int} -- end offset, at a line end
+
+    Returns:
+        list -- records with file, offset, barcode and elements
+    """
+
+    records = []
+    data = open_map(path)
+    try:
+        for match in LOG_CANDIDATE.finditer(data, start, end):
+            barcode = match.group().decode("ascii")
+            elements = split_gs1(barcode.replace("(", "").replace(")", ""))
+            if elements is not None:
+                records.append({"file": path, "offset": match.start(),
+                                "barcode": barcode,
+                                "elements": elements._asdict()})
+    finally:
+        data.close()
+    return records
+
+
+def scan_log_ranges(ranges):
+    """Extract the GS1 strings of several byte ranges.
+
+    Arguments:
+        ranges {list} -- path, start and end offset tuples
+
+    Returns:
+        list -- records in range order
+    """
+
+    records = []
+    for path, start, end in ranges:
+        records.extend(scan_log_range(path, start, end))
+    return records
+
+
+def scan_log_files(paths, processes=None, chunk_size=CHUNK_SIZE):
+    """Extract the GS1 strings of scanner logs.
+
+    Only strings with the layout accepted by GS1Check.verify() are
+    reported.
+
+    Arguments:
+        paths {iterable} -- log file paths
+
+    Keyword Arguments:
+        processes {int} -- worker processes, 1 scans in this process
+        (default: {CPU count})
+        chunk_size {int} -- minimum bytes per task (default: {64 MiB})
+
+    Yields:
+        dict -- file, offset, barcode and elements of every GS1 string, in
+        file order
+    """
+
+    ranges = iter_line_ranges(paths, chunk_size)
+    if processes == 1:
+        for path, start, end in ranges:
+            yield from scan_log_range(path, start, end)
+        return
+    yield from map_chunks(scan_log_ranges, ranges, processes, 1)
+
+
+def parse_arguments(argv=None):
+    """
+    Parse program arguments.
+
+    @param argv argument list, sys.argv when None
+    @return arguments
+    """
+    parser = argparse.ArgumentParser(prog="gs1_scan.py")
+    parser.add_argument('files', nargs='+', help='ZPL spool or log files')
+    parser.add_argument('-m', '--mode', default='zpl', choices=['zpl', 'log'],
+                        help='zpl extracts ^FD fields of spool files, log '
+                        'extracts GS1 strings of scanner logs')
+    parser.add_argument('-p', '--processes', type=int, default=0,
+                        help='worker processes, 0 for one per CPU')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help='bytes per worker task')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Write the GS1 data of spool or log files as JSON lines.
+
+    Keyword Arguments:
+        argv {list} -- arguments, sys.argv when None (default: {None})
+    """
+
+    args = parse_arguments(argv)
+    scan_files = scan_log_files if args.mode == 'log' else scan_zpl_files
+    for record in scan_files(args.files, args.processes or None,
+                             args.chunk_size):
+        sys.stdout.write(json.dumps(record) + "\n")
+
+
+if __name__ == '__main__':
+    main()
+    sys.exit()
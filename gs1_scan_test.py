@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+This module tests for GS1 spool scanning module.
+"""
+
+import os
+import tempfile
+import unittest
+
+from gs1 import GS1Create
+from gs1_scan import iter_line_ranges, scan_log_files, scan_zpl_files
+
+
+class TestFunctions(unittest.TestCase):
+    """Test functions.
+
+    Arguments:
+        unittest {unittest} -- Calling attribut
+    """
+
+    def setUp(self):
+        gs1_create = GS1Create()
+        gs1_create.output_style = "ZPL"
+        gs1_create.ean_number = "05996527176340"
+        gs1_create.lot_number = "A>2014"
+        gs1_create.expiration_date = "190731"
+        labels = []
+        for serial in range(40):
+            gs1_create.catalog_number = "%09d" % serial
+            labels.append("^XA^FO50,50^BY2%s^FO50,190^FD(01)...^FS^XZ\n" %
+                          gs1_create.create_gs1())
+        labels.insert(5, "^XA^FD>;>812>1^FS^XZ\n")
+        handle, self.path = tempfile.mkstemp(suffix=".zpl")
+        with os.fdopen(handle, "w", encoding="ascii") as target:
+            target.write("".join(labels))
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_scan_zpl_files(self):
+        """Test.
+        """
+        records = list(scan_zpl_files([self.path], processes=1))
+        self.assertEqual(len(records), 41)
+        self.assertEqual(records[0]["elements"],
+                         {"01": "05996527176340", "10": "A>2014",
+                          "17": "190731", "21": "000000000"})
+        self.assertEqual(records[5]["elements"], None)
+        self.assertEqual(records[5]["error"], "unsupported invocation >1 at 6")
+        self.assertEqual(records[40]["elements"]["21"], "000000039")
+        with open(self.path, "rb") as source:
+            source.seek(records[1]["offset"])
+            self.assertEqual(source.read(3), b"^FD")
+
+    def test_scan_zpl_files_chunks(self):
+        """Test.
+        """
+        expected = list(scan_zpl_files([self.path], processes=1))
+        self.assertEqual(list(scan_zpl_files([self.path, self.path],
+                                             processes=2, chunk_size=50)),
+                         expected + expected)
+        self.assertEqual(list(scan_zpl_files([self.path], processes=1,
+                                             chunk_size=7)), expected)
+
+
+class TestLog(unittest.TestCase):
+    """Test functions.
+
+    Arguments:
+        unittest {unittest} -- Calling attribut
+    """
+
+    def setUp(self):
+        self.barcode = "01059965271763401020141719073121280122804"
+        lines = []
+        for index in range(30):
+            lines.append("2024-05-0%d 10:00:%02d gw%d scan=%s ok\n" %
+                         (index % 9 + 1, index, index % 3, self.barcode))
+            lines.append("2024-05-01 10:00:%02d gw1 label "
+                         "(01)05996527176340(10)%d(17)190731(21)28012280%d"
+                         "\n" % (index, index, index % 10))
+            lines.append("2024-05-01 10:00:%02d gw2 noise "
+                         "0105996527176340102014171907312128012280412 "
+                         "1%s\n" % (index, self.barcode))
+        handle, self.path = tempfile.mkstemp(suffix=".log")
+        with os.fdopen(handle, "w", encoding="ascii") as target:
+            target.write("".join(lines))
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_scan_log_files(self):
+        """Test.
+        """
+        records = list(scan_log_files([self.path], processes=1))
+        self.assertEqual(len(records), 60)
+        self.assertEqual(records[0]["barcode"], self.barcode)
+        self.assertEqual(records[1]["elements"],
+                         {"ean_number": "05996527176340",
+                          "lot_number": "0", "expiration_date": "190731",
+                          "catalog_number": "280122800"})
+        with open(self.path, "rb") as source:
+            source.seek(records[1]["offset"])
+            self.assertEqual(source.read(4), b"(01)")
+
+    def test_scan_log_files_chunks(self):
+        """Test.
+        """
+        ranges = list(iter_line_ranges([self.path], 100))
+        self.assertGreater(len(ranges), 10)
+        with open(self.path, "rb") as source:
+            data = source.read()
+        for _, start, end in ranges:
+            self.assertEqual(data[end - 1:end], b"\n")
+        self.assertEqual(ranges[-1][2], len(data))
+        self.assertEqual(list(scan_log_files([self.path], processes=2,
+                                             chunk_size=100)),
+                         list(scan_log_files([self.path], processes=1)))
+
+
+if __name__ == '__main__':
+    unittest.main()
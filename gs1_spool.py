@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+This module deals with spooling GS1 labels to raw port 9100 printers.
+
+Every printer keeps one persistent connection and pulls batches of labels
+from a shared queue with a bounded number of slots, so idle printers take
+more work, submitters wait when all slots are taken, and labels of a
+failing printer are retried on the others.
+"""
+
+
+import asyncio
+
+from gs1 import GS1Create
+
+PRINTER_PORT = 9100
+LABEL_LAYOUT = "^XA^FO50,50^BY2%s^XZ\n"
+
+
+class Printer(object):
+    """Class to hold the connection and counters of one printer
+    """
+
+    def __init__(self, host, port=PRINTER_PORT):
+        self.host = host
+        self.port = port
+        self.writer = None
+        self.labels = 0
+        self.errors = 0
+
+    async def send(self, data, timeout):
+        """Send data, connecting first if needed.
+
+        Arguments:
+            data {bytes} -- raw printer data
+            timeout {float} -- connect and send timeout in seconds
+        """
+
+        if self.writer is None:
+            _, self.writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), timeout)
+        self.writer.write(data)
+        await asyncio.wait_for(self.writer.drain(), timeout)
+
+    async def close(self):
+        """Close the connection.
+        """
+
+        writer = self.writer
+        self.writer = None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+
+class PrinterSpooler(object):
+    """Class to spool labels to a pool of raw socket printers
+    """
+
+    def __init__(self, printers, queue_size=1000, batch_size=50,
+                 retries=3, retry_delay=1.0, timeout=10.0):
+        self.printers = [Printer(*printer) if isinstance(printer, tuple)
+                         else Printer(printer) for printer in printers]
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+        self.failed = []
+        self.queue = None
+        self.slots = None
+        self.workers = []
+        self.gs1_create = GS1Create()
+        self.gs1_create.output_style = "ZPL"
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.close()
+
+    async def start(self):
+        """Start one worker per printer.
+        """
+
+        # Retried labels go back to the queue without waiting, so the queue
+        # itself is unbounded and submitters wait for a free slot instead.
+        self.queue = asyncio.Queue()
+        self.slots = asyncio.Semaphore(self.queue_size)
+        self.workers = [asyncio.ensure_future(self.run_printer(printer))
+                        for printer in self.printers]
+
+    async def submit(self, label):
+        """Queue a label, waiting while the queue is full.
+
+        Arguments:
+            label {str} -- ZPL label
+
+        Raises:
+            UnicodeEncodeError -- label is not ASCII, nothing is queued
+        """
+
+        data = label.encode("ascii")
+        await self.slots.acquire()
+        self.queue.put_nowait((data, 0))
+
+    async def submit_label(self, ean_number, lot_number, expiration_date,
+                           catalog_number):
+        """Queue a GS1-128 label.
+
+        Arguments:
+            ean_number {str} -- EAN number (01)
+            lot_number {str} -- LOT number (10)
+            expiration_date {str} -- expiration date YYMMDD (17)
+            catalog_number {str} -- catalog number (21)
+        """
+
+        gs1_create = self.gs1_create
+        gs1_create.ean_number = ean_number
+        gs1_create.lot_number = lot_number
+        gs1_create.expiration_date = expiration_date
+        gs1_create.catalog_number = catalog_number
+        await self.submit(LABEL_LAYOUT % gs1_create.create_gs1())
+
+    async def run_printer(self, printer):
+        """Send batches of queued labels to one printer.
+
+        Arguments:
+            printer {Printer} -- printer
+        """
+
+        queue = self.queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await printer.send(b"".join(label for label, _ in batch),
+                                   self.timeout)
+            except (OSError, asyncio.TimeoutError):
+                printer.errors += 1
+                await printer.close()
+                for label, attempts in batch:
+                    if attempts < self.retries:
+                        queue.put_nowait((label, attempts + 1))
+                    else:
+                        self.failed.append(label.decode("ascii"))
+                        self.slots.release()
+                    queue.task_done()
+                await asyncio.sleep(self.retry_delay)
+                continue
+            printer.labels += len(batch)
+            for _ in batch:
+                self.slots.release()
+                queue.task_done()
+
+    async def close(self):
+        """Wait until every queued label is sent or failed, then close.
+        """
+
+        if self.queue is not None:
+            await self.queue.join()
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        for printer in self.printers:
+            await printer.close()
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+This module tests for GS1 label spooler module.
+"""
+
+import asyncio
+import unittest
+
+from gs1_spool import PrinterSpooler
+
+
+class StandInPrinter(object):
+    """Local TCP server collecting printed data
+    """
+
+    def __init__(self):
+        self.data = b""
+        self.connections = 0
+        self.server = None
+        self.port = None
+
+    async def start(self):
+        """Listen on a free local port.
+        """
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def handle(self, reader, writer):
+        """Collect data of one connection.
+        """
+        self.connections += 1
+        while True:
+            chunk = await reader.read(65536)
+            if not chunk:
+                break
+            self.data += chunk
+        writer.close()
+
+    async def stop(self):
+        """Stop listening.
+        """
+        self.server.close()
+        await self.server.wait_closed()
+
+
+class TestFunctions(unittest.TestCase):
+    """Test functions.
+
+    Arguments:
+        unittest {unittest} -- Calling attribut
+    """
+
+    def test_spool_labels(self):
+        """Test.
+        """
+
+        async def run():
+            printers = [StandInPrinter(), StandInPrinter()]
+            for printer in printers:
+                await printer.start()
+            spooler = PrinterSpooler(
+                [("127.0.0.1", printer.port) for printer in printers],
+                queue_size=4, batch_size=3)
+            async with spooler:
+                for serial in range(280122100, 280122120):
+                    await spooler.submit_label("05996527176340", "2014",
+                                               "190731", str(serial))
+            await asyncio.sleep(0.05)
+            for printer in printers:
+                await printer.stop()
+            return printers, spooler
+
+        printers, spooler = asyncio.run(run())
+        data = b"".join(printer.data for printer in printers)
+        self.assertEqual(data.count(b"^XA"), 20)
+        self.assertIn(b">8171907312128012211>69^FS", data)
+        self.assertEqual(sum(printer.labels for printer in spooler.printers),
+                         20)
+        self.assertEqual(max(printer.connections for printer in printers), 1)
+        self.assertEqual(spooler.failed, [])
+
+    def test_spool_retry_other_printer(self):
+        """Test.
+        """
+
+        async def run():
+            printer = StandInPrinter()
+            await printer.start()
+            down = StandInPrinter()
+            await down.start()
+            await down.stop()
+            spooler = PrinterSpooler([("127.0.0.1", down.port),
+                                      ("127.0.0.1", printer.port)],
+                                     retries=5, retry_delay=0.01)
+            async with spooler:
+                for label in range(10):
+                    await spooler.submit("^XA%d^XZ" % label)
+            await asyncio.sleep(0.05)
+            await printer.stop()
+            return printer, spooler
+
+        printer, spooler = asyncio.run(run())
+        self.assertEqual(printer.data.count(b"^XA"), 10)
+        self.assertEqual(spooler.failed, [])
+
+    def test_spool_non_ascii_label(self):
+        """Test.
+        """
+
+        async def run():
+            printer = StandInPrinter()
+            await printer.start()
+            spooler = PrinterSpooler([("127.0.0.1", printer.port)],
+                                     queue_size=2)
+            async with spooler:
+                for _ in range(3):
+                    with self.assertRaises(UnicodeEncodeError):
+                        await asyncio.wait_for(
+                            spooler.submit("^XA\xe9^XZ"), 1)
+                await asyncio.wait_for(spooler.submit("^XA1^XZ"), 1)
+            await asyncio.sleep(0.05)
+            await printer.stop()
+            return printer
+
+        printer = asyncio.run(run())
+        self.assertEqual(printer.data, b"^XA1^XZ")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+This module deals with large sets of parsed GS1 records in columns.
+
+EAN numbers, LOTs and expiration dates repeat heavily, so each of them is
+stored once in a dictionary and every record keeps only its integer code.
+Catalog numbers are unique and stored as integers. All four columns are
+arrays of machine integers, about 20 bytes per record.
+"""
+
+
+from array import array
+
+from gs1 import GS1Elements, split_gs1
+
+CATALOG_NUMBER_WIDTH = 9
+
+
+class Dictionary(object):
+    """Class to map repeated strings to integer codes
+    """
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def encode(self, value):
+        """Get the code of a value, adding the value if it is new.
+
+        Arguments:
+            value {str} -- value
+
+        Returns:
+            int -- code
+        """
+
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def nbytes(self):
+        """Estimate the memory used by the values and the code map.
+
+        Returns:
+            int -- bytes
+        """
+
+        from sys import getsizeof
+
+        return getsizeof(self.values) + getsizeof(self.codes) + \
+            sum(map(getsizeof, self.values))
+
+
+class GS1Store(object):
+    """Class to store GS1 records in dictionary-encoded columns
+    """
+
+    def __init__(self, dictionaries=None):
+        if dictionaries is None:
+            dictionaries = (Dictionary(), Dictionary(), Dictionary())
+        self.eans, self.lots, self.expirations = dictionaries
+        self.ean_codes = array("I")
+        self.lot_codes = array("I")
+        self.expiration_codes = array("I")
+        self.catalog_numbers = array("Q")
+
+    def __len__(self):
+        return len(self.catalog_numbers)
+
+    def __getitem__(self, index):
+        return GS1Elements(
+            self.eans.values[self.ean_codes[index]],
+            self.lots.values[self.lot_codes[index]],
+            self.expirations.values[self.expiration_codes[index]],
+            str(self.catalog_numbers[index]).zfill(CATALOG_NUMBER_WIDTH))
+
+    def __iter__(self):
+        eans = self.eans.values
+        lots = self.lots.values
+        expirations = self.expirations.values
+        for ean_code, lot_code, expiration_code, catalog_number in zip(
+                self.ean_codes, self.lot_codes, self.expiration_codes,
+                self.catalog_numbers):
+            yield GS1Elements(eans[ean_code], lots[lot_code],
+                              expirations[expiration_code],
+                              str(catalog_number).zfill(
+                                  CATALOG_NUMBER_WIDTH))
+
+    def append(self, ean_number, lot_number, expiration_date,
+               catalog_number):
+        """Append a record.
+
+        Arguments:
+            ean_number {str} -- EAN number (01)
+            lot_number {str} -- LOT number (10)
+            expiration_date {str} -- expiration date YYMMDD (17)
+            catalog_number {str} -- 9 digit catalog number (21)
+
+        Raises:
+            ValueError -- catalog number is not 9 digits
+        """
+
+        if len(catalog_number) != CATALOG_NUMBER_WIDTH or \
+                not (catalog_number.isascii() and catalog_number.isdigit()):
+            raise ValueError("catalog number %r is not %d digits" %
+                             (catalog_number, CATALOG_NUMBER_WIDTH))
+        self.ean_codes.append(self.eans.encode(ean_number))
+        self.lot_codes.append(self.lots.encode(lot_number))
+        self.expiration_codes.append(self.expirations.encode(expiration_date))
+        self.catalog_numbers.append(int(catalog_number))
+
+    def append_barcode(self, barcode):
+        """Parse a barcode and append its record.
+
+        Arguments:
+            barcode {str} -- barcode without brackets
+
+        Returns:
+            bool -- barcode matched the GS1 layout and was appended
+        """
+
+        elements = split_gs1(barcode)
+        if elements is None:
+            return False
+        self.append(*elements)
+        return True
+
+    def extend_barcodes(self, barcodes):
+        """Parse barcodes and append their records.
+
+        Arguments:
+            barcodes {iterable} -- barcodes without brackets
+
+        Returns:
+            int -- number of appended records
+        """
+
+        ean_codes = self.ean_codes
+        lot_codes = self.lot_codes
+        expiration_codes = self.expiration_codes
+        catalog_numbers = self.catalog_numbers
+        encode_ean = self.eans.encode
+        encode_lot = self.lots.encode
+        encode_expiration = self.expirations.encode
+        before = len(catalog_numbers)
+        for barcode in barcodes:
+            elements = split_gs1(barcode)
+            if elements is None:
+                continue
+            ean_codes.append(encode_ean(elements.ean_number))
+            lot_codes.append(encode_lot(elements.lot_number))
+            expiration_codes.append(encode_expiration(
+                elements.expiration_date))
+            # The layout guarantees a 9 digit catalog number.
+            catalog_numbers.append(int(elements.catalog_number))
+        return len(catalog_numbers) - before
+
+    def filter(self, ean_number=None, lot_number=None,
+               expiration_date=None):
+        """Select the records matching every given value.
+
+        Values are looked up in the dictionaries once and the records are
+        compared by integer code.
+
+        Keyword Arguments:
+            ean_number {str} -- EAN number (default: {any})
+            lot_number {str} -- LOT number (default: {any})
+            expiration_date {str} -- expiration date YYMMDD (default: {any})
+
+        Returns:
+            GS1Store -- matching records, sharing the dictionaries
+        """
+
+        conditions = []
+        for value, dictionary, codes in (
+                (ean_number, self.eans, self.ean_codes),
+                (lot_number, self.lots, self.lot_codes),
+                (expiration_date, self.expirations, self.expiration_codes)):
+            if value is None:
+                continue
+            code = dictionary.codes.get(value)
+            if code is None:
+                return self.take([])
+            conditions.append((codes, code))
+        if not conditions:
+            indexes = range(len(self))
+        else:
+            codes, code = conditions[0]
+            indexes = [index for index, value in enumerate(codes)
+                       if value == code]
+            for codes, code in conditions[1:]:
+                indexes = [index for index in indexes if codes[index] == code]
+        return self.take(indexes)
+
+    def take(self, indexes):
+        """Select records by index.
+
+        Arguments:
+            indexes {iterable} -- record indexes
+
+        Returns:
+            GS1Store -- selected records in index order, sharing the
+            dictionaries
+        """
+
+        selected = GS1Store((self.eans, self.lots, self.expirations))
+        if not isinstance(indexes, (list, range, array)):
+            indexes = list(indexes)
+        for source, target in (
+                (self.ean_codes, selected.ean_codes),
+                (self.lot_codes, selected.lot_codes),
+                (self.expiration_codes, selected.expiration_codes),
+                (self.catalog_numbers, selected.catalog_numbers)):
+            target.extend([source[index] for index in indexes])
+        return selected
+
+    def nbytes(self):
+        """Estimate the memory used by the columns and dictionaries.
+
+        Dictionaries shared with other stores are counted in full.
+
+        Returns:
+            int -- bytes
+        """
+
+        columns = (self.ean_codes, self.lot_codes, self.expiration_codes,
+                   self.catalog_numbers)
+        return sum(len(column) * column.itemsize for column in columns) + \
+            self.eans.nbytes() + self.lots.nbytes() + \
+            self.expirations.nbytes()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+This module tests for GS1 columnar store module.
+"""
+
+import unittest
+
+from gs1 import GS1Elements
+from gs1_store import GS1Store
+
+
+class TestFunctions(unittest.TestCase):
+    """Test functions.
+
+    Arguments:
+        unittest {unittest} -- Calling attribut
+    """
+
+    def setUp(self):
+        self.barcode = "01059965271763401020141719073121280122804"
+        self.store = GS1Store()
+        self.store.extend_barcodes(
+            ["01059965271763401020141719073121%09d" % serial
+             for serial in range(5)] +
+            ["0105996527176340105517190731212801228", "x"] +
+            ["010599652717634010201417200101210000000%02d" % serial
+             for serial in range(3)])
+
+    def test_extend_barcodes(self):
+        """Test.
+        """
+        self.assertEqual(len(self.store), 8)
+        self.assertEqual(len(self.store.eans), 1)
+        self.assertEqual(len(self.store.lots), 1)
+        self.assertEqual(len(self.store.expirations), 2)
+        self.assertEqual(self.store[0], GS1Elements(
+            "05996527176340", "2014", "190731", "000000000"))
+
+    def test_append_barcode(self):
+        """Test.
+        """
+        store = GS1Store()
+        self.assertTrue(store.append_barcode(self.barcode))
+        self.assertFalse(store.append_barcode("0105"))
+        self.assertEqual(list(store), [GS1Elements(
+            "05996527176340", "2014", "190731", "280122804")])
+
+    def test_append(self):
+        """Test.
+        """
+        store = GS1Store()
+        with self.assertRaises(ValueError):
+            store.append("05996527176340", "2014", "190731", "2801A2804")
+        self.assertEqual(len(store), 0)
+
+    def test_filter(self):
+        """Test.
+        """
+        selected = self.store.filter(lot_number="2014",
+                                     expiration_date="200101")
+        self.assertEqual([elements.catalog_number for elements in selected],
+                         ["000000000", "000000001", "000000002"])
+        self.assertIs(selected.lots, self.store.lots)
+        self.assertEqual(len(self.store.filter(lot_number="9999")), 0)
+        self.assertEqual(len(self.store.filter()), 8)
+
+    def test_nbytes(self):
+        """Test.
+        """
+        store = GS1Store()
+        store.extend_barcodes(["01059965271763401020141719073121%09d" % serial
+                               for serial in range(10000)])
+        self.assertLess(store.nbytes(), 25 * 10000)
+
+
+if __name__ == '__main__':
+    unittest.main()
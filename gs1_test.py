@@ -3,9 +3,13 @@
 This module tests for GS1 barcode module.
 """
 
+import io
 import unittest
 
-from gs1 import GS1Check, GS1Create, GS1GetElement
+from gs1 import GS1Check, GS1Create, GS1GetElement, decode_character
+from gs1 import OutputStyle, create_many, iter_batch, iter_batch_parallel
+from gs1 import OUTPUT_STYLES, register_style
+from gs1 import parse_arguments, write_csv, write_jsonl
 
 
 class TestFunctions(unittest.TestCase):
@@ -40,6 +44,19 @@ class TestFunctions(unittest.TestCase):
         self.gs1_check.barcode = self.gs1_check.barcode + "5"
         self.assertEqual(self.gs1_check.verify(), False)
 
+    def test_validate(self):
+        """Test.
+        """
+        self.gs1_check.barcode = "01059965271763401020141719073121280122804"
+        self.assertEqual(self.gs1_check.validate(), True)
+        self.gs1_check.barcode = "01059965271763411020141719073121280122804"
+        self.assertEqual(self.gs1_check.verify(), True)
+        self.assertEqual(self.gs1_check.validate(), False)
+        self.gs1_check.barcode = "01059965271763401020141719023121280122804"
+        self.assertEqual(self.gs1_check.validate(), False)
+        self.gs1_check.barcode = ""
+        self.assertEqual(self.gs1_check.validate(), False)
+
     def test_get_ean_number(self):
         """Test.
         """
@@ -95,6 +112,30 @@ class TestFunctions2(unittest.TestCase):
                           self.expiration_date,
                           self.catalog_number))
 
+    def test_parse_gs1_fills_elements(self):
+        """Test.
+        """
+
+        elements = self.gs1_get_element.parse_gs1()
+        self.assertEqual(elements.lot_number, self.lot)
+        self.assertEqual(self.gs1_get_element.ean_number, self.ean)
+        self.assertEqual(self.gs1_get_element.lot_number, self.lot)
+        self.assertEqual(self.gs1_get_element.expiration_date,
+                         self.expiration_date)
+        self.assertEqual(self.gs1_get_element.catalog_number,
+                         self.catalog_number)
+
+    def test_parse_gs1_lot_with_ai_digits(self):
+        """Test.
+        """
+
+        self.gs1_get_element.barcode = \
+            "01059965271763401017211719073121280122804"
+        self.assertEqual(self.gs1_get_element.parse_gs1().lot_number, "1721")
+        self.gs1_get_element.barcode = \
+            "01059965271763401020A41719073121280122804"
+        self.assertEqual(self.gs1_get_element.parse_gs1(), None)
+
     def test_format_barcode(self):
         """Test.
         """
@@ -209,5 +250,261 @@ class TestFunctions5(unittest.TestCase):
         self.assertEqual(self.gs1_create.create_gs1(), self.code_char)
 
 
+class TestFunctions6(unittest.TestCase):
+    """Test functions.
+
+    Arguments:
+        unittest {unittest} -- Calling attribut
+    """
+
+    def setUp(self):
+        self.gs1_create = GS1Create()
+        self.gs1_create.ean_number = "05996527176340"
+        self.gs1_create.lot_number = "20A4"
+        self.gs1_create.expiration_date = "190731"
+        self.gs1_create.catalog_number = "280122804"
+
+    def test_create_gs1_range(self):
+        """Test.
+        """
+        for output_style in ["Normal", "Brackets", "ZPL", "Character",
+                             "HRI", "EPL"]:
+            self.gs1_create.output_style = output_style
+            codes = list(self.gs1_create.create_gs1_range(280122799, 4, 5))
+            expected = []
+            for catalog_number in range(280122799, 280122819, 5):
+                gs1_create = GS1Create()
+                gs1_create.ean_number = self.gs1_create.ean_number
+                gs1_create.lot_number = self.gs1_create.lot_number
+                gs1_create.expiration_date = self.gs1_create.expiration_date
+                gs1_create.catalog_number = str(catalog_number)
+                gs1_create.output_style = output_style
+                expected.append(gs1_create.create_gs1())
+            self.assertEqual(codes, expected)
+
+    def test_create_gs1_range_width(self):
+        """Test.
+        """
+        self.gs1_create.output_style = "Normal"
+        self.assertEqual(
+            list(self.gs1_create.create_gs1_range(7, 2, width=3))[1],
+            "01059965271763401020A41719073121008")
+        self.assertRaises(ValueError, list,
+                          self.gs1_create.create_gs1_range(999, 2, width=3))
+
+
+class TestOutputStyles(unittest.TestCase):
+    """Test functions.
+
+    Arguments:
+        unittest {unittest} -- Calling attribut
+    """
+
+    def setUp(self):
+        self.gs1_create = GS1Create()
+        self.gs1_create.ean_number = "05996527176340"
+        self.gs1_create.lot_number = "20A4"
+        self.gs1_create.expiration_date = "190731"
+        self.gs1_create.catalog_number = "280122804"
+        self.rows = [("05996527176340", "2014", "190731",
+                      str(280122800 + index)) for index in range(5)]
+
+    def test_create_gs1_hri(self):
+        """Test.
+        """
+        self.gs1_create.output_style = "HRI"
+        self.assertEqual(self.gs1_create.create_gs1(),
+                         "(01) 05996527176340 (10) 20A4 (17) 190731 "
+                         "(21) 280122804")
+
+    def test_create_gs1_epl(self):
+        """Test.
+        """
+        self.gs1_create.output_style = "EPL"
+        self.assertEqual(self.gs1_create.create_gs1(),
+                         'B0,0,0,1E,2,4,100,N,"0105996527176340'
+                         '1020A4\x1d1719073121280122804"')
+        self.gs1_create.lot_number = 'A"\\'
+        self.assertIn('10A\\"\\\\\x1d', self.gs1_create.create_gs1())
+
+    def test_missing_element(self):
+        """Test.
+        """
+        self.gs1_create.lot_number = None
+        for output_style in OUTPUT_STYLES:
+            self.gs1_create.output_style = output_style
+            self.assertRaises(TypeError, self.gs1_create.create_gs1)
+            self.assertRaises(TypeError, list,
+                              self.gs1_create.create_gs1_range(1, 2))
+            self.assertRaises(TypeError, self.gs1_create.render_many,
+                              [("05996527176340", "2014", None, "1")])
+
+    def test_unknown_style(self):
+        """Test.
+        """
+        self.gs1_create.output_style = "Unknown"
+        self.assertEqual(self.gs1_create.create_gs1(), "")
+        self.assertEqual(list(self.gs1_create.create_gs1_range(1, 2)), [])
+        self.assertRaises(ValueError, self.gs1_create.render_many,
+                          self.rows)
+
+    def test_render_many(self):
+        """Test.
+        """
+        for output_style in OUTPUT_STYLES:
+            self.gs1_create.output_style = output_style
+            expected = []
+            for row in self.rows:
+                (self.gs1_create.ean_number, self.gs1_create.lot_number,
+                 self.gs1_create.expiration_date,
+                 self.gs1_create.catalog_number) = row
+                expected.append(self.gs1_create.create_gs1())
+            self.assertEqual(self.gs1_create.render_many(self.rows),
+                             "".join(code + "\n" for code in expected))
+            buffer = ["stale"]
+            self.assertEqual(
+                self.gs1_create.render_many(self.rows, "%\r\n", buffer),
+                "".join(code + "%\r\n" for code in expected))
+            self.assertEqual(self.gs1_create.render_many([]), "")
+
+    def test_register_style(self):
+        """Test.
+        """
+        class LabelStyle(OutputStyle):
+            name = "Label"
+
+            def render(self, ean_number, lot_number, expiration_date,
+                       catalog_number):
+                return "%s/%s" % (ean_number, catalog_number)
+
+        register_style(LabelStyle())
+        try:
+            self.gs1_create.output_style = "Label"
+            self.assertEqual(self.gs1_create.create_gs1(),
+                             "05996527176340/280122804")
+            self.assertEqual(
+                list(self.gs1_create.create_gs1_range(7, 1, width=3)),
+                ["05996527176340/007"])
+            self.assertEqual(list(create_many(self.rows[:2], "Label",
+                                              processes=1)),
+                             ["05996527176340/280122800",
+                              "05996527176340/280122801"])
+        finally:
+            del OUTPUT_STYLES["Label"]
+
+
+class TestDecodeCharacter(unittest.TestCase):
+    """Test functions.
+
+    Arguments:
+        unittest {unittest} -- Calling attribut
+    """
+
+    def setUp(self):
+        self.gs1_create = GS1Create()
+        self.gs1_create.output_style = "Character"
+        self.gs1_create.ean_number = "05996527176340"
+        self.gs1_create.lot_number = "A1b2"
+        self.gs1_create.expiration_date = "190731"
+        self.gs1_create.catalog_number = "280122804"
+
+    def test_decode_character(self):
+        """Test.
+        """
+        self.assertEqual(decode_character(self.gs1_create.create_gs1()),
+                         self.gs1_create.get_element_string())
+
+    def test_decode_character_invalid(self):
+        """Test.
+        """
+        barcode = self.gs1_create.create_gs1()
+        with self.assertRaises(ValueError):
+            decode_character(barcode[:-2] + "!" + barcode[-1])
+        with self.assertRaises(ValueError):
+            decode_character(barcode[:-1])
+        with self.assertRaises(ValueError):
+            decode_character(barcode.replace("!", "é"))
+
+
+class TestBatch(unittest.TestCase):
+    """Test functions.
+
+    Arguments:
+        unittest {unittest} -- Calling attribut
+    """
+
+    def setUp(self):
+        self.barcode = "01059965271763401020141719073121280122804"
+        self.creation_row = "05996527176340,2014,190731,280122804"
+
+    def test_batch_verify_jsonl(self):
+        """Test.
+        """
+        args = parse_arguments(["-b", "-f", "verify"])
+        target = io.StringIO()
+        write_jsonl(iter_batch(args, [self.barcode + "\n", "\n", "x\n"]),
+                    target)
+        self.assertEqual(target.getvalue().splitlines(), [
+            '{"input": "' + self.barcode +
+            '", "result": true, "error": null}',
+            '{"input": "x", "result": false, "error": null}'])
+
+    def test_batch_parse_gs1_csv(self):
+        """Test.
+        """
+        args = parse_arguments(["-b", "-f", "parse_gs1", "-o", "csv"])
+        target = io.StringIO()
+        write_csv(iter_batch(args, [self.barcode]), target, args.function)
+        self.assertEqual(target.getvalue().splitlines()[1],
+                         self.barcode + ",05996527176340,2014,190731,"
+                         "280122804,")
+
+    def test_batch_creation(self):
+        """Test.
+        """
+        args = parse_arguments(["-b", "-f", "create_gs1"])
+        records = list(iter_batch(args, [self.creation_row, "1,2"]))
+        self.assertEqual(records[0]["result"], self.barcode)
+        self.assertEqual(records[1]["result"], None)
+        self.assertEqual(records[1]["error"], "expected 4 fields, got 2")
+
+    def test_batch_decode_character(self):
+        """Test.
+        """
+        args = parse_arguments(["-b", "-f", "decode_character"])
+        records = list(iter_batch(args, [
+            "ÍÊ!%Ça;1_H*4.Ê13'?5<!6pÈ4pÎ\n", "ÍÊ!!Î\n"]))
+        self.assertEqual(records[0]["result"],
+                         "0105996527176340102014\x1d1719073121280122804")
+        self.assertEqual(records[1]["error"], "wrong check character")
+
+    def test_batch_parallel_keeps_order(self):
+        """Test.
+        """
+        args = parse_arguments(["-b", "-f", "verify", "-p", "2",
+                                "--chunk-size", "3"])
+        lines = [self.barcode if index % 3 else "x%d" % index
+                 for index in range(20)]
+        self.assertEqual(list(iter_batch_parallel(args, lines)),
+                         list(iter_batch(args, lines)))
+
+    def test_create_many(self):
+        """Test.
+        """
+        rows = [("05996527176340", "2014", "190731", str(280122800 + index))
+                for index in range(10)]
+        gs1_create = GS1Create()
+        gs1_create.output_style = "Character"
+        expected = []
+        for row in rows:
+            (gs1_create.ean_number, gs1_create.lot_number,
+             gs1_create.expiration_date, gs1_create.catalog_number) = row
+            expected.append(gs1_create.create_gs1())
+        self.assertEqual(list(create_many(rows, "Character", processes=2,
+                                          chunk_size=4)), expected)
+        self.assertEqual(list(create_many(rows, "Character", processes=1,
+                                          chunk_size=4)), expected)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+This module validates GS1 barcodes with functions compiled per layout.
+
+A layout is the sequence of AIs a barcode must contain. Its rules come
+from the AI table of gs1_ai: length and character set of every part, plus
+the mod 10 check digit of GS1 keys and calendar-valid YYMMDD dates, where
+day 00 is accepted. The rules of a layout are turned into the source of a
+single function, with the offsets, lengths and checks written in as
+constants, and compiled once. The function takes an element string or a
+plain barcode without FNC1 and returns the first error or None, at about
+the cost of matching the barcode with split_gs1().
+"""
+
+
+import re
+from collections import namedtuple
+
+import gs1_ai
+
+GS = gs1_ai.GS
+
+# AIs whose first part is a GS1 key with a mod 10 check digit.
+CHECK_DIGIT_AIS = frozenset(["00", "01", "02", "03", "253"])
+# AIs holding a YYMMDD date, DD may be 00.
+DATE_AIS = frozenset(["11", "12", "13", "15", "16", "17"])
+
+# The fixed layout of gs1.py: LOT and catalog number are digits only.
+FIXED_LAYOUT = ("01", ("10", "N..20"), "17", ("21", "N9"))
+
+# Valid MMDD of a date, February 29 is checked for leap years separately.
+MONTH_DAYS = frozenset(
+    "%02d%02d" % (month, day)
+    for month, days in enumerate((31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30,
+                                  31), 1)
+    for day in range(days + 1))
+
+NON_DIGIT = re.compile("[^0-9%s]" % GS)
+
+Rule = namedtuple(
+    "Rule",
+    ["ai", "parts", "min_length", "max_length", "fnc1", "check_digit",
+     "date"])
+
+VALIDATORS = {}
+
+
+def build_rule(item):
+    """Build the rule of one layout item.
+
+    Arguments:
+        item {str} -- AI, or (AI, format) to narrow the AI table format
+
+    Raises:
+        ValueError -- unknown AI or unsupported format
+
+    Returns:
+        Rule -- rule
+    """
+
+    if isinstance(item, str):
+        ai, fmt = item, None
+    else:
+        ai, fmt = item
+    definition = gs1_ai.lookup_ai(ai)
+    if definition is None or definition.ai != ai:
+        raise ValueError("unknown AI %s" % ai)
+    parts = definition.parts if fmt is None else gs1_ai.parse_format(fmt)
+    for charset, low, high in parts[:-1]:
+        if low != high:
+            raise ValueError("AI %s: only the last part may vary" % ai)
+    return Rule(ai, parts, sum(part[1] for part in parts),
+                sum(part[2] for part in parts), definition.fnc1,
+                ai in CHECK_DIGIT_AIS, ai in DATE_AIS)
+
+
+def _charset_check(rule, expression, charset, optional):
+    if charset == "N":
+        condition = "not (%s.isascii() and %s.isdigit())" % (expression,
+                                                           expression)
+    else:
+        condition = "not CHARSET_%s.issuperset(%s)" % (charset, expression)
+    if optional:
+        condition = "%s and %s" % (expression, condition)
+    return ["    if %s:" % condition,
+            "        return 'AI %s: invalid character in %%r' %% value" %
+            rule.ai]
+
+
+def _field_source(rule, tail, last, digits):
+    """Generate the checks of one field, value at pos."""
+
+    ai = rule.ai
+    lines = ["    if not data.startswith(%r, pos):" % ai,
+             "        return 'expected AI %s at position %%d' %% pos" % ai,
+             "    pos += %d" % len(ai)]
+    if rule.min_length == rule.max_length:
+        lines.append("    end = pos + %d" % rule.max_length)
+    elif last:
+        lines.append("    end = length")
+    else:
+        lines.append("    end = data.find(GS, pos, pos + %d)" %
+                     (rule.max_length + 1))
+        if tail is None:
+            lines += ["    if end < 0:",
+                      "        return 'AI %s: missing FNC1'" % ai]
+        else:
+            # No FNC1: the fixed length fields after it end the barcode.
+            lines += ["    if end < 0:",
+                      "        end = length - %d" % tail]
+    lines += ["    value = data[pos:end]",
+              "    size = len(value)"]
+    if rule.min_length == rule.max_length:
+        lines.append("    if size != %d:" % rule.max_length)
+    else:
+        lines.append("    if size < %d or size > %d:" %
+                     (rule.min_length, rule.max_length))
+    lines.append("        return 'AI %s: invalid length %%d' %% size" % ai)
+    start = 0
+    for index, (charset, low, high) in enumerate(rule.parts):
+        if digits:
+            break
+        if len(rule.parts) == 1:
+            expression = "value"
+        elif index == len(rule.parts) - 1:
+            expression = "value[%d:]" % start
+        else:
+            expression = "value[%d:%d]" % (start, start + high)
+        lines += _charset_check(rule, expression, charset, low == 0)
+        start += high
+    if rule.check_digit:
+        # Weights 3 and 1 from the right of the body, 1 for the check
+        # digit. Byte sums of the ASCII digits are 48 over per digit, so
+        # the weighted sum of a valid key ends in the digit of the excess.
+        key_length = rule.parts[0][2]
+        excess = 48 * (3 * (key_length // 2) + (key_length + 1) // 2) % 10
+        lines += ["    if (3 * sum(value[%d::-2].encode()) + "
+                  "sum(value[%d::-2].encode())) %% 10 != %d:" %
+                  (key_length - 2, key_length - 1, excess),
+                  "        return 'AI %s: invalid check digit'" % ai]
+    if rule.date:
+        lines += ["    month_day = value[2:6]",
+                  "    if month_day not in MONTH_DAYS or "
+                  "(month_day == '0229' and int(value[:2]) % 4):",
+                  "        return 'AI %s: invalid date %%s' %% value" % ai]
+    lines.append("    pos = end")
+    if rule.fnc1 and not last:
+        lines += ["    if data.startswith(GS, pos):",
+                  "        pos += 1"]
+    return lines
+
+
+def layout_source(layout):
+    """Generate the source of the validator of a layout.
+
+    Arguments:
+        layout {tuple} -- AIs, or (AI, format) pairs, in barcode order
+
+    Raises:
+        ValueError -- unknown AI or unsupported format
+
+    Returns:
+        str -- source of a validate(data) function
+    """
+
+    rules = [build_rule(item) for item in layout]
+    lines = ["def validate(data):",
+             "    length = len(data)",
+             "    pos = 1 if data.startswith(GS) else 0"]
+    # Only digits and FNC1 are valid when every part is numeric, one check
+    # of the whole barcode replaces the checks of the fields. A barcode
+    # without digits has no invalid character, the field checks report it.
+    digits = all(part[0] == "N" for rule in rules for part in rule.parts)
+    if digits:
+        lines += ["    if not (data.isascii() and "
+                  "data.replace(GS, '').isdigit()):",
+                  "        match = NON_DIGIT.search(data)",
+                  "        if match is not None:",
+                  "            return 'invalid character %r' % "
+                  "match.group()"]
+    for index, rule in enumerate(rules):
+        # Length of the rest when only fixed length fields follow.
+        tail = 0
+        for following in rules[index + 1:]:
+            if following.min_length != following.max_length:
+                tail = None
+                break
+            tail += len(following.ai) + following.max_length
+        lines += _field_source(rule, tail, index == len(rules) - 1,
+                               digits)
+    lines += ["    if pos != length:",
+              "        return 'unexpected data at position %d' % pos",
+              "    return None"]
+    return "\n".join(lines) + "\n"
+
+
+def compile_layout(layout):
+    """Get the compiled validator of a layout, built on first use.
+
+    Arguments:
+        layout {tuple} -- AIs, or (AI, format) pairs, in barcode order
+
+    Raises:
+        ValueError -- unknown AI or unsupported format
+
+    Returns:
+        function -- validate(data) returning the first error or None
+    """
+
+    layout = tuple(layout)
+    validator = VALIDATORS.get(layout)
+    if validator is not None:
+        return validator
+    source = layout_source(layout)
+    namespace = {"GS": GS, "MONTH_DAYS": MONTH_DAYS,
+                 "NON_DIGIT": NON_DIGIT}
+    namespace.update(("CHARSET_" + name, charset)
+                     for name, charset in gs1_ai.CHARSETS.items())
+    exec(compile(source, "<gs1 layout %s>" % " ".join(
+        item if isinstance(item, str) else item[0] for item in layout),
+        "exec"), namespace)
+    validator = VALIDATORS[layout] = namespace["validate"]
+    validator.source = source
+    return validator
+
+
+def validate(data, layout=FIXED_LAYOUT):
+    """Validate a barcode against a layout.
+
+    Arguments:
+        data {str} -- element string, or plain barcode without brackets
+
+    Keyword Arguments:
+        layout {tuple} -- AIs, or (AI, format) pairs (default: {gs1.py
+        fixed layout})
+
+    Returns:
+        str -- first error, None if the barcode is valid
+    """
+
+    validator = VALIDATORS.get(layout) or compile_layout(layout)
+    return validator(data)
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+This module tests for GS1 validator compiler module.
+"""
+
+import unittest
+
+from gs1_checksum import is_valid_gtin, mod10_check_digit
+from gs1_validate import FIXED_LAYOUT, VALIDATORS, build_rule
+from gs1_validate import compile_layout, validate
+
+
+class TestFunctions(unittest.TestCase):
+    """Test functions.
+
+    Arguments:
+        unittest {unittest} -- Calling attribut
+    """
+
+    def setUp(self):
+        self.barcode = "01059965271763401020141719073121280122804"
+
+    def test_build_rule(self):
+        """Test.
+        """
+        rule = build_rule("17")
+        self.assertEqual((rule.min_length, rule.max_length, rule.fnc1,
+                          rule.check_digit, rule.date),
+                         (6, 6, False, False, True))
+        rule = build_rule(("10", "N..20"))
+        self.assertEqual((rule.parts, rule.fnc1), ((("N", 1, 20),), True))
+        self.assertRaises(ValueError, build_rule, "019")
+        self.assertRaises(ValueError, build_rule, ("10", "X..5+N2"))
+
+    def test_validate_fixed_layout(self):
+        """Test.
+        """
+        self.assertIsNone(validate(self.barcode))
+        self.assertIsNone(validate(
+            "\x1d0105996527176340102014\x1d1719073121280122804"))
+        self.assertIsNone(validate(
+            "01059965271763401020141724022921280122804"))
+        self.assertIsNone(validate(
+            "01059965271763401020141719070021280122804"))
+        for barcode, error in (
+                ("01059965271763411020141719073121280122804",
+                 "AI 01: invalid check digit"),
+                ("01059965271763401020141719133121280122804",
+                 "AI 17: invalid date 191331"),
+                ("01059965271763401020141725022921280122804",
+                 "AI 17: invalid date 250229"),
+                ("010599652717634010201A1719073121280122804",
+                 "invalid character 'A'"),
+                ("0105996527176340101719073121280122804",
+                 "AI 10: invalid length 0"),
+                ("0205996527176340102014171907312128012280",
+                 "expected AI 01 at position 0"),
+                ("0105996527176340102014\x1d17190731212801228045",
+                 "unexpected data at position 42"),
+                ("0105996527176340102014\x1d1719073121280122804\x1d",
+                 "unexpected data at position 42"),
+                ("", "expected AI 01 at position 0"),
+                ("\x1d", "expected AI 01 at position 1")):
+            self.assertEqual(validate(barcode), error)
+
+    def test_validate_layout(self):
+        """Test.
+        """
+        layout = ("01", "10", "21", "3103")
+        self.assertIsNone(validate(
+            "0105996527176340" "10AB-12\x1d" "21X/9\x1d" "3103001250",
+            layout))
+        self.assertEqual(validate("0105996527176340" "10AB#12\x1d21X\x1d"
+                                  "3103001250", layout),
+                         "AI 10: invalid character in 'AB#12'")
+        self.assertEqual(validate("0105996527176340" "10AB-12" "21X"
+                                  "3103001250", layout),
+                         "AI 10: missing FNC1")
+        self.assertIsNone(validate("2531234567890128ABC", ("253",)))
+        self.assertEqual(validate("2531234567890127ABC", ("253",)),
+                         "AI 253: invalid check digit")
+
+    def test_check_digit(self):
+        """Test.
+        """
+        validator = compile_layout(("01",))
+        for body in ("0599652717634", "0000000000000", "9999999999999",
+                     "4006381333931"[:13]):
+            for digit in range(10):
+                gtin = body + str(digit)
+                self.assertEqual(validator("01" + gtin) is None,
+                                 is_valid_gtin(gtin))
+        sscc = "00012345600012345" + str(mod10_check_digit(
+            "00012345600012345"))
+        self.assertIsNone(validate("00" + sscc, ("00",)))
+
+    def test_compile_layout(self):
+        """Test.
+        """
+        validator = compile_layout(FIXED_LAYOUT)
+        self.assertIs(compile_layout(list(FIXED_LAYOUT)), validator)
+        self.assertIs(VALIDATORS[FIXED_LAYOUT], validator)
+        self.assertIn("def validate(data):", validator.source)
+
+
+if __name__ == '__main__':
+    unittest.main()
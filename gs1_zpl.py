@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+This module deals with ZPL label jobs for GS1 barcodes.
+
+The label layout is downloaded to the printer once as a stored format
+(^DF) and every label only recalls it (^XF) with its variable field data
+(^FN), so a job sends the layout bytes a single time.
+"""
+
+
+import socket
+
+from gs1 import GS1Create
+
+DEFAULT_FORMAT_NAME = "R:GS1.ZPL"
+# ^FN1 is the barcode, ^FN2 the human readable text.
+DEFAULT_LAYOUT = "^FO50,50^BY2^BCN,120,N,N,N^FN1^FS" \
+    "^FO50,190^A0N,30,30^FN2^FS"
+PRINTER_PORT = 9100
+# ZPL command prefixes and the ^FH escape indicator, written as the
+# indicator and their hexadecimal code in escaped field data.
+ZPL_COMMAND_CHARS = ("^", "~")
+FH_INDICATOR = "_"
+FH_ESCAPES = str.maketrans({char: "%s%02X" % (FH_INDICATOR, ord(char))
+                            for char in ZPL_COMMAND_CHARS + (FH_INDICATOR,)})
+
+
+def field_data(data):
+    """Format the ^FD command of field data.
+
+    Data with the ^ or ~ command prefixes is written with ^FH, the prefixes
+    and the "_" escape indicator as _ and their hexadecimal code.
+
+    Arguments:
+        data {str} -- field data
+
+    Returns:
+        str -- ^FD command, preceded by ^FH when escaped
+    """
+
+    if not any(char in data for char in ZPL_COMMAND_CHARS):
+        return "^FD" + data
+    return "^FH^FD" + data.translate(FH_ESCAPES)
+
+
+class ZPLJob(object):
+    """Class to write a ZPL job with a stored label format
+    """
+
+    def __init__(self, target, layout=DEFAULT_LAYOUT,
+                 format_name=DEFAULT_FORMAT_NAME):
+        self.target = target
+        self.layout = layout
+        self.format_name = format_name
+        self.format_written = False
+        self.labels = 0
+        self.bytes_written = 0
+        self.gs1_create = GS1Create()
+
+    def write(self, data):
+        """Write data to the job target.
+
+        Arguments:
+            data {str} -- ZPL commands
+        """
+
+        self.target.write(data)
+        self.bytes_written += len(data)
+
+    def write_format(self):
+        """Download the label layout as a stored format.
+        """
+
+        self.write("^XA^DF" + self.format_name + "^FS" + self.layout +
+                   "^XZ\n")
+        self.format_written = True
+
+    def add_fields(self, fields):
+        """Print a label from the stored format.
+
+        The stored format is downloaded before the first label.
+
+        Arguments:
+            fields {dict} -- field data by ^FN number, escaped with
+            field_data()
+        """
+
+        if not self.format_written:
+            self.write_format()
+        parts = ["^XA^XF", self.format_name, "^FS"]
+        for number in sorted(fields):
+            parts.append("^FN%d%s^FS" % (number,
+                                          field_data(fields[number])))
+        parts.append("^XZ\n")
+        self.write("".join(parts))
+        self.labels += 1
+
+    def add_label(self, ean_number, lot_number, expiration_date,
+                  catalog_number):
+        """Print a GS1 label from the stored format.
+
+        Arguments:
+            ean_number {str} -- EAN number (01)
+            lot_number {str} -- LOT number (10)
+            expiration_date {str} -- expiration date YYMMDD (17)
+            catalog_number {str} -- catalog number (21)
+        """
+
+        gs1_create = self.gs1_create
+        gs1_create.ean_number = ean_number
+        gs1_create.lot_number = lot_number
+        gs1_create.expiration_date = expiration_date
+        gs1_create.catalog_number = catalog_number
+        gs1_create.output_style = "Brackets"
+        self.add_fields({1: gs1_create.get_zpl_data(),
+                         2: gs1_create.create_gs1()})
+
+
+def open_printer(host, port=PRINTER_PORT, timeout=10):
+    """Open a raw socket connection to a label printer.
+
+    Arguments:
+        host {str} -- printer host name or address
+
+    Keyword Arguments:
+        port {int} -- raw print port (default: {9100})
+        timeout {float} -- connect and send timeout in seconds (default: {10})
+
+    Returns:
+        file -- text stream to the printer, close it to end the job
+    """
+
+    connection = socket.create_connection((host, port), timeout)
+    stream = connection.makefile("w", encoding="ascii", newline="")
+    connection.close()
+    return stream
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+This module tests for ZPL label job module.
+"""
+
+import io
+import unittest
+
+from gs1_zpl import ZPLJob, field_data
+
+
+class TestFunctions(unittest.TestCase):
+    """Test functions.
+
+    Arguments:
+        unittest {unittest} -- Calling attribut
+    """
+
+    def setUp(self):
+        self.target = io.StringIO()
+        self.job = ZPLJob(self.target, layout="^FO0,0^BCN,,N,N^FN1^FS",
+                          format_name="R:T.ZPL")
+
+    def test_add_fields(self):
+        """Test.
+        """
+        self.job.add_fields({1: "A"})
+        self.job.add_fields({1: "B"})
+        self.assertEqual(self.target.getvalue().splitlines(), [
+            "^XA^DFR:T.ZPL^FS^FO0,0^BCN,,N,N^FN1^FS^XZ",
+            "^XA^XFR:T.ZPL^FS^FN1^FDA^FS^XZ",
+            "^XA^XFR:T.ZPL^FS^FN1^FDB^FS^XZ"])
+        self.assertEqual(self.job.labels, 2)
+        self.assertEqual(self.job.bytes_written,
+                         len(self.target.getvalue()))
+
+    def test_add_label(self):
+        """Test.
+        """
+        self.job.add_label("05996527176340", "2014", "190731", "280122804")
+        self.assertEqual(
+            self.target.getvalue().splitlines()[1],
+            "^XA^XFR:T.ZPL^FS"
+            "^FN1^FD>;>80105996527176340102014>8171907312128012280>64^FS"
+            "^FN2^FD(01)05996527176340(10)2014(17)190731(21)280122804^FS"
+            "^XZ")
+
+    def test_field_data(self):
+        """Test.
+        """
+        self.assertEqual(field_data("A_1"), "^FDA_1")
+        self.assertEqual(field_data("A^B~C_D"), "^FH^FDA_5EB_7EC_5FD")
+
+    def test_add_label_escaped(self):
+        """Test.
+        """
+        self.job.add_label("05996527176340", "2^~4", "190731", "280122804")
+        label = self.target.getvalue().splitlines()[1]
+        self.assertEqual(label.count("^"), 12)
+        self.assertIn("^FN2^FH^FD(01)05996527176340(10)2_5E_7E4(17)", label)
+
+
+if __name__ == '__main__':
+    unittest.main()